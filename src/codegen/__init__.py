@@ -1,8 +1,33 @@
-from codegen.agents.agent import Agent
-from codegen.cli.sdk.decorator import function
-from codegen.cli.sdk.functions import Function
-from codegen.extensions.events.codegen_app import CodegenApp
-from codegen.sdk.core.codebase import Codebase
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 from codegen.shared.enums.programming_language import ProgrammingLanguage
 
+if TYPE_CHECKING:
+    from codegen.agents.agent import Agent
+    from codegen.cli.sdk.decorator import function
+    from codegen.cli.sdk.functions import Function
+    from codegen.extensions.events.codegen_app import CodegenApp
+    from codegen.sdk.core.codebase import Codebase
+
+# Each export pulls in a large dependency tree (OpenAI, FastAPI, the API client, every node class), so they are only
+# imported when first accessed.
+_LAZY_EXPORTS = {
+    "Agent": "codegen.agents.agent",
+    "Codebase": "codegen.sdk.core.codebase",
+    "CodegenApp": "codegen.extensions.events.codegen_app",
+    "Function": "codegen.cli.sdk.functions",
+    "function": "codegen.cli.sdk.decorator",
+}
+
+
+def __getattr__(name: str):
+    if module := _LAZY_EXPORTS.get(name):
+        value = getattr(import_module(module), name)
+        globals()[name] = value
+        return value
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
+
+
 __all__ = ["Agent", "Codebase", "CodegenApp", "Function", "ProgrammingLanguage", "function"]
@@ -2,8 +2,6 @@ from pathlib import Path
 
 import click
 import rich
-from github import BadCredentialsException
-from github.MainClass import Github
 
 from codegen.cli.git.repo import get_git_repo
 from codegen.cli.rich.codeblocks import format_command
@@ -75,6 +73,9 @@ class CodegenSession:
             rich.print("\n[dim]To add a remote to the repository:[/dim]")
             rich.print(format_command("git remote add origin <your-repo-url>"))
 
+        from github import BadCredentialsException
+        from github.MainClass import Github
+
         try:
             if git_token is not None:
                 Github(login_or_token=git_token).get_repo(self.local_git.full_name)
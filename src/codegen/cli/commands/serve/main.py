@@ -4,7 +4,7 @@ import socket
 import subprocess
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import rich
 import rich_click as click
@@ -12,9 +12,11 @@ import uvicorn
 from rich.logging import RichHandler
 from rich.panel import Panel
 
-from codegen.extensions.events.codegen_app import CodegenApp
 from codegen.shared.logging.get_logger import get_logger
 
+if TYPE_CHECKING:
+    from codegen.extensions.events.codegen_app import CodegenApp
+
 logger = get_logger(__name__)
 
 
@@ -34,7 +36,7 @@ def setup_logging(debug: bool):
     )
 
 
-def load_app_from_file(file_path: Path) -> CodegenApp:
+def load_app_from_file(file_path: Path) -> "CodegenApp":
     """Load a CodegenApp instance from a Python file.
 
     Args:
@@ -46,6 +48,8 @@ def load_app_from_file(file_path: Path) -> CodegenApp:
     Raises:
         click.ClickException: If no CodegenApp instance is found
     """
+    from codegen.extensions.events.codegen_app import CodegenApp
+
     try:
         # Import the module from file path
         spec = importlib.util.spec_from_file_location("app_module", file_path)
@@ -28,6 +28,9 @@ class CodebaseConfig(BaseConfig):
     disable_graph: bool = False
     disable_file_parse: bool = False
     exp_lazy_graph: bool = False
+    exp_lazy_expressions: bool = False
+    graph_snapshot_dir: str | None = None
+    compact_usage_edges: bool = False
     generics: bool = True
     import_resolution_paths: list[str] = Field(default_factory=lambda: [])
     import_resolution_overrides: dict[str, str] = Field(default_factory=lambda: {})
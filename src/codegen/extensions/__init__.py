@@ -1,6 +1,26 @@
 """Extensions for the codegen package."""
 
-from codegen.extensions.index.code_index import CodeIndex
-from codegen.extensions.index.file_index import FileIndex
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from codegen.extensions.index.code_index import CodeIndex
+    from codegen.extensions.index.file_index import FileIndex
+
+# The indexes depend on the whole SDK and OpenAI, which most extensions never need
+_LAZY_EXPORTS = {
+    "CodeIndex": "codegen.extensions.index.code_index",
+    "FileIndex": "codegen.extensions.index.file_index",
+}
+
+
+def __getattr__(name: str):
+    if module := _LAZY_EXPORTS.get(name):
+        value = getattr(import_module(module), name)
+        globals()[name] = value
+        return value
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
+
 
 __all__ = ["CodeIndex", "FileIndex"]
@@ -127,6 +127,9 @@ class LSPIO(IO):
     def untrack_file(self, path: Path) -> None:
         self.base_io.untrack_file(path)
 
+    def invalidate(self, path: Path) -> None:
+        self.base_io.invalidate(path)
+
     def get_workspace_edit(self) -> types.WorkspaceEdit:
         document_changes = []
         for _, file in self.files.items():
@@ -6,7 +6,6 @@ import giturlparse
 from git import Repo
 from git.remote import Remote
 
-from codegen.git.clients.git_repo_client import GitRepoClient
 from codegen.git.schemas.repo_config import RepoConfig
 from codegen.git.utils.language import determine_project_language
 
@@ -74,6 +73,8 @@ class LocalGitRepo:
         if access_token is not None:
             repo_config = RepoConfig.from_repo_path(repo_path=str(self.repo_path))
             repo_config.full_name = self.full_name
+            from codegen.git.clients.git_repo_client import GitRepoClient
+
             remote_git = GitRepoClient(repo_config=repo_config, access_token=access_token)
             if (language := remote_git.repo.language) is not None:
                 return language.upper()
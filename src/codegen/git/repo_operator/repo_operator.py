@@ -1,39 +1,69 @@
-import codecs
 import fnmatch
 import glob
 import os
+import re
+import subprocess
+import tempfile
 from collections.abc import Generator
 from datetime import UTC, datetime
-from functools import cached_property
+from functools import cached_property, lru_cache
+from io import BytesIO
 from time import perf_counter
-from typing import Self
+from typing import TYPE_CHECKING, Self
 
 from codeowners import CodeOwners as CodeOwnersParser
+from git import Blob, Diff, GitCommandError, InvalidGitRepositoryError, Remote
 from git import Commit as GitCommit
-from git import Diff, GitCommandError, InvalidGitRepositoryError, Remote
 from git import Repo as GitCLI
 from git.remote import PushInfoList
-from github.IssueComment import IssueComment
-from github.PullRequest import PullRequest
+from gitdb import IStream
 
 from codegen.configs.models.secrets import SecretsConfig
-from codegen.git.clients.git_repo_client import GitRepoClient
 from codegen.git.configs.constants import CODEGEN_BOT_EMAIL, CODEGEN_BOT_NAME
 from codegen.git.repo_operator.local_git_repo import LocalGitRepo
 from codegen.git.schemas.enums import CheckoutResult, FetchResult, RepoVisibility, SetupOption
 from codegen.git.schemas.repo_config import RepoConfig
 from codegen.git.utils.clone import clone_or_pull_repo, clone_repo, pull_repo
 from codegen.git.utils.clone_url import add_access_token_to_url, get_authenticated_clone_url_for_repo_config, get_clone_url_for_repo_config, url_to_github
-from codegen.git.utils.codeowner_utils import create_codeowners_parser_for_repo
 from codegen.git.utils.file_utils import create_files
 from codegen.git.utils.remote_progress import CustomRemoteProgress
 from codegen.shared.logging.get_logger import get_logger
 from codegen.shared.performance.stopwatch_utils import stopwatch
 from codegen.shared.performance.time_utils import humanize_duration
 
+if TYPE_CHECKING:
+    from github.IssueComment import IssueComment
+    from github.PullRequest import PullRequest
+
+    from codegen.git.clients.git_repo_client import GitRepoClient
+
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=16)
+def _compile_ignore_list(ignore_list: tuple[str, ...]) -> re.Pattern[str]:
+    """Compiles an ignore list into one regex, matching paths that match any of the patterns or start with one of them"""
+    return re.compile("|".join(f"{fnmatch.translate(pattern)}|{re.escape(pattern)}" for pattern in ignore_list))
+
+
+def _filter_filepaths(filepaths: list[str], ignore_list: list[str] | None, subdirs: list[str] | None, extensions: list[str] | None) -> list[str]:
+    """Filters relative paths by subdirectory and extension, then by ignore list.
+
+    The subdirectory and extension filters are cheap prefix/suffix checks, so they run before the ignore list is matched.
+    """
+    if subdirs:
+        subdir_prefixes = tuple(subdirs)
+        filepaths = [f for f in filepaths if f.startswith(subdir_prefixes)]
+    if extensions is not None:
+        extension_suffixes = tuple(extensions)
+        filepaths = [f for f in filepaths if f.endswith(extension_suffixes)]
+    # Filter filepaths by ignore list.
+    if ignore_list:
+        ignored = _compile_ignore_list(tuple(ignore_list)).match
+        filepaths = [f for f in filepaths if not ignored(f)]
+    return filepaths
+
+
 class RepoOperator:
     """A wrapper around GitPython to make it easier to interact with a repo."""
 
@@ -45,7 +75,7 @@ class RepoOperator:
     # lazy attributes
     _codeowners_parser: CodeOwnersParser | None = None
     _default_branch: str | None = None
-    _remote_git_repo: GitRepoClient | None = None
+    _remote_git_repo: "GitRepoClient | None" = None
     _local_git_repo: LocalGitRepo | None = None
 
     def __init__(
@@ -88,12 +118,14 @@ class RepoOperator:
         return os.path.join(self.base_dir, self.repo_name)
 
     @property
-    def remote_git_repo(self) -> GitRepoClient:
+    def remote_git_repo(self) -> "GitRepoClient":
         if not self.access_token and self.repo_config.visibility != RepoVisibility.PUBLIC:
             msg = "Must initialize with access_token to get remote"
             raise ValueError(msg)
 
         if not self._remote_git_repo:
+            from codegen.git.clients.git_repo_client import GitRepoClient
+
             self._remote_git_repo = GitRepoClient(self.repo_config, access_token=self.access_token)
         return self._remote_git_repo
 
@@ -202,6 +234,8 @@ class RepoOperator:
         if not self._codeowners_parser:
             if not self._remote_git_repo:
                 return None
+            from codegen.git.utils.codeowner_utils import create_codeowners_parser_for_repo
+
             self._codeowners_parser = create_codeowners_parser_for_repo(self.remote_git_repo)
         return self._codeowners_parser
 
@@ -490,10 +524,7 @@ class RepoOperator:
         """Returns True if a commit was made and False otherwise."""
         staged_changes = self.git_cli.git.diff("--staged")
         if staged_changes:
-            if self.bot_commit and (info := self._get_username_email()):
-                user, email = info
-                message += f"\n\n Co-authored-by: {user} <{email}>"
-            commit_args = ["-m", message]
+            commit_args = ["-m", self._get_commit_message(message)]
             if self.bot_commit:
                 commit_args.append(f"--author='{CODEGEN_BOT_NAME} <{CODEGEN_BOT_EMAIL}>'")
             if not verify:
@@ -504,6 +535,50 @@ class RepoOperator:
             logger.info("No changes to commit. Do nothing.")
             return False
 
+    def _get_commit_message(self, message: str) -> str:
+        if self.bot_commit and (info := self._get_username_email()):
+            user, email = info
+            message += f"\n\n Co-authored-by: {user} <{email}>"
+        return message
+
+    @stopwatch
+    def commit_files_to_branch(self, branch_name: str, base: str, files: dict[str, bytes | None], message: str) -> bool:
+        """Commits `files` on top of `base` and points `branch_name` at the commit, without touching the working tree or the index.
+
+        `files` maps the path of each changed file to its new content, or None if it was deleted.
+        Returns True if a commit was made and False otherwise.
+        """
+        base_commit = self.git_cli.commit(base)
+        index_info = []
+        for path, content in files.items():
+            if content is None:
+                # Mode 0 removes the path from the index
+                index_info.append(f"0 {'0' * 40}\t{path}")
+                continue
+            try:
+                mode = base_commit.tree[path].mode
+            except KeyError:
+                mode = 0o100644
+            blob = self.git_cli.odb.store(IStream(Blob.type, len(content), BytesIO(content)))
+            index_info.append(f"{mode:o} {blob.hexsha.decode()}\t{path}")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            env = {**os.environ, "GIT_INDEX_FILE": os.path.join(tmpdir, "index")}
+            self.git_cli.git.read_tree(base_commit.hexsha, env=env)
+            command = ["git", "update-index", "-z", "--index-info"]
+            result = subprocess.run(command, cwd=self.repo_path, input="".join(f"{info}\0" for info in index_info), env=env, capture_output=True, encoding="utf-8")
+            if result.returncode != 0:
+                raise GitCommandError(command, result.returncode, result.stderr)
+            tree = self.git_cli.git.write_tree(env=env)
+        if tree == base_commit.tree.hexsha:
+            logger.info("No changes to commit. Do nothing.")
+            return False
+
+        commit_env = {"GIT_AUTHOR_NAME": CODEGEN_BOT_NAME, "GIT_AUTHOR_EMAIL": CODEGEN_BOT_EMAIL} if self.bot_commit else {}
+        commit = self.git_cli.git.commit_tree(tree, "-p", base_commit.hexsha, "-m", self._get_commit_message(message), env=commit_env)
+        self.git_cli.git.update_ref(f"refs/heads/{branch_name}", commit)
+        return True
+
     @stopwatch
     def push_changes(self, remote: Remote | None = None, refspec: str | None = None, force: bool = False) -> PushInfoList:
         """Push the changes to the given refspec of the remote.
@@ -593,40 +668,46 @@ class RepoOperator:
         if os.listdir(self.abspath(os.path.dirname(path))) == []:
             os.rmdir(self.abspath(os.path.dirname(path)))
 
-    def get_filepaths_for_repo(self, ignore_list):
+    def get_filepaths_for_repo(self, ignore_list, subdirs: list[str] | None = None, extensions: list[str] | None = None) -> list[str]:
+        """Lists the relative paths in the repo, without checking that they are files."""
         # Get list of files to iterate over based on gitignore setting
         if self.repo_config.respect_gitignore:
             # ls-file flags:
             # -c: show cached files
             # -o: show other / untracked files
             # --exclude-standard: exclude standard gitignore rules
-            filepaths = self.git_cli.git.ls_files("-co", "--exclude-standard").split("\n")
+            # -z: separate paths with NUL and don't quote them, so unicode paths come through as is
+            filepaths = self.git_cli.git.ls_files("-co", "--exclude-standard", "-z", strip_newline_in_stdout=False).split("\0")
+            filepaths.pop()  # The output ends with a NUL
         else:
             filepaths = glob.glob("**", root_dir=self.repo_path, recursive=True, include_hidden=True)
-            # Filter filepaths by ignore list.
-        if ignore_list:
-            filepaths = [f for f in filepaths if not any(fnmatch.fnmatch(f, pattern) or f.startswith(pattern) for pattern in ignore_list)]
-
-        # Fix bug where unicode characters are not handled correctly
-        for i, filepath in enumerate(filepaths):
-            # Check if it is one of the broken cases
-            if filepath.startswith('"'):
-                # Step 1: Strip the quotes
-                filepath = filepath.strip('"').strip("'")
-
-                # Step 2: Convert the Python string to raw ASCII bytes (so \\ stays as two 0x5C).
-                raw_filepath = filepath.encode("ascii")
-
-                # Step 3: Use escape_decode to process backslash escapes like \346 -> 0xE6
-                decoded_filepath, _ = codecs.escape_decode(raw_filepath)
-
-                # Step 4: Decode those bytes as UTF-8 to get the actual Unicode text
-                filepath = decoded_filepath.decode("utf-8")
+        return _filter_filepaths(filepaths, ignore_list, subdirs, extensions)
 
-                # Step 5: Replace the original filepath with the decoded filepath
-                filepaths[i] = filepath
+    def filter_filepaths(self, filepaths: list[str], ignore_list, subdirs: list[str] | None = None, extensions: list[str] | None = None) -> list[str]:
+        """Keeps the relative paths that get_filepaths_for_repo would list, without listing the whole repo.
 
-        return filepaths
+        Like get_filepaths_for_repo, this does not check that the paths exist.
+        """
+        filepaths = _filter_filepaths(filepaths, ignore_list, subdirs, extensions)
+        if not self.repo_config.respect_gitignore or not filepaths:
+            return filepaths
+        # Tracked files are never reported, matching ls-files -c. Exit status 1 means none of the paths are ignored
+        command = ["git", "check-ignore", "-z", "--stdin"]
+        result = subprocess.run(command, cwd=self.repo_path, input="\0".join(filepaths), capture_output=True, encoding="utf-8")
+        if result.returncode not in (0, 1):
+            raise GitCommandError(command, result.returncode, result.stderr)
+        ignored = set(result.stdout.split("\0"))
+        return [f for f in filepaths if f not in ignored]
+
+    def _read_repo_file(self, rel_filepath: str, skip_content: bool) -> tuple[str, str] | None:
+        filepath = os.path.join(self.repo_path, rel_filepath)
+        try:
+            if os.path.isfile(filepath):
+                return rel_filepath, "" if skip_content else self.get_file(filepath)
+            logger.warning(f"Skipping {filepath} because it does not exist or is not a valid file.")
+        except Exception as e:
+            logger.warning(f"Error reading file {filepath}: {e}")
+        return None
 
     # TODO: unify param naming i.e. subdirectories vs subdirs probably use subdirectories since that's in the DB
     def iter_files(
@@ -643,34 +724,16 @@ class RepoOperator:
             subdirs (list[str], optional): List of subdirectories to include. Defaults to None. Can include full filenames.
             codeowners (list[str], optional): List of codeowners to iter files for. Defaults to None. Ex: if codeowners=["@group"], only files owned by @group will be included.
             extensions (list[str], optional): List of file extensions to include. Defaults to None.
+            skip_content (bool, optional): Yield an empty string instead of reading each file. Defaults to False.
 
         Yields:
         ------
             tuple: A tuple containing the relative filepath and the content of the file.
 
         """
-        filepaths = self.get_filepaths_for_repo(ignore_list)
-        # Iterate through files and yield contents
-        for rel_filepath in filepaths:
-            rel_filepath: str
-            filepath = os.path.join(self.repo_path, rel_filepath)
-
-            # Filter by subdirectory (includes full filenames)
-            if subdirs and not any(rel_filepath.startswith(subdir) for subdir in subdirs):
-                continue
-
-            if extensions is None or any(filepath.endswith(e) for e in extensions):
-                try:
-                    if os.path.isfile(filepath):
-                        if not skip_content:
-                            content = self.get_file(filepath)
-                            yield rel_filepath, content
-                        else:
-                            yield rel_filepath, ""
-                    else:
-                        logger.warning(f"Skipping {filepath} because it does not exist or is not a valid file.")
-                except Exception as e:
-                    logger.warning(f"Error reading file {filepath}: {e}")
+        for rel_filepath in self.get_filepaths_for_repo(ignore_list, subdirs=subdirs, extensions=extensions):
+            if (result := self._read_repo_file(rel_filepath, skip_content)) is not None:
+                yield result
 
     def list_files(self, subdirs: list[str] | None = None, extensions: list[str] | None = None) -> list[str]:
         """List files matching subdirs + extensions in a repo.
@@ -754,7 +817,7 @@ class RepoOperator:
         """Returns the data associated with a PR"""
         return self.remote_git_repo.get_pr_data(pr_number)
 
-    def create_pr_comment(self, pr_number: int, body: str) -> IssueComment:
+    def create_pr_comment(self, pr_number: int, body: str) -> "IssueComment":
         """Create a general comment on a pull request.
 
         Args:
@@ -800,7 +863,7 @@ class RepoOperator:
                     side=side,
                 )
 
-    def get_pull_request(self, pr_number: int) -> PullRequest | None:
+    def get_pull_request(self, pr_number: int) -> "PullRequest | None":
         """Get a GitHub Pull Request object for the given PR number.
 
         Args:
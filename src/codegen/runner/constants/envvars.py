@@ -4,3 +4,4 @@
 FEATURE_FLAGS_BASE64 = "FEATURE_FLAGS_BASE64"
 REPO_CONFIG_BASE64 = "REPO_CONFIG_BASE64"
 GITHUB_TOKEN = "GITHUB_TOKEN"
+NUM_CODEMOD_WORKERS = "NUM_CODEMOD_WORKERS"
@@ -1,3 +1,4 @@
+import asyncio
 from collections.abc import Callable
 from datetime import UTC, datetime
 
@@ -7,6 +8,7 @@ from codegen.git.models.pr_options import PROptions
 from codegen.runner.diff.get_raw_diff import get_raw_diff
 from codegen.runner.models.codemod import BranchConfig, CodemodRunResult, CreatedBranch, GroupingConfig
 from codegen.runner.sandbox.repo import SandboxRepo
+from codegen.runner.sandbox.worker_pool import InMemoryPool
 from codegen.runner.utils.branch_name import get_head_branch_name
 from codegen.runner.utils.exception_utils import update_observation_meta
 from codegen.sdk.codebase.config import SessionOptions
@@ -54,17 +56,28 @@ class SandboxExecutor:
         logger.info(f"> Created {len(groups)} groups")
         return groups
 
-    async def execute_flag_groups(self, commit_msg: str, execute_func: Callable, flag_groups: list[Group], branch_config: BranchConfig) -> tuple[list[CodemodRunResult], list[CreatedBranch]]:
+    async def execute_flag_groups(
+        self, commit_msg: str, execute_func: Callable, flag_groups: list[Group], branch_config: BranchConfig, num_workers: int = 1
+    ) -> tuple[list[CodemodRunResult], list[CreatedBranch]]:
+        """Runs the execute_func once per group and pushes the changes of each group to its own head branch.
+
+        With `num_workers` > 1, up to that many groups run at once in a pool of processes forked from the graph, and
+        their branches are committed and pushed in order as they finish. This only applies when every group gets a new
+        branch, since a group running on an existing head branch sees the changes already on it.
+        """
+        head_branch_names = [branch_config.custom_head_branch or get_head_branch_name(branch_config.branch_name, group) for group in flag_groups]
+        if num_workers > 1 and len(flag_groups) > 1 and not branch_config.custom_head_branch and not any(name in self.codebase.op.git_cli.heads for name in head_branch_names):
+            return await self._execute_flag_groups_in_parallel(commit_msg, execute_func, flag_groups, head_branch_names, branch_config, num_workers)
+
         run_results = []
         head_branches = []
-        for idx, group in enumerate(flag_groups):
+        for idx, (group, head_branch) in enumerate(zip(flag_groups, head_branch_names)):
             if idx > 0 and run_results[-1].error:
                 logger.info("Skipping remaining groups because of error in previous group")
                 break
             if group:
                 logger.info(f"Running group {group.segment} ({idx + 1} out of {len(flag_groups)})...")
 
-            head_branch = branch_config.custom_head_branch or get_head_branch_name(branch_config.branch_name, group)
             logger.info(f"Running with head branch: {head_branch}")
             self.remote_repo.reset_branch(branch_config.custom_base_branch, head_branch)
 
@@ -80,6 +93,48 @@ class SandboxExecutor:
         self.codebase.ctx.flags._flags.clear()
         return run_results, head_branches
 
+    async def _execute_flag_groups_in_parallel(
+        self, commit_msg: str, execute_func: Callable, flag_groups: list[Group], head_branch_names: list[str], branch_config: BranchConfig, num_workers: int
+    ) -> tuple[list[CodemodRunResult], list[CreatedBranch]]:
+        base_branch = branch_config.custom_base_branch
+        self.codebase.checkout(branch=base_branch, create_if_missing=True)
+        base_commit = self.codebase.op.head_commit.hexsha
+
+        async def run_group(idx: int) -> CodemodRunResult:
+            # Runs in a worker, which inherits the groups when it is forked
+            return await self.execute(execute_func, group=flag_groups[idx])
+
+        logger.info(f"Running {len(flag_groups)} groups with {num_workers} workers...")
+        # Every worker is forked before the pushes below start running on other threads
+        pool = InMemoryPool(self.codebase, run_group, min(num_workers, len(flag_groups)))
+        pool.start()
+        tasks = [asyncio.create_task(pool.run(idx)) for idx in range(len(flag_groups))]
+        run_results = []
+        head_branches = []
+        try:
+            for idx, (group, head_branch, task) in enumerate(zip(flag_groups, head_branch_names, tasks)):
+                if idx > 0 and run_results[-1].error:
+                    logger.info("Skipping remaining groups because of error in previous group")
+                    break
+                run_result, files = await task
+                if group:
+                    logger.info(f"Pushing group {group.segment} ({idx + 1} out of {len(flag_groups)}) to head branch: {head_branch}")
+
+                # The groups after this one keep running while it is committed and pushed
+                created_branch = CreatedBranch(base_branch=base_branch, head_ref=None)
+                if await asyncio.to_thread(self.remote_repo.push_files_to_remote, commit_msg, base_commit, head_branch, files, branch_config.force_push_head_branch):
+                    created_branch.head_ref = head_branch
+                run_results.append(run_result)
+                head_branches.append(created_branch)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await pool.close()
+
+        self.codebase.ctx.flags._flags.clear()
+        return run_results, head_branches
+
     async def execute(self, execute_func: Callable, group: Group | None = None, session_options: SessionOptions = SessionOptions()) -> CodemodRunResult:
         """Runs the execute_func in edit_mode and returns the saved the result"""
         self.codebase.set_find_mode(False)
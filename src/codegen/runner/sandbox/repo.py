@@ -60,7 +60,16 @@ class SandboxRepo:
         if not has_staged_commit:
             logger.info("Skipping opening pull request for cm_run b/c the codemod produced no changes")
             return False
+        return self._push_branch(head_branch, force_push)
 
+    def push_files_to_remote(self, commit_msg: str, base_commit: str, head_branch: str, files: dict[str, bytes | None], force_push: bool) -> bool:
+        """Commits `files` on top of `base_commit` to the head branch and pushes it, without checking out the branch"""
+        if not self.codebase.op.commit_files_to_branch(head_branch, base_commit, files, f"[Codegen] {commit_msg}"):
+            logger.info("Skipping opening pull request for cm_run b/c the codemod produced no changes")
+            return False
+        return self._push_branch(head_branch, force_push)
+
+    def _push_branch(self, head_branch: str, force_push: bool) -> bool:
         # =====[ Push changes highside ]=====
         highside_remote = self.codebase.op.git_cli.remote(name="origin")
         highside_res = self.codebase.op.push_changes(remote=highside_remote, refspec=f"{head_branch}:{head_branch}", force=force_push)
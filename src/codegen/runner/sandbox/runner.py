@@ -6,6 +6,7 @@ from codegen.git.schemas.enums import SetupOption
 from codegen.git.schemas.repo_config import RepoConfig
 from codegen.runner.models.apis import CreateBranchRequest, CreateBranchResponse, GetDiffRequest, GetDiffResponse
 from codegen.runner.sandbox.executor import SandboxExecutor
+from codegen.runner.sandbox.worker_pool import CodemodWorkerPool
 from codegen.sdk.codebase.config import ProjectConfig, SessionOptions
 from codegen.sdk.codebase.factory.codebase_factory import CodebaseType
 from codegen.sdk.core.codebase import Codebase
@@ -25,6 +26,7 @@ class SandboxRunner:
     # =====[ computed instance attributes ]=====
     codebase: CodebaseType
     executor: SandboxExecutor
+    worker_pool: CodemodWorkerPool | None = None
 
     def __init__(self, repo_config: RepoConfig, op: RepoOperator | None = None) -> None:
         self.repo = repo_config
@@ -38,6 +40,11 @@ class SandboxRunner:
         self.codebase = await self._build_graph(codebase_config)
         self.executor = SandboxExecutor(self.codebase)
 
+    def start_workers(self, num_workers: int) -> None:
+        """Forks `num_workers` processes from the warmed graph, which run get_diff requests concurrently."""
+        self.worker_pool = CodemodWorkerPool(self, num_workers)
+        self.worker_pool.start()
+
     async def _build_graph(self, codebase_config: CodebaseConfig | None = None) -> Codebase:
         logger.info("> Building graph...")
         projects = [ProjectConfig(programming_language=self.repo.language, repo_operator=self.op, base_path=self.repo.base_path, subdirectories=self.repo.subdirectories)]
@@ -79,7 +86,8 @@ class SandboxRunner:
             logger.info(f"Max PRs limit reached: {max_prs}. Skipping remaining groups.")
             flag_groups = flag_groups[:max_prs]
 
-        run_results, branches = await self.executor.execute_flag_groups(request.commit_msg, code_to_exec, flag_groups, branch_config)
+        num_workers = self.worker_pool.num_workers if self.worker_pool else 1
+        run_results, branches = await self.executor.execute_flag_groups(request.commit_msg, code_to_exec, flag_groups, branch_config, num_workers=num_workers)
         response.results = run_results
         response.branches = branches
 
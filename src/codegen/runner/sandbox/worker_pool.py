@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+import multiprocessing
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+from codegen.sdk.codebase.io.memory_io import MemoryIO
+from codegen.shared.logging.get_logger import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Awaitable, Callable
+    from multiprocessing.connection import Connection
+    from multiprocessing.process import BaseProcess
+
+    from codegen.runner.models.apis import GetDiffRequest, GetDiffResponse
+    from codegen.runner.sandbox.runner import SandboxRunner
+    from codegen.sdk.codebase.factory.codebase_factory import CodebaseType
+
+logger = get_logger(__name__)
+
+A = TypeVar("A")
+T = TypeVar("T")
+
+
+def _serve(runner: SandboxRunner, conn: Connection) -> None:
+    """Runs in a forked worker: executes get_diff requests one at a time, keeping their changes in memory"""
+    runner.worker_pool = None
+    io = MemoryIO(runner.codebase.ctx.io)
+    runner.codebase.ctx.io = io
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        try:
+            response = asyncio.run(runner.get_diff(request))
+        except Exception as e:
+            logger.exception(f"Failed to run codemod in worker: {e}")
+            response = e
+        finally:
+            runner.codebase.reset()
+            io.discard()
+            runner.codebase.ctx.flags._flags.clear()
+        conn.send(response)
+
+
+def _serve_in_memory(codebase: CodebaseType, func: Callable[[A], Awaitable[T]], conn: Connection) -> None:
+    """Runs in a forked worker: awaits `func` on each argument received, and sends back its result with the files it changed"""
+    io = MemoryIO(codebase.ctx.io)
+    codebase.ctx.io = io
+    while True:
+        try:
+            arg = conn.recv()
+        except EOFError:
+            return
+        try:
+            response = (asyncio.run(func(arg)), io.get_changed_files(Path(codebase.repo_path)))
+        except Exception as e:
+            logger.exception(f"Failed to run in worker: {e}")
+            response = e
+        finally:
+            codebase.reset()
+            io.discard()
+        conn.send(response)
+
+
+class _Worker:
+    process: BaseProcess
+    conn: Connection
+
+    def __init__(self, process: BaseProcess, conn: Connection) -> None:
+        self.process = process
+        self.conn = conn
+
+    def call(self, request: object) -> object:
+        self.conn.send(request)
+        response = self.conn.recv()
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def close(self) -> None:
+        self.conn.close()
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+
+
+class _ForkedPool(ABC):
+    """Processes forked from the current graph, which share it through copy-on-write memory.
+
+    Requests are sent to the workers from the threads of the pool's executor. Forking while another thread holds a lock
+    (ie: the logging lock) leaves the lock held in the child, so the pool only forks while none of its requests are
+    running, after shutting down the executor. Unless something else started threads, workers are forked from a
+    single-threaded process.
+    """
+
+    num_workers: int
+    _idle: asyncio.Queue[_Worker]
+    # Created on the first request, and shut down before forking
+    _executor: ThreadPoolExecutor | None
+    # Requests being sent or waited on from another thread, and notified when one of them stops
+    _running: int
+    _stopped: asyncio.Condition
+
+    def __init__(self, num_workers: int, name: str) -> None:
+        if num_workers < 1:
+            msg = f"num_workers must be at least 1, got {num_workers}"
+            raise ValueError(msg)
+        self.num_workers = num_workers
+        self.name = name
+        self._mp_context = multiprocessing.get_context("fork")
+        self._idle = asyncio.Queue()
+        self._executor = None
+        self._running = 0
+        self._stopped = asyncio.Condition()
+
+    @abstractmethod
+    def _target(self) -> tuple[Callable[..., None], tuple]:
+        """The function each worker runs and its arguments, besides the worker's end of the pipe"""
+
+    def _shutdown_executor(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _fork_all(self) -> None:
+        self._shutdown_executor()
+        # Objects tracked by the collector would be copied into each worker as soon as it runs a collection
+        gc.collect()
+        gc.freeze()
+        try:
+            for _ in range(self.num_workers):
+                self._idle.put_nowait(self._fork())
+        finally:
+            # This process keeps collecting its own garbage, including the graph it replaces on the next sync
+            gc.unfreeze()
+
+    def _fork(self) -> _Worker:
+        target, args = self._target()
+        conn, child_conn = self._mp_context.Pipe()
+        process = self._mp_context.Process(target=target, args=(*args, child_conn), name=self.name, daemon=True)
+        process.start()
+        child_conn.close()
+        return _Worker(process, conn)
+
+    async def _call(self, worker: _Worker, request: object) -> object:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.num_workers, thread_name_prefix=self.name)
+        self._running += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, worker.call, request)
+        finally:
+            self._running -= 1
+            async with self._stopped:
+                self._stopped.notify_all()
+
+    async def _replace(self, worker: _Worker) -> _Worker:
+        """Forks a worker to replace one that exited, once no other request is running"""
+        worker.close()
+        async with self._stopped:
+            await self._stopped.wait_for(lambda: self._running == 0)
+            self._shutdown_executor()
+            return self._fork()
+
+    async def close(self) -> None:
+        """Stops all workers, after the running requests"""
+        for _ in range(self.num_workers):
+            (await self._idle.get()).close()
+        self._shutdown_executor()
+
+
+class InMemoryPool(_ForkedPool, Generic[A, T]):
+    """Awaits `func` in processes forked from the current graph, leaving the graph and the working tree of this process untouched.
+
+    Each worker keeps the changes of a call in a MemoryIO and resets before the next one. `func` is inherited by the
+    workers when they are forked, so only its argument is sent to them.
+    """
+
+    codebase: CodebaseType
+    func: Callable[[A], Awaitable[T]]
+
+    def __init__(self, codebase: CodebaseType, func: Callable[[A], Awaitable[T]], num_workers: int) -> None:
+        super().__init__(num_workers, name="codemod-fork")
+        self.codebase = codebase
+        self.func = func
+
+    def _target(self) -> tuple[Callable[..., None], tuple]:
+        return _serve_in_memory, (self.codebase, self.func)
+
+    def start(self) -> None:
+        """Forks the workers. Call it before other threads are started, ie: before the first `run`"""
+        self._fork_all()
+
+    async def run(self, arg: A) -> tuple[T, dict[str, bytes | None]]:
+        """Awaits `func(arg)` in the next idle worker. Returns its result and the files it changed, as `MemoryIO.get_changed_files`"""
+        worker = await self._idle.get()
+        try:
+            return await self._call(worker, arg)
+        except asyncio.CancelledError:
+            # Unblocks the thread waiting on the result. The dead worker is only returned to be closed with the pool
+            worker.process.kill()
+            worker.process.join()
+            raise
+        finally:
+            self._idle.put_nowait(worker)
+
+
+class CodemodWorkerPool(_ForkedPool):
+    """Runs codemods in processes forked from a warmed runner, which share its parsed graph through copy-on-write memory.
+
+    Workers never write to the working tree: each keeps the changes of a codemod in a MemoryIO, returns the diff and
+    resets before the next request. Requests go to the first idle worker, so `num_workers` codemods run at once
+    without building the graph again.
+
+    Workers see the graph and the working tree as they were when forked. Anything that changes either (ie: syncing to a
+    new commit) must run under `exclusive`, which forks the workers again afterwards.
+    """
+
+    runner: SandboxRunner
+
+    def __init__(self, runner: SandboxRunner, num_workers: int) -> None:
+        super().__init__(num_workers, name="codemod-worker")
+        self.runner = runner
+
+    def _target(self) -> tuple[Callable[..., None], tuple]:
+        return _serve, (self.runner,)
+
+    def start(self) -> None:
+        logger.info(f"> Forking {self.num_workers} codemod workers")
+        self._fork_all()
+
+    async def get_diff(self, request: GetDiffRequest) -> GetDiffResponse:
+        """Runs the codemod of `request` in the next idle worker"""
+        worker = await self._idle.get()
+        try:
+            return await self._call(worker, request)
+        except (EOFError, OSError):
+            logger.exception(f"Codemod worker {worker.process.pid} exited, forking a new one")
+            worker = await self._replace(worker)
+            raise
+        finally:
+            self._idle.put_nowait(worker)
+
+    @asynccontextmanager
+    async def exclusive(self) -> AsyncGenerator[None]:
+        """Waits for the running codemods and holds off new ones, then forks the workers again from the current graph"""
+        workers = [await self._idle.get() for _ in range(self.num_workers)]
+        try:
+            yield
+        finally:
+            for worker in workers:
+                worker.close()
+            self._fork_all()
@@ -1,5 +1,6 @@
 import logging
-from contextlib import asynccontextmanager
+import os
+from contextlib import asynccontextmanager, nullcontext
 
 from fastapi import FastAPI
 
@@ -8,6 +9,7 @@ from codegen.git.configs.constants import CODEGEN_BOT_EMAIL, CODEGEN_BOT_NAME
 from codegen.git.repo_operator.repo_operator import RepoOperator
 from codegen.git.schemas.enums import SetupOption
 from codegen.git.schemas.repo_config import RepoConfig
+from codegen.runner.constants.envvars import NUM_CODEMOD_WORKERS
 from codegen.runner.enums.warmup_state import WarmupState
 from codegen.runner.models.apis import (
     RUN_FUNCTION_ENDPOINT,
@@ -53,6 +55,8 @@ async def lifespan(server: FastAPI):
         codebase_config = DefaultCodebaseConfig.model_copy(update={"sync_enabled": True})
         await runner.warmup(codebase_config=codebase_config)
         server_info.synced_commit = runner.op.head_commit.hexsha
+        if (num_workers := int(os.environ.get(NUM_CODEMOD_WORKERS, 0))) > 0:
+            runner.start_workers(num_workers)
         server_info.warmup_state = WarmupState.COMPLETED
 
     except Exception:
@@ -62,6 +66,8 @@ async def lifespan(server: FastAPI):
     logger.info("Local daemon is ready to accept requests!")
     yield
     logger.info("Shutting down local daemon server")
+    if runner.worker_pool is not None:
+        await runner.worker_pool.close()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -74,15 +80,34 @@ def health() -> ServerInfo:
 
 @app.post(RUN_FUNCTION_ENDPOINT)
 async def run(request: RunFunctionRequest) -> CodemodRunResult:
-    _save_uncommitted_changes_and_sync()
     diff_req = GetDiffRequest(codemod=Codemod(user_code=request.codemod_source))
-    diff_response = await runner.get_diff(request=diff_req)
-    if request.commit:
-        if commit_sha := runner.codebase.git_commit(f"[Codegen] {request.function_name}", exclude_paths=[".codegen/*"]):
-            logger.info(f"Committed changes to {commit_sha.hexsha}")
+    pool = runner.worker_pool
+    if pool is not None and not request.commit:
+        # Workers only read the working tree, so they run concurrently unless it has to be synced first
+        if _needs_sync():
+            async with pool.exclusive():
+                _save_uncommitted_changes_and_sync()
+        diff_response = await pool.get_diff(diff_req)
+        return diff_response.result
+
+    # Changes the working tree, which the workers must not see until the graph is synced to it
+    async with pool.exclusive() if pool is not None else nullcontext():
+        _save_uncommitted_changes_and_sync()
+        diff_response = await runner.get_diff(request=diff_req)
+        if request.commit:
+            if commit_sha := runner.codebase.git_commit(f"[Codegen] {request.function_name}", exclude_paths=[".codegen/*"]):
+                logger.info(f"Committed changes to {commit_sha.hexsha}")
+        if pool is not None:
+            _save_uncommitted_changes_and_sync()
     return diff_response.result
 
 
+def _needs_sync() -> bool:
+    if runner.op.git_cli.git.status("--porcelain", "--", ".", ":!.codegen"):
+        return True
+    return runner.op.head_commit != runner.codebase.ctx.synced_commit
+
+
 def _save_uncommitted_changes_and_sync() -> None:
     if commit := runner.codebase.git_commit("[Codegen] Save uncommitted changes", exclude_paths=[".codegen/*"]):
         logger.info(f"Saved uncommitted changes to {commit.hexsha}")
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any
+
+from codegen.shared.logging.get_logger import get_logger
+
+if TYPE_CHECKING:
+    from rustworkx import PyDiGraph
+
+    from codegen.sdk.codebase.codebase_context import CodebaseContext
+    from codegen.sdk.core.file import SourceFile
+
+logger = get_logger(__name__)
+
+# Indexes of CodebaseContext that change along with the graph, as dicts of sets or of plain values
+_SET_INDEXES = ("_node_type_idx", "_symbol_type_idx", "_symbol_name_idx")
+_DICT_INDEXES = ("_symbol_names", "filepath_idx", "_module_idx", "_ext_module_idx")
+
+
+def _get_state(obj: Any) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Shallow copy of the attributes of `obj`, as its __dict__ and its slots"""
+    slots = {}
+    for cls in type(obj).__mro__:
+        for name in cls.__dict__.get("__slots__", ()):
+            if name not in ("__dict__", "__weakref__") and hasattr(obj, name):
+                slots[name] = getattr(obj, name)
+    return dict(obj.__dict__), slots
+
+
+def _set_state(obj: Any, state: tuple[dict[str, Any], dict[str, Any]]) -> None:
+    attributes, slots = state
+    obj.__dict__.clear()
+    obj.__dict__.update(attributes)
+    for name, value in slots.items():
+        object.__setattr__(obj, name, value)
+
+
+class GraphCheckpoint:
+    """Copy-on-write checkpoint of the graph and of the parsed files, which `Codebase.reset()` restores without reparsing.
+
+    Nothing is copied until the graph first changes. The graph (sharing its node and edge payloads) and the node
+    indexes are then copied, and each file's attributes are saved right before the file is unparsed or reparsed.
+    Reparsing replaces a file's containers instead of clearing them, so a shallow copy of its attributes is enough.
+    Restoring swaps the copies back, so it only does work for the files that changed.
+    """
+
+    graph: PyDiGraph | None
+    indexes: dict[str, Any]
+    files: dict[int, tuple[SourceFile, tuple[dict[str, Any], dict[str, Any]]]]
+    paths: set[str]
+
+    def __init__(self) -> None:
+        self.graph = None
+        self.indexes = {}
+        # Keyed by id, since the hash of a file changes with its content
+        self.files = {}
+        # Relative paths of the files synced since the checkpoint was taken
+        self.paths = set()
+
+    @property
+    def is_saved(self) -> bool:
+        """Whether the graph changed since the checkpoint was taken"""
+        return self.graph is not None
+
+    def save(self, ctx: CodebaseContext) -> None:
+        """Copies the graph and the node indexes, before they first change"""
+        self.graph = ctx._graph.copy()
+        for name in _SET_INDEXES:
+            self.indexes[name] = {key: set(value) for key, value in getattr(ctx, name).items()}
+        for name in _DICT_INDEXES:
+            self.indexes[name] = dict(getattr(ctx, name))
+        self.indexes["_unnamed_symbols"] = set(ctx._unnamed_symbols)
+
+    def save_file(self, file: SourceFile) -> None:
+        """Saves the attributes of `file`, before they first change"""
+        if id(file) not in self.files:
+            self.files[id(file)] = (file, _get_state(file))
+
+    def restore(self, ctx: CodebaseContext) -> set[str]:
+        """Brings the graph, the node indexes and the parsed files back to the checkpoint.
+
+        Returns the paths of the files synced since, which may no longer match the files on disk.
+        """
+        logger.info(f"Restoring graph checkpoint with {len(self.files)} changed files")
+        ctx._graph = self.graph
+        for name in _SET_INDEXES:
+            setattr(ctx, name, defaultdict(set, self.indexes[name]))
+        for name in (*_DICT_INDEXES, "_unnamed_symbols"):
+            setattr(ctx, name, self.indexes[name])
+        ctx.import_resolution_cache.clear()
+        for file, state in self.files.values():
+            _set_state(file, state)
+        paths = self.paths
+        self.graph = None
+        self.indexes = {}
+        self.files = {}
+        self.paths = set()
+        return paths
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import os
+import threading
+from bisect import bisect_left
 from collections import Counter, defaultdict
 from contextlib import contextmanager
 from enum import IntEnum, auto, unique
@@ -13,29 +15,36 @@ from rustworkx import PyDiGraph, WeightedEdgeList
 
 from codegen.configs.models.codebase import CodebaseConfig, PinkMode
 from codegen.configs.models.secrets import SecretsConfig
+from codegen.sdk.codebase.checkpoint import GraphCheckpoint
 from codegen.sdk.codebase.config import ProjectConfig, SessionOptions
 from codegen.sdk.codebase.config_parser import ConfigParser, get_config_parser_for_language
+from codegen.sdk.codebase.dependency_resolution import resolve_dependencies
 from codegen.sdk.codebase.diff_lite import ChangeType, DiffLite
+from codegen.sdk.codebase.file_parsing import iter_parsed_files
 from codegen.sdk.codebase.flagging.flags import Flags
 from codegen.sdk.codebase.io.file_io import FileIO
+from codegen.sdk.codebase.lazy_graph import LazyGraph
 from codegen.sdk.codebase.progress.stub_progress import StubProgress
+from codegen.sdk.codebase.snapshot import restore_graph_snapshot, save_graph_snapshot
 from codegen.sdk.codebase.transaction_manager import TransactionManager
+from codegen.sdk.codebase.usage_edges import UsageEdgeStore
 from codegen.sdk.codebase.validation import get_edges, post_reset_validation
 from codegen.sdk.core.autocommit import AutoCommit, commiter
 from codegen.sdk.core.directory import Directory
 from codegen.sdk.core.external.dependency_manager import DependencyManager, get_dependency_manager
 from codegen.sdk.core.external.language_engine import LanguageEngine, get_language_engine
-from codegen.sdk.enums import Edge, EdgeType, NodeType
+from codegen.sdk.enums import Edge, EdgeType, NodeType, SymbolType
 from codegen.sdk.extensions.sort import sort_editables
-from codegen.sdk.extensions.utils import uncache_all
+from codegen.sdk.extensions.utils import uncache_all, uncache_files
 from codegen.sdk.typescript.external.ts_declassify.ts_declassify import TSDeclassify
+from codegen.shared.decorators.docs import noapidoc
 from codegen.shared.enums.programming_language import ProgrammingLanguage
 from codegen.shared.exceptions.control_flow import StopCodemodException
 from codegen.shared.logging.get_logger import get_logger
 from codegen.shared.performance.stopwatch_utils import stopwatch
 
 if TYPE_CHECKING:
-    from collections.abc import Generator, Mapping, Sequence
+    from collections.abc import Generator, Iterable, Mapping, Sequence
 
     from codeowners import CodeOwners as CodeOwnersParser
     from git import Commit as GitCommit
@@ -51,6 +60,7 @@ if TYPE_CHECKING:
     from codegen.sdk.core.interfaces.importable import Importable
     from codegen.sdk.core.node_id_factory import NodeId
     from codegen.sdk.core.parser import Parser
+    from codegen.sdk.core.symbol import Symbol
 
 logger = get_logger(__name__)
 
@@ -72,6 +82,14 @@ GLOBAL_FILE_IGNORE_LIST = [
 ]
 
 
+def _module_key(file_path: str) -> tuple[str, ...] | None:
+    """Module path of a python file, e.g. `src/a/__init__.py` -> ("src", "a", "__init__")"""
+    path, ext = os.path.splitext(file_path)
+    if ext != ".py":
+        return None
+    return tuple(path.split(os.sep))
+
+
 @unique
 class SyncType(IntEnum):
     DELETE = auto()
@@ -115,6 +133,15 @@ class CodebaseContext:
     parser: Parser[Expression]
     synced_commit: GitCommit | None
     directories: dict[Path, Directory]
+    # Held while the graph is updated, ie: by a CodebaseWatcher on its own thread
+    sync_lock: threading.RLock
+    # State of the graph at the synced commit, restored by undo_applied_diffs. None if it can't be restored this way
+    _checkpoint: GraphCheckpoint | None
+    # The checkpoint while nothing changed since it was taken, so it still needs to be saved before the next change
+    _unsaved_checkpoint: GraphCheckpoint | None
+    # Every file in the directory tree as (directory parts, file name). Sorting by directory parts keeps each subtree
+    # contiguous, with a directory's own files before those of its subdirectories
+    _directory_file_index: list[tuple[tuple[str, ...], str]]
     base_url: str | None
     extensions: list[str]
     config_parser: ConfigParser | None
@@ -122,7 +149,11 @@ class CodebaseContext:
     language_engine: LanguageEngine | None
     _computing = False
     _graph: PyDiGraph[Importable, Edge]
+    # Seconds spent computing the dependencies of each file during the last full build
+    dependency_timings: dict[str, float]
     filepath_idx: dict[str, NodeId]
+    # Python module path (file path without `.py`, split into parts) to file node id
+    _module_idx: dict[tuple[str, ...], NodeId]
     _ext_module_idx: dict[str, NodeId]
     flags: Flags
     session_options: SessionOptions = SessionOptions()
@@ -146,7 +177,12 @@ class CodebaseContext:
         self.__graph = PyDiGraph()
         self.__graph_ready = False
         self.filepath_idx = {}
+        self._module_idx = {}
+        self._relative_paths: dict[str, str] = {}
+        # Memoized import specifier resolutions, only valid as long as the set of files does not change
+        self.import_resolution_cache: dict[tuple, NodeId | None] = {}
         self._ext_module_idx = {}
+        self._reset_node_indexes()
         self.generation = 0
 
         # NOTE: The differences between base_path, repo_name, and repo_path
@@ -175,10 +211,20 @@ class CodebaseContext:
             self.io = io or FileIO()
         # =====[ computed attributes ]=====
         self.transaction_manager = TransactionManager()
+        # SYMBOL_USAGE edges are kept out of the graph when compact_usage_edges is enabled
+        self.usage_edges = UsageEdgeStore(self) if self.config.compact_usage_edges else None
+        self.lazy_graph = None
+        # Set while edges are collected instead of being added to the graph
+        self._collected_edges = None
+        self.sync_lock = threading.RLock()
+        self._checkpoint = None
+        self._unsaved_checkpoint = None
+        self.dependency_timings = {}
         self._autocommit = AutoCommit(self)
         self.init_nodes = None
         self.init_edges = None
         self.directories = dict()
+        self._directory_file_index = []
         self.parser = Parser.from_node_classes(self.node_classes, log_parse_warnings=self.config.debug)
         self.extensions = self.node_classes.file_cls.get_extensions()
         # ORDER IS IMPORTANT HERE!
@@ -200,7 +246,9 @@ class CodebaseContext:
                 raise ValueError(msg)
 
         # Build the graph
-        if not self.config.exp_lazy_graph and self.config.use_pink != PinkMode.ALL_FILES:
+        if self.config.exp_lazy_graph and self.config.use_pink != PinkMode.ALL_FILES and not self.config.disable_file_parse:
+            self._start_lazy_graph(context.repo_operator)
+        elif not self.config.exp_lazy_graph and self.config.use_pink != PinkMode.ALL_FILES:
             self.build_graph(context.repo_operator)
         try:
             self.synced_commit = context.repo_operator.head_commit
@@ -226,19 +274,57 @@ class CodebaseContext:
     def _graph(self, value: PyDiGraph[Importable, Edge]) -> None:
         self.__graph = value
 
+    def _start_lazy_graph(self, repo_operator: RepoOperator) -> None:
+        """Starts from an empty graph, which is filled on demand as nodes and edges are read (see LazyGraph)"""
+        self.__graph_ready = True
+
+        def list_files() -> Iterable[str]:
+            for filepath, _ in repo_operator.iter_files(subdirs=self.projects[0].subdirectories, extensions=self.extensions, ignore_list=GLOBAL_FILE_IGNORE_LIST, skip_content=True):
+                yield filepath
+
+        self.lazy_graph = LazyGraph(self, list_files)
+        self.build_directory_tree()
+
+    def _parse_all_files(self, link: bool = False) -> None:
+        """With exp_lazy_graph, parses (and links, if `link`) the files that were not needed so far"""
+        if self.lazy_graph is not None and not self.lazy_graph.busy:
+            self.lazy_graph.parse_all()
+            if link:
+                self.lazy_graph.link_all()
+
+    def _resolve_all_files(self) -> None:
+        """With exp_lazy_graph, parses and resolves the files that were not needed so far, completing the graph"""
+        if self.lazy_graph is not None and not self.lazy_graph.busy:
+            self.lazy_graph.resolve_all()
+            self.lazy_graph = None
+
     @stopwatch
     @commiter
     def build_graph(self, repo_operator: RepoOperator) -> None:
         """Builds a codebase graph based on the current file state of the given repo operator"""
         self.__graph_ready = True
+        self.lazy_graph = None
+        self._checkpoint = self._unsaved_checkpoint = None
         self._graph.clear()
+        self._reset_node_indexes()
+        if self.usage_edges is not None:
+            self.usage_edges.clear()
+
+        # =====[ Restore the graph from a snapshot if one exists ]=====
+        if self.config.graph_snapshot_dir is not None and not self.config.disable_file_parse:
+            if restore_graph_snapshot(self, repo_operator):
+                logger.info(f"> Restored {len(self.nodes)} nodes and {len(self.edges)} edges from graph snapshot")
+                if self.config.track_graph:
+                    self._save_old_graph()
+                self._take_checkpoint()
+                return
 
         # =====[ Add all files to the graph in parallel ]=====
         syncs = defaultdict(lambda: [])
         if self.config.disable_file_parse:
             logger.warning("WARNING: File parsing is disabled!")
         else:
-            for filepath, _ in repo_operator.iter_files(subdirs=self.projects[0].subdirectories, extensions=self.extensions, ignore_list=GLOBAL_FILE_IGNORE_LIST):
+            for filepath, _ in repo_operator.iter_files(subdirs=self.projects[0].subdirectories, extensions=self.extensions, ignore_list=GLOBAL_FILE_IGNORE_LIST, skip_content=True):
                 syncs[SyncType.ADD].append(self.to_absolute(filepath))
         logger.info(f"> Parsing {len(syncs[SyncType.ADD])} files in {self.projects[0].subdirectories or 'ALL'} subdirectories with {self.extensions} extensions")
         self._process_diff_files(syncs, incremental=False)
@@ -246,20 +332,41 @@ class CodebaseContext:
         logger.info(f"> Found {len(files)} files")
         logger.info(f"> Found {len(self.nodes)} nodes and {len(self.edges)} edges")
         if self.config.track_graph:
-            self.old_graph = self._graph.copy()
+            self._save_old_graph()
+        if self.config.graph_snapshot_dir is not None and not self.config.disable_file_parse and not self.config.disable_graph:
+            save_graph_snapshot(self, repo_operator)
+        self._take_checkpoint()
 
     @stopwatch
     @commiter
-    def apply_diffs(self, diff_list: list[DiffLite]) -> None:
-        """Applies the given set of diffs to the graph in order to match the current file system content"""
+    def apply_diffs(self, diff_list: Iterable[DiffLite]) -> None:
+        """Applies the given set of diffs to the graph in order to match the current file system content
+
+        The diffs are consumed in one pass, so they can be streamed without holding them in memory.
+        Holds `sync_lock` for the whole update, so other threads can take it to wait for a consistent graph.
+        """
+        with self.sync_lock:
+            self._apply_diffs(diff_list)
+
+    def _apply_diffs(self, diff_list: Iterable[DiffLite]) -> None:
         if self.session_options:
             self.session_options = self.session_options.model_copy(update={"max_seconds": None})
-        logger.info(f"Applying {len(diff_list)} diffs to graph")
+        num_diffs = 0
         files_to_sync: dict[Path, SyncType] = {}
+        # Files of any type that may have been added to or removed from the directory tree
+        tree_paths: set[str] = set()
         # Gather list of deleted files, new files to add, and modified files to reparse
         file_cls = self.node_classes.file_cls
         extensions = file_cls.get_extensions()
         for diff in diff_list:
+            num_diffs += 1
+            for path in (diff.path, diff.rename_from, diff.rename_to):
+                if path is not None:
+                    self.io.invalidate(self.to_absolute(path))
+                    if self._checkpoint is not None:
+                        self._checkpoint.paths.add(str(self.to_relative(path)))
+                    if diff.change_type != ChangeType.Modified:
+                        tree_paths.add(str(self.to_relative(path)))
             filepath = Path(diff.path)
             if extensions is not None and filepath.suffix not in extensions:
                 continue
@@ -278,11 +385,19 @@ class CodebaseContext:
                 files_to_sync[filepath] = SyncType.DELETE
             else:
                 logger.warning(f"Unhandled diff change type: {diff.change_type}")
+        logger.info(f"Applying {num_diffs} diffs to graph")
         by_sync_type = defaultdict(lambda: [])
         if self.config.disable_file_parse:
             logger.warning("WARNING: File parsing is disabled!")
         else:
             for filepath, sync_type in files_to_sync.items():
+                if self.lazy_graph is not None and (relpath := str(self.to_relative(filepath))) not in self.filepath_idx:
+                    # Files which were never parsed are parsed when they are needed
+                    if sync_type is SyncType.DELETE:
+                        self.lazy_graph.remove_file(relpath)
+                    else:
+                        self.lazy_graph.add_file(relpath)
+                    continue
                 if self.get_file(filepath) is None:
                     if sync_type is SyncType.DELETE:
                         # SourceFile is already deleted, nothing to do here
@@ -296,7 +411,13 @@ class CodebaseContext:
 
                 by_sync_type[sync_type].append(filepath)
         self.generation += 1
-        self._process_diff_files(by_sync_type)
+        if self.lazy_graph is not None:
+            self.lazy_graph.reset()
+            # Only the changed files are recomputed, like in a complete graph
+            with self.lazy_graph.paused():
+                self._process_diff_files(by_sync_type, tree_paths=tree_paths)
+        else:
+            self._process_diff_files(by_sync_type, tree_paths=tree_paths)
 
     def _reset_files(self, syncs: list[DiffLite]) -> None:
         files_to_write = []
@@ -306,14 +427,14 @@ class CodebaseContext:
             if sync.path in modified_files:
                 continue
             if sync.change_type == ChangeType.Removed:
-                files_to_write.append((sync.path, sync.old_content))
+                files_to_write.append((sync.path, sync))
                 modified_files.add(sync.path)
                 logger.info(f"Removing {sync.path} from disk")
             elif sync.change_type == ChangeType.Modified:
-                files_to_write.append((sync.path, sync.old_content))
+                files_to_write.append((sync.path, sync))
                 modified_files.add(sync.path)
             elif sync.change_type == ChangeType.Renamed:
-                files_to_write.append((sync.rename_from, sync.old_content))
+                files_to_write.append((sync.rename_from, sync))
                 files_to_remove.append(sync.rename_to)
                 modified_files.add(sync.rename_from)
                 modified_files.add(sync.rename_to)
@@ -324,8 +445,8 @@ class CodebaseContext:
         for file in files_to_remove:
             self.io.delete_file(file)
         to_save = set()
-        for file, content in files_to_write:
-            self.io.write_file(file, content)
+        for file, sync in files_to_write:
+            self.io.write_file(file, sync.get_old_content())
             to_save.add(file)
         self.io.save_files(to_save)
 
@@ -340,11 +461,74 @@ class CodebaseContext:
         self.reset_codebase()
         self.io.check_changes()
         self.pending_syncs.clear()  # Discard pending changes
-        if len(self.all_syncs) > 0:
+        if self._checkpoint is not None and self._checkpoint.is_saved:
+            logger.info(f"Restoring graph from before {len(self.all_syncs)} diffs. Current graph commit: {self.synced_commit}")
+            self._restore_checkpoint()
+        elif len(self.all_syncs) > 0:
             logger.info(f"Unapplying {len(self.all_syncs)} diffs to graph. Current graph commit: {self.synced_commit}")
             self._revert_diffs(list(reversed(self.all_syncs)))
         self.all_syncs.clear()
 
+    def _save_old_graph(self) -> None:
+        """Keeps a copy of the graph, including compacted usage edges, to validate resets against"""
+        self.old_graph = self._graph.copy()
+        self.old_usage_edges = self.usage_edges.rows() if self.usage_edges is not None else []
+
+    def _get_validation_edges(self) -> list[tuple]:
+        return get_edges(self._graph, self.usage_edges.rows() if self.usage_edges is not None else [])
+
+    def _validate_reset(self) -> None:
+        old_edges = get_edges(self.old_graph, self.old_usage_edges)
+        post_reset_validation(self.old_graph.nodes(), self._graph.nodes(), old_edges, self._get_validation_edges(), self.repo_name, self.projects[0].subdirectories)
+
+    def _take_checkpoint(self) -> None:
+        """Makes the current graph the one undo_applied_diffs restores. Lazy graphs and compacted usage edges are
+        reverted by reapplying the diffs instead.
+        """
+        if self.lazy_graph is None and self.usage_edges is None and not self.config.disable_graph and not self.config.disable_file_parse:
+            self._checkpoint = self._unsaved_checkpoint = GraphCheckpoint()
+        else:
+            self._checkpoint = self._unsaved_checkpoint = None
+
+    def _save_checkpoint(self) -> None:
+        """Called before the graph first changes after the checkpoint was taken"""
+        self._unsaved_checkpoint.save(self)
+        self._unsaved_checkpoint = None
+
+    def _checkpoint_file(self, file: SourceFile) -> None:
+        """Called before the parsed state of `file` changes"""
+        if self._checkpoint is not None:
+            self._checkpoint.save_file(file)
+
+    @stopwatch
+    @commiter(reset=True)
+    def _restore_checkpoint(self) -> None:
+        """Resets the graph to the checkpoint. The files on disk must already be reset"""
+        file_paths = self._checkpoint.restore(self)
+        self._unsaved_checkpoint = self._checkpoint
+        self.generation += 1
+        uncache_all()
+        if file_paths:
+            self.update_directory_tree(file_paths)
+        if self.config_parser is not None:
+            self.config_parser.parse_configs()
+        # Changes synced outside of a transaction (ie: by a CodebaseWatcher) are kept on disk, so sync them again
+        diffs = []
+        for file_path in sorted(file_paths):
+            self.io.invalidate(self.to_absolute(file_path))
+            file = self.get_node(node_id) if (node_id := self.filepath_idx.get(file_path)) is not None else None
+            exists = os.path.isfile(self.to_absolute(file_path))
+            if file is None and exists:
+                diffs.append(DiffLite(ChangeType.Added, Path(file_path)))
+            elif file is not None and not exists:
+                diffs.append(DiffLite(ChangeType.Removed, Path(file_path)))
+            elif file is not None and not file.is_content_parsed():
+                diffs.append(DiffLite(ChangeType.Modified, Path(file_path)))
+        if diffs:
+            self.apply_diffs(diffs)
+        elif self.config.verify_graph:
+            self._validate_reset()
+
     @stopwatch
     @commiter(reset=True)
     def _revert_diffs(self, diff_list: list[DiffLite]) -> None:
@@ -354,8 +538,9 @@ class CodebaseContext:
         self.apply_diffs(reversed_diff_list)
         # ====== [ Re-resolve lost edges from previous syncs ] ======
         self.prune_graph()
-        if self.config.verify_graph:
-            post_reset_validation(self.old_graph.nodes(), self._graph.nodes(), get_edges(self.old_graph), get_edges(self._graph), self.repo_name, self.projects[0].subdirectories)
+        # A lazily built graph is never complete, so there is no copy of it to validate against
+        if self.config.verify_graph and not self.config.exp_lazy_graph:
+            self._validate_reset()
 
     def save_commit(self, commit: GitCommit) -> None:
         if commit is not None:
@@ -364,7 +549,8 @@ class CodebaseContext:
             self.unapplied_diffs.clear()
             self.synced_commit = commit
             if self.config.verify_graph:
-                self.old_graph = self._graph.copy()
+                self._save_old_graph()
+            self._take_checkpoint()
 
     @stopwatch
     def prune_graph(self) -> None:
@@ -379,6 +565,7 @@ class CodebaseContext:
         """Builds the directory tree for the codebase"""
         # Reset and rebuild the directory tree
         self.directories = dict()
+        index = set()
 
         for file_path, _ in self.projects[0].repo_operator.iter_files(
             subdirs=self.projects[0].subdirectories,
@@ -388,6 +575,64 @@ class CodebaseContext:
             file_path = Path(file_path)
             directory = self.get_directory(file_path.parent, create_on_missing=True)
             directory._add_file(file_path.name)
+            index.add((file_path.parent.parts, file_path.name))
+        self._directory_file_index = sorted(index)
+
+    @noapidoc
+    def update_directory_tree(self, file_paths: Iterable[str]) -> None:
+        """Updates the directory tree for files that were added, removed or renamed, instead of rebuilding it.
+
+        Each path ends up in the tree if it is a file that build_directory_tree would list, and out of it otherwise.
+        """
+        file_paths = sorted(set(file_paths))
+        existing = [file_path for file_path in file_paths if os.path.isfile(self.to_absolute(file_path))]
+        listed = set()
+        if existing:
+            listed.update(self.projects[0].repo_operator.filter_filepaths(existing, GLOBAL_FILE_IGNORE_LIST, subdirs=self.projects[0].subdirectories))
+        for file_path in file_paths:
+            if file_path in listed:
+                self._add_to_directory_tree(Path(file_path))
+            else:
+                self._remove_from_directory_tree(Path(file_path))
+
+    def _add_to_directory_tree(self, file_path: Path) -> None:
+        directory = self.get_directory(file_path.parent, create_on_missing=True)
+        directory._add_file(file_path.name)
+        key = (file_path.parent.parts, file_path.name)
+        idx = bisect_left(self._directory_file_index, key)
+        if idx == len(self._directory_file_index) or self._directory_file_index[idx] != key:
+            self._directory_file_index.insert(idx, key)
+
+    def _remove_from_directory_tree(self, file_path: Path) -> None:
+        key = (file_path.parent.parts, file_path.name)
+        idx = bisect_left(self._directory_file_index, key)
+        if idx < len(self._directory_file_index) and self._directory_file_index[idx] == key:
+            del self._directory_file_index[idx]
+        directory = self.directories.get(self.to_absolute(file_path.parent))
+        if directory is None:
+            return
+        directory._remove_file(file_path.name)
+        # Drop the directories left empty, which a rebuild would not create
+        while directory is not None and not directory._files and not directory._subdirectories:
+            del self.directories[directory.path]
+            parent = self.directories.get(directory.path.parent) if directory.dirpath else None
+            if parent is not None:
+                parent._remove_subdirectory(directory.name)
+            directory = parent
+
+    def get_subtree_file_names(self, dirpath: str) -> list[str]:
+        """Returns the paths relative to `dirpath` of all files under it in the directory tree.
+
+        The directory's own files come first, followed by the files of each subdirectory in name order.
+        """
+        parts = Path(dirpath).parts
+        if parts:
+            # Every key with `parts` as a prefix sorts between these two
+            start = bisect_left(self._directory_file_index, (parts,))
+            end = bisect_left(self._directory_file_index, ((*parts[:-1], parts[-1] + "\0"),))
+        else:
+            start, end = 0, len(self._directory_file_index)
+        return [os.path.join(*file_parts[len(parts) :], name) for file_parts, name in self._directory_file_index[start:end]]
 
     def get_directory(self, directory_path: PathLike, create_on_missing: bool = False, ignore_case: bool = False) -> Directory | None:
         """Returns the directory object for the given path, or None if the directory does not exist.
@@ -430,12 +675,17 @@ class CodebaseContext:
             return directory
         return None
 
-    def _process_diff_files(self, files_to_sync: Mapping[SyncType, list[Path]], incremental: bool = True) -> None:
+    def _process_diff_files(self, files_to_sync: Mapping[SyncType, list[Path]], incremental: bool = True, compute_graph: bool = True, tree_paths: Iterable[str] | None = None) -> None:
+        """Syncs the graph with the given files.
+
+        `tree_paths` are the paths that may have been added to or removed from the directory tree. If given, only
+        those are updated in the tree, otherwise it is rebuilt from the repository.
+        """
         # If all the files are empty, don't uncache
         assert self._computing is False
         skip_uncache = incremental and ((len(files_to_sync[SyncType.DELETE]) + len(files_to_sync[SyncType.REPARSE])) == 0)
         if not skip_uncache:
-            uncache_all()
+            self._uncache(filter(None, map(self.get_file, files_to_sync[SyncType.DELETE] + files_to_sync[SyncType.REPARSE])), incremental)
         # Step 0: Start the dependency manager and language engine if they exist
         # Start the dependency manager. This may or may not run asynchronously, depending on the implementation
         if self.dependency_manager is not None:
@@ -482,6 +732,9 @@ class CodebaseContext:
                 else:
                     logger.warning(f"SYNC: SourceFile {file_path} does not exist and also not found on graph!")
 
+        # Files whose content still matches their last parse (ie: a change that was reverted) don't need to be rebuilt
+        files_to_sync[SyncType.REPARSE] = [f for f in files_to_sync[SyncType.REPARSE] if not self.get_file(f).is_content_parsed()]
+
         # Step 3: Remove files to delete from graph
         to_resolve = []
         for file_path in files_to_sync[SyncType.DELETE]:
@@ -506,19 +759,14 @@ class CodebaseContext:
         task.end()
         # Step 5: Add new files as nodes to graph (does not yet add edges)
         task = self.progress.begin("Adding new files", count=len(files_to_sync[SyncType.ADD]))
-        for idx, filepath in enumerate(files_to_sync[SyncType.ADD]):
-            task.update(f"Adding {self.to_relative(filepath)}", count=idx)
-            try:
-                content = self.io.read_text(filepath)
-            except UnicodeDecodeError as e:
-                logger.warning(f"Can't read file at:{filepath} since it contains non-unicode characters. File will be ignored!")
+        file_cls = self.node_classes.file_cls
+        for idx, parsed in enumerate(iter_parsed_files(self, files_to_sync[SyncType.ADD])):
+            if parsed is None:
                 continue
-            # TODO: this is wrong with context changes
-            if filepath.suffix in self.extensions:
-                file_cls = self.node_classes.file_cls
-                new_file = file_cls.from_content(filepath, content, self, sync=False, verify_syntax=False)
-                if new_file is not None:
-                    files_to_resolve.append(new_file)
+            task.update(f"Adding {self.to_relative(parsed.filepath)}", count=idx)
+            new_file = file_cls.from_content(parsed.filepath, parsed.content, self, sync=False, verify_syntax=False, ts_tree=parsed.ts_tree)
+            if new_file is not None:
+                files_to_resolve.append(new_file)
         task.end()
         for file in files_to_resolve:
             to_resolve.append(file)
@@ -528,8 +776,12 @@ class CodebaseContext:
         counter = Counter(node.node_type for node in to_resolve)
 
         # Step 6: Build directory tree
-        logger.info("> Building directory tree")
-        self.build_directory_tree()
+        if tree_paths is None:
+            logger.info("> Building directory tree")
+            self.build_directory_tree()
+        else:
+            logger.info("> Updating directory tree")
+            self.update_directory_tree(tree_paths)
 
         # Step 7: Build configs
         if self.config_parser is not None:
@@ -537,17 +789,20 @@ class CodebaseContext:
 
         # Step 8: Add internal import resolution edges for new and updated files
         if not skip_uncache:
-            uncache_all()
+            self._uncache(to_resolve, incremental)
 
         if self.config.disable_graph:
             logger.warning("Graph generation is disabled. Skipping import and symbol resolution")
             self._computing = False
+        elif not compute_graph:
+            # Edges are added by the caller (ie: when restoring a graph snapshot)
+            self._computing = False
         else:
             self._computing = True
             try:
                 logger.info(f"> Computing import resolution edges for {counter[NodeType.IMPORT]} imports")
                 task = self.progress.begin("Resolving imports", count=counter[NodeType.IMPORT])
-                for node in to_resolve:
+                for idx, node in enumerate(to_resolve):
                     if node.node_type == NodeType.IMPORT:
                         task.update(f"Resolving imports in {node.filepath}", count=idx)
                         node._remove_internal_edges(EdgeType.IMPORT_SYMBOL_RESOLUTION)
@@ -557,7 +812,7 @@ class CodebaseContext:
                 if counter[NodeType.EXPORT] > 0:
                     logger.info(f"> Computing export dependencies for {counter[NodeType.EXPORT]} exports")
                     task = self.progress.begin("Computing export dependencies", count=counter[NodeType.EXPORT])
-                    for node in to_resolve:
+                    for idx, node in enumerate(to_resolve):
                         if node.node_type == NodeType.EXPORT:
                             task.update(f"Computing export dependencies for {node.filepath}", count=idx)
                             node._remove_internal_edges(EdgeType.EXPORT)
@@ -569,42 +824,79 @@ class CodebaseContext:
 
                     logger.info("> Computing superclass dependencies")
                     task = self.progress.begin("Computing superclass dependencies", count=counter[NodeType.SYMBOL])
-                    for symbol in to_resolve:
+                    for idx, symbol in enumerate(to_resolve):
                         if isinstance(symbol, Inherits):
                             task.update(f"Computing superclass dependencies for {symbol.filepath}", count=idx)
                             symbol._remove_internal_edges(EdgeType.SUBCLASS)
                             symbol.compute_superclass_dependencies()
                     task.end()
                 if not skip_uncache:
-                    uncache_all()
+                    self._uncache(to_resolve, incremental)
                 self._compute_dependencies(to_resolve, incremental)
             finally:
                 self._computing = False
 
+    def _uncache(self, nodes: Iterable[Importable], incremental: bool) -> None:
+        """Invalidates cached properties. Incremental syncs only invalidate the files of the nodes being recomputed"""
+        if incremental:
+            uncache_files({node.file_node_id for node in nodes})
+        else:
+            uncache_all()
+
     def _compute_dependencies(self, to_update: list[Importable], incremental: bool):
         seen = set()
+        if not incremental:
+            self.dependency_timings = defaultdict(float)
         while to_update:
             task = self.progress.begin("Computing dependencies", count=len(to_update))
             step = to_update.copy()
             to_update.clear()
             logger.info(f"> Incrementally computing dependencies for {len(step)} nodes")
-            for idx, current in enumerate(step):
-                task.update(f"Computing dependencies for {current.filepath}", count=idx)
-                if current not in seen:
-                    seen.add(current)
-                    to_update.extend(current.recompute(incremental))
-            if not incremental:
+            if incremental:
+                for idx, current in enumerate(step):
+                    task.update(f"Computing dependencies for {current.filepath}", count=idx)
+                    if current not in seen:
+                        seen.add(current)
+                        to_update.extend(current.recompute(incremental))
+            else:
+                self._compute_dependencies_batched([node for node in dict.fromkeys(step) if node not in seen], task)
+                seen.update(step)
                 for node in self._graph.nodes():
                     if node not in seen:
                         to_update.append(node)
             task.end()
         seen.clear()
+        if not incremental and self.dependency_timings:
+            slowest = sorted(self.dependency_timings.items(), key=lambda item: item[1], reverse=True)[:10]
+            logger.info("> Slowest files to compute dependencies for: " + ", ".join(f"{filepath} ({elapsed:.3f}s)" for filepath, elapsed in slowest))
+
+    def _compute_dependencies_batched(self, nodes: list[Importable], task) -> None:
+        """Resolves the dependencies of `nodes` without touching the graph, then adds all the edges found at once"""
+        edges = []
+        count = 0
+        for resolved in resolve_dependencies(self, nodes):
+            task.update(f"Computing dependencies for {resolved.filepath}", count=count)
+            count += 1
+            edges.extend(resolved.edges)
+            self.dependency_timings[resolved.filepath] += resolved.elapsed
+        self.add_edges(edges)
+
+    @contextmanager
+    def collect_edges(self) -> Generator[list[tuple[NodeId, NodeId, Edge]], None, None]:
+        """Collects the edges added into the yielded list instead of adding them to the graph"""
+        edges = []
+        self._collected_edges = edges
+        try:
+            yield edges
+        finally:
+            self._collected_edges = None
 
     def build_subgraph(self, nodes: list[NodeId]) -> PyDiGraph[Importable, Edge]:
         """Builds a subgraph from the given set of nodes"""
+        self._resolve_all_files()
         subgraph = PyDiGraph()
         subgraph.add_nodes_from(self._graph.nodes())
-        subgraph.add_edges_from(self._graph.weighted_edge_list())
+        subgraph.add_edges_from(self.edges)
         return subgraph.subgraph(nodes)
 
     def get_node(self, node_id: int) -> Any:
@@ -614,14 +906,64 @@ class CodebaseContext:
         if node_type is not None and exclude_type is not None:
             msg = "node_type and exclude_type cannot both be specified"
             raise ValueError(msg)
+        # External modules are only added when imports are linked
+        self._parse_all_files(link=node_type in (None, NodeType.EXTERNAL) and exclude_type != NodeType.EXTERNAL)
+        graph = self._graph
         if node_type is not None:
-            return [self.get_node(node_id) for node_id in self._graph.filter_nodes(lambda node: node.node_type == node_type)]
+            return [self.get_node(node_id) for node_id in sorted(self._node_type_idx[node_type])]
         if exclude_type is not None:
-            return [self.get_node(node_id) for node_id in self._graph.filter_nodes(lambda node: node.node_type != node_type)]
-        return self._graph.nodes()
+            excluded = self._node_type_idx[exclude_type]
+            return [self.get_node(node_id) for node_id in graph.node_indices() if node_id not in excluded]
+        return graph.nodes()
+
+    def get_symbols(self, name: str | None = None, symbol_type: SymbolType | None = None) -> list[Symbol]:
+        """Returns all symbols (including nested ones) with the given name and/or symbol type, in node id order"""
+        if name is None and symbol_type is None:
+            return self.get_nodes(NodeType.SYMBOL)
+        self._parse_all_files()
+        graph = self._graph
+        if name is not None:
+            self._index_symbol_names()
+            node_ids = self._symbol_name_idx.get(name, set())
+            if symbol_type is not None:
+                node_ids = node_ids & self._symbol_type_idx[symbol_type]
+        else:
+            node_ids = self._symbol_type_idx[symbol_type]
+        return [graph.get_node_data(node_id) for node_id in sorted(node_ids)]
+
+    def _reset_node_indexes(self) -> None:
+        self._node_type_idx: defaultdict[NodeType, set[NodeId]] = defaultdict(set)
+        self._symbol_type_idx: defaultdict[SymbolType, set[NodeId]] = defaultdict(set)
+        self._symbol_name_idx: defaultdict[str | None, set[NodeId]] = defaultdict(set)
+        self._symbol_names: dict[NodeId, str | None] = {}
+        # Symbols are added to the graph before their name is parsed, so they are indexed by name on the next lookup
+        self._unnamed_symbols: set[NodeId] = set()
+
+    def _index_node(self, node_id: NodeId, node: Importable) -> None:
+        self._node_type_idx[node.node_type].add(node_id)
+        if node.node_type == NodeType.SYMBOL:
+            self._symbol_type_idx[getattr(node, "symbol_type", None)].add(node_id)
+            self._unnamed_symbols.add(node_id)
+
+    def _unindex_node(self, node_id: NodeId) -> None:
+        node = self.get_node(node_id)
+        self._node_type_idx[node.node_type].discard(node_id)
+        if node.node_type == NodeType.SYMBOL:
+            self._symbol_type_idx[getattr(node, "symbol_type", None)].discard(node_id)
+            self._unnamed_symbols.discard(node_id)
+            if node_id in self._symbol_names:
+                self._symbol_name_idx[self._symbol_names.pop(node_id)].discard(node_id)
+
+    def _index_symbol_names(self) -> None:
+        for node_id in self._unnamed_symbols:
+            name = self.get_node(node_id).name
+            self._symbol_names[node_id] = name
+            self._symbol_name_idx[name].add(node_id)
+        self._unnamed_symbols.clear()
 
     def get_edges(self) -> list[tuple[NodeId, NodeId, EdgeType, Usage | None]]:
-        return [(x[0], x[1], x[2].type, x[2].usage) for x in self._graph.weighted_edge_list()]
+        self._resolve_all_files()
+        return [(x[0], x[1], x[2].type, x[2].usage) for x in self.edges]
 
     def get_file(self, file_path: os.PathLike, ignore_case: bool = False) -> SourceFile | None:
         # If not part of repo path, return None
@@ -630,7 +972,10 @@ class CodebaseContext:
             assert False, f"File {file_path} is not part of the repository path"
 
         # Check if file exists in graph
-        node_id = self.filepath_idx.get(str(self.to_relative(file_path)), None)
+        relpath = str(self.to_relative(file_path))
+        if self.lazy_graph is not None:
+            self.lazy_graph.parse([relpath])
+        node_id = self.filepath_idx.get(relpath, None)
         if node_id is not None:
             return self.get_node(node_id)
         if ignore_case:
@@ -640,6 +985,55 @@ class CodebaseContext:
                 if str(file_path).lower() == str(self.to_relative(file)).lower():
                     return self.get_file(file, ignore_case=False)
 
+    def _add_file_path(self, file_path: str, node_id: NodeId) -> None:
+        if self._unsaved_checkpoint is not None:
+            self._save_checkpoint()
+        self.filepath_idx[file_path] = node_id
+        if (key := _module_key(file_path)) is not None:
+            self._module_idx[key] = node_id
+        self.import_resolution_cache.clear()
+
+    def _remove_file_path(self, file_path: str) -> None:
+        if self._unsaved_checkpoint is not None:
+            self._save_checkpoint()
+        self.filepath_idx.pop(file_path, None)
+        if (key := _module_key(file_path)) is not None:
+            self._module_idx.pop(key, None)
+        self.import_resolution_cache.clear()
+
+    def _to_relative_lexical(self, filepath: str) -> str:
+        """Same as `str(to_relative(filepath))`, but normalizes the path lexically (symlinks are not followed) instead of touching the file system"""
+        if (relative := self._relative_paths.get(filepath)) is None:
+            path = os.path.normpath(os.path.join(self.repo_path, filepath))
+            if path == self.repo_path:
+                relative = "."
+            elif path.startswith(self.repo_path + os.sep):
+                relative = path[len(self.repo_path) + 1 :]
+            else:
+                relative = path
+            self._relative_paths[filepath] = relative
+        if not self.config.allow_external and os.path.isabs(relative):
+            assert False, f"File {filepath} is not part of the repository path"
+        return relative
+
+    def find_file(self, filepath: str) -> SourceFile | None:
+        """Returns the file at `filepath` if it is in the graph. Used by import resolution, so it never touches the file system."""
+        relpath = self._to_relative_lexical(filepath)
+        if self.lazy_graph is not None:
+            self.lazy_graph.parse([relpath])
+        node_id = self.filepath_idx.get(relpath, None)
+        if node_id is not None:
+            return self.get_node(node_id)
+
+    def get_module_file(self, filepath: str) -> SourceFile | None:
+        """Returns the python file at `filepath` (a path built from a dotted module name), without touching the file system"""
+        relpath = self._to_relative_lexical(filepath)
+        if self.lazy_graph is not None:
+            self.lazy_graph.parse([relpath])
+        node_id = self._module_idx.get(_module_key(relpath), None)
+        if node_id is not None:
+            return self.get_node(node_id)
+
     def _get_raw_file_from_path(self, path: Path) -> File | None:
         from codegen.sdk.core.file import File
 
@@ -659,59 +1053,104 @@ class CodebaseContext:
             if self._graph.find_node_by_weight(node.__eq__):
                 msg = "Node already exists"
                 raise Exception(msg)
-        if self.config.debug and self._computing and node.node_type != NodeType.EXTERNAL:
+        if self.config.debug and self._computing and node.node_type != NodeType.EXTERNAL and self.lazy_graph is None:
             assert False, f"Adding node during compute dependencies: {node!r}"
-        return self._graph.add_node(node)
+        if self._unsaved_checkpoint is not None:
+            self._save_checkpoint()
+        node_id = self._graph.add_node(node)
+        self._index_node(node_id, node)
+        return node_id
 
     def add_child(self, parent: NodeId, node: Importable, type: EdgeType, usage: Usage | None = None) -> int:
         if self.config.debug:
             if self._graph.find_node_by_weight(node.__eq__):
                 msg = "Node already exists"
                 raise Exception(msg)
-        if self.config.debug and self._computing and node.node_type != NodeType.EXTERNAL:
+        if self.config.debug and self._computing and node.node_type != NodeType.EXTERNAL and self.lazy_graph is None:
             assert False, f"Adding node during compute dependencies: {node!r}"
-        return self._graph.add_child(parent, node, Edge(type, usage))
+        if self._unsaved_checkpoint is not None:
+            self._save_checkpoint()
+        node_id = self._graph.add_child(parent, node, Edge(type, usage))
+        self._index_node(node_id, node)
+        return node_id
 
     def has_node(self, node_id: NodeId):
         return isinstance(node_id, int) and self._graph.has_node(node_id)
 
     def has_edge(self, u: NodeId, v: NodeId, edge: Edge):
+        if self.usage_edges is not None and edge.type == EdgeType.SYMBOL_USAGE:
+            return self.usage_edges.has_edge(u, v, edge.usage)
         return self._graph.has_edge(u, v) and edge in self._graph.get_all_edge_data(u, v)
 
     def add_edge(self, u: NodeId, v: NodeId, type: EdgeType, usage: Usage | None = None) -> None:
         edge = Edge(type, usage)
+        if (collected := self._collected_edges) is not None:
+            collected.append((u, v, edge))
+            return
         if self.config.debug:
             assert self._graph.has_node(u)
             assert self._graph.has_node(v), v
             assert not self.has_edge(u, v, edge), (u, v, edge)
-        self._graph.add_edge(u, v, edge)
+        if self._unsaved_checkpoint is not None:
+            self._save_checkpoint()
+        if self.usage_edges is not None and type == EdgeType.SYMBOL_USAGE:
+            self.usage_edges.add(u, v, usage)
+        else:
+            self._graph.add_edge(u, v, edge)
 
     def add_edges(self, edges: list[tuple[NodeId, NodeId, Edge]]) -> None:
+        if (collected := self._collected_edges) is not None:
+            collected.extend(edges)
+            return
         if self.config.debug:
             for u, v, edge in edges:
                 assert self._graph.has_node(u)
                 assert self._graph.has_node(v), v
                 assert not self.has_edge(u, v, edge), (self.get_node(u), self.get_node(v), edge)
+        if self._unsaved_checkpoint is not None:
+            self._save_checkpoint()
+        if self.usage_edges is not None:
+            for u, v, edge in edges:
+                if edge.type == EdgeType.SYMBOL_USAGE:
+                    self.usage_edges.add(u, v, edge.usage)
+            edges = [x for x in edges if x[2].type != EdgeType.SYMBOL_USAGE]
         self._graph.add_edges_from(edges)
 
     @property
     def nodes(self):
+        self._parse_all_files(link=True)
         return self._graph.nodes()
 
     @property
     def edges(self) -> WeightedEdgeList[Edge]:
+        self._resolve_all_files()
+        if self.usage_edges is not None:
+            return [*self._graph.weighted_edge_list(), *self.usage_edges.edges()]
         return self._graph.weighted_edge_list()
 
     def predecessor(self, n: NodeId, *, edge_type: EdgeType | None) -> Importable:
+        if self.lazy_graph is not None:
+            self.lazy_graph.load_in_edges(n, edge_type)
         return self._graph.find_predecessor_node_by_edge(n, lambda edge: edge.type == edge_type)
 
     def predecessors(self, n: NodeId, edge_type: EdgeType | None = None) -> Sequence[Importable]:
+        if self.lazy_graph is not None:
+            self.lazy_graph.load_in_edges(n, edge_type)
+        if self.usage_edges is not None and edge_type in (None, EdgeType.SYMBOL_USAGE):
+            res = [] if edge_type is not None else self._graph.predecessors(n)
+            res = list(dict.fromkeys([*res, *map(self.get_node, self.usage_edges.predecessors(n))]))
+            return res if edge_type is None else sort_editables(res, by_id=True)
         if edge_type is not None:
             return sort_editables(self._graph.find_predecessors_by_edge(n, lambda edge: edge.type == edge_type), by_id=True)
         return self._graph.predecessors(n)
 
     def successors(self, n: NodeId, *, edge_type: EdgeType | None = None, sort: bool = True) -> Sequence[Importable]:
-        if edge_type is not None:
+        if self.lazy_graph is not None:
+            self.lazy_graph.load_out_edges(n, edge_type)
+        if self.usage_edges is not None and edge_type in (None, EdgeType.SYMBOL_USAGE):
+            res = [] if edge_type is not None else self._graph.successors(n)
+            res = list(dict.fromkeys([*res, *map(self.get_node, self.usage_edges.successors(n))]))
+        elif edge_type is not None:
             res = self._graph.find_successors_by_edge(n, lambda edge: edge.type == edge_type)
         else:
             res = self._graph.successors(n)
@@ -719,19 +1158,45 @@ class CodebaseContext:
             return sort_editables(res, by_id=True, dedupe=False)
         return res
 
-    def get_edge_data(self, *args, **kwargs) -> set[Edge]:
-        return set(self._graph.get_all_edge_data(*args, **kwargs))
+    def get_edge_data(self, u: NodeId, v: NodeId) -> set[Edge]:
+        if self.lazy_graph is not None:
+            self.lazy_graph.load_out_edges(u)
+        if self.usage_edges is not None:
+            edges = {edge for _, dst, edge in self.usage_edges.out_edges(u) if dst == v}
+            if self._graph.has_edge(u, v) or not edges:
+                edges.update(self._graph.get_all_edge_data(u, v))
+            return edges
+        return set(self._graph.get_all_edge_data(u, v))
 
     def in_edges(self, n: NodeId) -> WeightedEdgeList[Edge]:
+        if self.lazy_graph is not None:
+            self.lazy_graph.load_in_edges(n)
+        if self.usage_edges is not None:
+            return [*self._graph.in_edges(n), *self.usage_edges.in_edges(n)]
         return self._graph.in_edges(n)
 
     def out_edges(self, n: NodeId) -> WeightedEdgeList[Edge]:
+        if self.lazy_graph is not None:
+            self.lazy_graph.load_out_edges(n)
+        if self.usage_edges is not None:
+            return [*self._graph.out_edges(n), *self.usage_edges.out_edges(n)]
         return self._graph.out_edges(n)
 
     def remove_node(self, n: NodeId):
+        if self._unsaved_checkpoint is not None:
+            self._save_checkpoint()
+        self._unindex_node(n)
+        if self.lazy_graph is not None:
+            self.lazy_graph.forget(n)
+        if self.usage_edges is not None:
+            self.usage_edges.remove_node(n)
         return self._graph.remove_node(n)
 
     def remove_edge(self, u: NodeId, v: NodeId, *, edge_type: EdgeType | None = None):
+        if self._unsaved_checkpoint is not None:
+            self._save_checkpoint()
+        if self.usage_edges is not None and edge_type in (None, EdgeType.SYMBOL_USAGE):
+            self.usage_edges.remove_edges(u, v)
         for edge in self._graph.edge_indices_from_endpoints(u, v):
             if edge_type is not None:
                 if self._graph.get_edge_data_by_index(edge).type != edge_type:
@@ -766,24 +1231,26 @@ class CodebaseContext:
             sync_file (bool): If True, writes any pending file edits to the file system
             files (set[str] | None): If provided, only commits transactions for the given set of files
         """
-        # Commit transactions for all contexts
-        files_to_lock = self.transaction_manager.to_commit(files)
-        diffs = self.transaction_manager.commit(files_to_lock)
-        for diff in diffs:
-            if self.get_file(diff.path) is None:
-                self.unapplied_diffs.append(diff)
-            else:
-                self.pending_syncs.append(diff)
+        # Holds sync_lock so a CodebaseWatcher does not apply the files being written before they are synced
+        with self.sync_lock:
+            # Commit transactions for all contexts
+            files_to_lock = self.transaction_manager.to_commit(files)
+            diffs = self.transaction_manager.commit(files_to_lock)
+            for diff in diffs:
+                if self.get_file(diff.path) is None:
+                    self.unapplied_diffs.append(diff)
+                else:
+                    self.pending_syncs.append(diff)
 
-        # Write files if requested
-        if sync_file:
-            self.io.save_files(files)
+            # Write files if requested
+            if sync_file:
+                self.io.save_files(files)
 
-        # Sync the graph if requested
-        if sync_graph and len(self.pending_syncs) > 0:
-            self.apply_diffs(self.pending_syncs)
-            self.all_syncs.extend(self.pending_syncs)
-            self.pending_syncs.clear()
+            # Sync the graph if requested
+            if sync_graph and len(self.pending_syncs) > 0:
+                self.apply_diffs(self.pending_syncs)
+                self.all_syncs.extend(self.pending_syncs)
+                self.pending_syncs.clear()
 
     @commiter
     def add_single_file(self, filepath: PathLike) -> None:
@@ -821,12 +1288,11 @@ class CodebaseContext:
             raise ValueError(msg)
 
         # Remove the directory from the tree
-        if str(directory_path) in self.directories:
-            del self.directories[str(directory_path)]
+        self.directories.pop(directory.path, None)
 
         # Remove the directory from the parent
         if directory.parent is not None:
-            directory.parent.remove_subdirectory(directory)
+            directory.parent._remove_subdirectory(directory.name)
             # Cleanup
             if cleanup and len(directory.parent.items) == 0:
                 self.remove_directory(directory.parent.path, cleanup=cleanup)
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import time
+from itertools import groupby
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from codegen.sdk.codebase.codebase_context import CodebaseContext
+    from codegen.sdk.core.interfaces.importable import Importable
+    from codegen.sdk.core.node_id_factory import NodeId
+    from codegen.sdk.enums import Edge
+
+
+class ResolvedDependencies(NamedTuple):
+    """Edges found for a run of consecutive nodes from the same file, and how long it took to find them"""
+
+    filepath: str
+    edges: list[tuple[NodeId, NodeId, Edge]]
+    elapsed: float
+
+
+def _resolve(ctx: CodebaseContext, filepath: str, nodes: list[Importable]) -> ResolvedDependencies:
+    start = time.perf_counter()
+    with ctx.collect_edges() as edges:
+        for node in nodes:
+            node.recompute(incremental=False)
+    return ResolvedDependencies(filepath, edges, time.perf_counter() - start)
+
+
+def resolve_dependencies(ctx: CodebaseContext, nodes: list[Importable]) -> Iterator[ResolvedDependencies]:
+    """Computes the dependencies of `nodes` without adding them to the graph, yielding results in the same order as `nodes`.
+
+    Nodes are split into runs of consecutive nodes from the same file. Adding the edges of each result in order gives the
+    same graph as calling `recompute` on every node.
+    """
+    for filepath, group in groupby(nodes, key=lambda node: node.filepath):
+        yield _resolve(ctx, filepath, list(group))
@@ -3,7 +3,7 @@ from os import PathLike
 from pathlib import Path
 from typing import NamedTuple, Self
 
-from git import Diff
+from git import Blob, Diff
 from watchfiles import Change
 
 
@@ -44,6 +44,8 @@ class DiffLite(NamedTuple):
     rename_from: Path | None = None
     rename_to: Path | None = None
     old_content: bytes | None = None
+    # Blob of the old content, which diffs from git read only when needed
+    old_blob: Blob | None = None
 
     @classmethod
     def from_watch_change(cls, change: Change, path: PathLike) -> Self:
@@ -54,17 +56,20 @@ class DiffLite(NamedTuple):
 
     @classmethod
     def from_git_diff(cls, git_diff: Diff):
-        old = None
-        if git_diff.a_blob:
-            old = git_diff.a_blob.data_stream.read()
         return cls(
             change_type=ChangeType.from_git_change_type(git_diff.change_type),
             path=Path(git_diff.a_path) if git_diff.a_path else None,
             rename_from=Path(git_diff.rename_from) if git_diff.rename_from else None,
             rename_to=Path(git_diff.rename_to) if git_diff.rename_to else None,
-            old_content=old,
+            old_blob=git_diff.a_blob,
         )
 
+    def get_old_content(self) -> bytes | None:
+        """Content of the file before the change, read from the object database if the diff came from git"""
+        if self.old_content is None and self.old_blob is not None:
+            return self.old_blob.data_stream.read()
+        return self.old_content
+
     @classmethod
     def from_reverse_diff(cls, diff_lite: "DiffLite"):
         if diff_lite.change_type == ChangeType.Added:
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple
+
+from codegen.sdk.tree_sitter_parser import get_parser_by_filepath_or_extension
+from codegen.sdk.utils import is_minified_js
+from codegen.shared.logging.get_logger import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from tree_sitter import Tree
+
+    from codegen.sdk.codebase.codebase_context import CodebaseContext
+
+logger = get_logger(__name__)
+
+
+class ParsedFile(NamedTuple):
+    """Result of the parse stage for a single file, which nodes are built from."""
+
+    filepath: Path
+    content: str
+    ts_tree: Tree
+
+
+def _parse_file(ctx: CodebaseContext, filepath: Path) -> ParsedFile | None:
+    # Decoded here rather than with read_text so the text isn't kept in the IO's buffer, and the tree shares the bytes
+    content_bytes = ctx.io.read_bytes(ctx.to_absolute(filepath))
+    try:
+        content = content_bytes.decode("utf-8")
+    except UnicodeDecodeError:
+        logger.warning(f"Can't read file at:{filepath} since it contains non-unicode characters. File will be ignored!")
+        return None
+    # TODO: this is wrong with context changes
+    if filepath.suffix not in ctx.extensions:
+        return None
+    # Sanity check to ensure file is not a minified file
+    if is_minified_js(content):
+        logger.info(f"File {filepath} is a minified file. Skipping...", extra={"filepath": filepath})
+        return None
+    ts_tree = get_parser_by_filepath_or_extension(filepath).parse(content_bytes)
+    return ParsedFile(filepath, content, ts_tree)
+
+
+def iter_parsed_files(ctx: CodebaseContext, filepaths: list[Path]) -> Iterator[ParsedFile | None]:
+    """Reads and parses the given files, yielding results in the same order as `filepaths`.
+
+    Files that should not be added to the graph yield None.
+    """
+    for filepath in filepaths:
+        yield _parse_file(ctx, filepath)
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+
+class ContentBuffer:
+    """The content of a file, with its decoded text and line offsets computed on first use.
+
+    `stat` is the (mtime, size, inode) of the file on disk the content matches, or None if it isn't known to match it
+    (e.g. the content has not been saved yet). `cached_at` is when the content was read (in ns since the epoch, like
+    mtimes): a file with an mtime at or after it may have been written again without its stat changing.
+    """
+
+    __slots__ = ("_line_offsets", "_text", "cached_at", "content", "stat")
+
+    def __init__(self, content: bytes, stat: tuple[int, int, int] | None = None, cached_at: int = 0) -> None:
+        self.content = content
+        self.stat = stat
+        self.cached_at = cached_at
+        self._text: str | None = None
+        self._line_offsets: list[int] | None = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self.content.decode("utf-8")
+        return self._text
+
+    @property
+    def line_offsets(self) -> list[int]:
+        """Start byte of each line"""
+        if self._line_offsets is None:
+            offsets = [0]
+            offset = 0
+            for line in self.content.split(b"\n")[:-1]:
+                offset += len(line) + 1
+                offsets.append(offset)
+            self._line_offsets = offsets
+        return self._line_offsets
+
+    def line(self, row: int) -> str:
+        """Text of line `row` (0-indexed), without its newline"""
+        offsets = self.line_offsets
+        end = offsets[row + 1] - 1 if row + 1 < len(offsets) else len(self.content)
+        return self.content[offsets[row] : end].decode("utf-8")
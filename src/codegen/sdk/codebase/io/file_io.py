@@ -1,21 +1,46 @@
+import os
+import time
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from codegen.sdk.codebase.io.content_buffer import ContentBuffer
 from codegen.sdk.codebase.io.io import IO, BadWriteError
 from codegen.shared.logging.get_logger import get_logger
 
 logger = get_logger(__name__)
 
 
+def _stat_key(path: Path) -> tuple[int, int, int]:
+    """Identifies the version of the file on disk"""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
 class FileIO(IO):
-    """IO implementation that writes files to disk, and tracks pending changes."""
+    """IO implementation that writes files to disk, and tracks pending changes.
+
+    The content of each file read is kept in a buffer, which is re-read when the file's mtime, size or inode change, or
+    when it is invalidated. Like git's index, a buffer whose file was modified at or after the time it was read is
+    "racily clean" (the file may have been written again in the same mtime tick) and is re-read as well.
+
+    Buffers of files saved through this IO hold what was written, and are checked against the file the same way. A
+    saved file that is re-read with different content was written outside of this IO since.
+    """
 
     files: dict[Path, bytes]
+    buffers: dict[Path, ContentBuffer]
     allowed_paths: list[Path] | None
+    # Files whose buffer was saved by this IO
+    saved: set[Path]
+    # Files deleted by this IO
+    deleted: set[Path]
 
     def __init__(self, allowed_paths: list[Path] | None = None):
         self.files = {}
+        self.buffers = {}
         self.allowed_paths = allowed_paths
+        self.saved = set()
+        self.deleted = set()
 
     def _verify_path(self, path: Path) -> None:
         if self.allowed_paths is not None:
@@ -26,20 +51,65 @@ class FileIO(IO):
     def write_bytes(self, path: Path, content: bytes) -> None:
         self._verify_path(path)
         self.files[path] = content
+        self.buffers[path] = ContentBuffer(content)
+        self.saved.discard(path)
+        self.deleted.discard(path)
 
     def read_bytes(self, path: Path) -> bytes:
+        return self.read_buffer(path).content
+
+    def read_text(self, path: Path) -> str:
+        return self.read_buffer(path).text
+
+    def read_buffer(self, path: Path) -> ContentBuffer:
         self._verify_path(path)
         if path in self.files:
-            return self.files[path]
-        else:
-            return path.read_bytes()
+            return self.buffers[path]
+        buffer = self.buffers.get(path)
+        cached_at = time.time_ns()
+        stat = _stat_key(path)
+        if buffer is not None and buffer.stat == stat and stat[0] < buffer.cached_at:
+            return buffer
+        content = path.read_bytes()
+        if buffer is not None and buffer.content == content:
+            buffer.stat, buffer.cached_at = stat, cached_at
+            return buffer
+        self.saved.discard(path)
+        buffer = self.buffers[path] = ContentBuffer(content, stat, cached_at)
+        return buffer
+
+    def invalidate(self, path: Path) -> None:
+        if path in self.files:
+            return
+        # Saved files are invalidated when the save is synced, but still match their buffer
+        if path in self.saved and os.path.exists(path) and _stat_key(path) == self.buffers[path].stat:
+            return
+        self.saved.discard(path)
+        self.buffers.pop(path, None)
+
+    def wrote(self, path: Path) -> bool:
+        if path in self.deleted:
+            if not os.path.exists(path):
+                return True
+            # Created again outside of this IO
+            self.deleted.discard(path)
+            return False
+        return path in self.saved and os.path.exists(path) and _stat_key(path) == self.buffers[path].stat
+
+    def _save_file(self, path: Path) -> None:
+        buffer = self.buffers[path]
+        cached_at = time.time_ns()
+        path.write_bytes(self.files[path])
+        # The buffer holds what was just written, so it matches the file until it changes again
+        buffer.stat, buffer.cached_at = _stat_key(path), cached_at
+        self.saved.add(path)
 
     def save_files(self, files: set[Path] | None = None) -> None:
         to_save = set(filter(lambda f: f in files, self.files)) if files is not None else self.files.keys()
         for path in to_save:
             self._verify_path(path)
         with ThreadPoolExecutor() as exec:
-            exec.map(lambda path: path.write_bytes(self.files[path]), to_save)
+            exec.map(self._save_file, to_save)
         if files is None:
             self.files.clear()
         else:
@@ -49,6 +119,8 @@ class FileIO(IO):
     def check_changes(self) -> None:
         if self.files:
             logger.error(BadWriteError("Directly called file write without calling commit_transactions"))
+        for path in self.files:
+            self.buffers.pop(path, None)
         self.files.clear()
 
     def delete_file(self, path: Path) -> None:
@@ -56,10 +128,13 @@ class FileIO(IO):
         self.untrack_file(path)
         if path.exists():
             path.unlink()
+            self.deleted.add(path)
 
     def untrack_file(self, path: Path) -> None:
         self._verify_path(path)
         self.files.pop(path, None)
+        self.buffers.pop(path, None)
+        self.saved.discard(path)
 
     def file_exists(self, path: Path) -> bool:
         self._verify_path(path)
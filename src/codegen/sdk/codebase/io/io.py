@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
 
+from codegen.sdk.codebase.io.content_buffer import ContentBuffer
+
 
 class BadWriteError(Exception):
     pass
@@ -29,6 +31,16 @@ class IO(ABC):
     def read_text(self, path: Path) -> str:
         return self.read_bytes(path).decode("utf-8")
 
+    def read_buffer(self, path: Path) -> ContentBuffer:
+        return ContentBuffer(self.read_bytes(path))
+
+    def invalidate(self, path: Path) -> None:
+        """Drops any content of `path` cached from disk, after it was changed outside of this IO"""
+
+    def wrote(self, path: Path) -> bool:
+        """Whether the file at `path` is as this IO last saved or deleted it, ie: a filesystem event for it came from this IO"""
+        return False
+
     @abstractmethod
     def save_files(self, files: set[Path] | None = None) -> None:
         pass
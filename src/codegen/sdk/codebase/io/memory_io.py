@@ -0,0 +1,102 @@
+import difflib
+from collections.abc import Iterator
+from pathlib import Path
+
+from codegen.sdk.codebase.io.io import IO, BadWriteError
+from codegen.shared.logging.get_logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class MemoryIO(IO):
+    """IO implementation that keeps all changes in memory, on top of another IO that is only read from.
+
+    Saved changes are served to later reads as if they were on disk, until they are discarded. This lets a codebase run
+    codemods without touching the working tree, ie: when several processes share one checkout.
+    """
+
+    base: IO
+    # Written but not saved yet, like FileIO.files
+    files: dict[Path, bytes]
+    # Saved content of each changed file, or None if it was deleted
+    changes: dict[Path, bytes | None]
+
+    def __init__(self, base: IO):
+        self.base = base
+        self.files = {}
+        self.changes = {}
+
+    def write_bytes(self, path: Path, content: bytes) -> None:
+        self.files[path] = content
+
+    def read_bytes(self, path: Path) -> bytes:
+        if path in self.files:
+            return self.files[path]
+        if path in self.changes:
+            if (content := self.changes[path]) is None:
+                msg = f"File {path} has been deleted"
+                raise FileNotFoundError(msg)
+            return content
+        return self.base.read_bytes(path)
+
+    def save_files(self, files: set[Path] | None = None) -> None:
+        to_save = [path for path in self.files if files is None or path in files]
+        for path in to_save:
+            self.changes[path] = self.files.pop(path)
+
+    def check_changes(self) -> None:
+        if self.files:
+            logger.error(BadWriteError("Directly called file write without calling commit_transactions"))
+        self.files.clear()
+
+    def delete_file(self, path: Path) -> None:
+        self.files.pop(path, None)
+        self.changes[path] = None
+
+    def untrack_file(self, path: Path) -> None:
+        self.files.pop(path, None)
+
+    def invalidate(self, path: Path) -> None:
+        self.base.invalidate(path)
+
+    def file_exists(self, path: Path) -> bool:
+        if path in self.files:
+            return True
+        if path in self.changes:
+            return self.changes[path] is not None
+        return self.base.file_exists(path)
+
+    def discard(self) -> None:
+        """Drops all changes, so reads see the base IO again"""
+        self.files.clear()
+        self.changes.clear()
+
+    def _iter_changes(self) -> Iterator[tuple[Path, bytes | None, bytes | None]]:
+        """Yields each saved change that differs from the base IO, as its path, old content and new content"""
+        for path in sorted(self.changes):
+            old = self.base.read_bytes(path) if self.base.file_exists(path) else None
+            new = self.changes[path]
+            if old != new:
+                yield path, old, new
+
+    def get_changed_files(self, root: Path) -> dict[str, bytes | None]:
+        """Saved content of each changed file, or None if it was deleted, keyed by its path relative to `root`"""
+        return {path.relative_to(root).as_posix(): new for path, _, new in self._iter_changes()}
+
+    def get_diff(self, root: Path) -> str:
+        """Unified diff of the saved changes against the base IO, in the format of `git diff` with paths relative to `root`"""
+        diffs = []
+        for path, old, new in self._iter_changes():
+            filepath = path.relative_to(root).as_posix()
+            header = [f"diff --git a/{filepath} b/{filepath}\n"]
+            if old is None:
+                header.append("new file mode 100644\n")
+            elif new is None:
+                header.append("deleted file mode 100644\n")
+            old_lines = old.decode("utf-8").splitlines(keepends=True) if old is not None else []
+            new_lines = new.decode("utf-8").splitlines(keepends=True) if new is not None else []
+            lines = difflib.unified_diff(old_lines, new_lines, f"a/{filepath}" if old is not None else "/dev/null", f"b/{filepath}" if new is not None else "/dev/null")
+            for line in lines:
+                header.append(line if line.endswith("\n") else f"{line}\n\\ No newline at end of file\n")
+            diffs.append("".join(header))
+        return "".join(diffs)
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import re
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+from codegen.sdk.enums import EdgeType, NodeType
+from codegen.sdk.extensions.utils import uncache_files
+from codegen.shared.enums.programming_language import ProgrammingLanguage
+from codegen.shared.logging.get_logger import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator, Iterable
+    from pathlib import Path
+
+    from codegen.sdk.codebase.codebase_context import CodebaseContext
+    from codegen.sdk.core.file import SourceFile
+    from codegen.sdk.core.node_id_factory import NodeId
+
+logger = get_logger(__name__)
+
+# Edges added when a file is linked, which don't need its dependencies to be computed
+_LINK_EDGE_TYPES = (EdgeType.IMPORT_SYMBOL_RESOLUTION, EdgeType.EXPORT, EdgeType.SUBCLASS)
+
+
+class LazyGraph:
+    """Demand-driven construction of the graph, used when `exp_lazy_graph` is enabled.
+
+    Files go through three stages, each done only when something needs it:
+    - parsed: the file's nodes are in the graph, without edges. Files are parsed when they are looked up, including by
+      import resolution.
+    - linked: the file's imports, exports and superclasses are resolved. Done when the outgoing edges of one of its
+      nodes are read while dependencies are being computed (ie: to follow an import chain).
+    - resolved: the file is linked and the dependencies of its nodes are computed. Done when the outgoing edges of
+      one of its nodes are read otherwise.
+
+    Reading the incoming edges (usages) of a node resolves every file whose content contains its name, found by
+    scanning the files not resolved yet.
+    """
+
+    def __init__(self, ctx: CodebaseContext, list_files: Callable[[], Iterable[str]]) -> None:
+        self.ctx = ctx
+        self._list_files = list_files
+        self._unloaded: dict[str, Path] | None = None
+        self._linked: set[NodeId] = set()
+        self._resolved: set[NodeId] = set()
+        self._importers_loaded: set[NodeId] = set()
+        self._usages_loaded: set[NodeId] = set()
+        self._parsing = False
+        self._loading = False
+
+    @property
+    def unloaded_files(self) -> dict[str, Path]:
+        """Relative path to absolute path of the source files which have not been parsed yet"""
+        if self._unloaded is None:
+            self._unloaded = {}
+            for filepath in self._list_files():
+                if filepath not in self.ctx.filepath_idx:
+                    self._unloaded[filepath] = self.ctx.to_absolute(filepath)
+        return self._unloaded
+
+    @property
+    def busy(self) -> bool:
+        """Whether the graph is being modified, in which case reads must not trigger more loading"""
+        return self._parsing or self._loading or self.ctx._computing
+
+    def reset(self) -> None:
+        """Forgets which usages were loaded, after files were added or changed"""
+        self._importers_loaded.clear()
+        self._usages_loaded.clear()
+
+    def forget(self, node_id: NodeId) -> None:
+        """Forgets a node removed from the graph, since its id can be reused"""
+        for loaded in (self._linked, self._resolved, self._importers_loaded, self._usages_loaded):
+            loaded.discard(node_id)
+
+    @contextmanager
+    def paused(self) -> Generator[None, None, None]:
+        """Prevents reads from loading more files, ie: while the graph is being synced"""
+        self._loading, loading = True, self._loading
+        try:
+            yield
+        finally:
+            self._loading = loading
+
+    def add_file(self, filepath: str) -> None:
+        """Registers a source file that was created outside of the graph, so it is parsed when needed"""
+        if filepath not in self.ctx.filepath_idx:
+            self.unloaded_files[filepath] = self.ctx.to_absolute(filepath)
+
+    def remove_file(self, filepath: str) -> None:
+        self.unloaded_files.pop(filepath, None)
+
+    def parse(self, filepaths: Iterable[str]) -> list[SourceFile]:
+        """Parses the given files if they have not been parsed yet, and adds their nodes to the graph"""
+        from codegen.sdk.codebase.file_parsing import iter_parsed_files
+
+        unloaded = self.unloaded_files
+        paths = [unloaded.pop(filepath) for filepath in dict.fromkeys(filepaths) if filepath in unloaded]
+        paths = [path for path in paths if self.ctx.io.file_exists(path)]
+        if not paths:
+            return []
+        logger.info(f"> Lazily parsing {len(paths)} files")
+        file_cls = self.ctx.node_classes.file_cls
+        files = []
+        self._parsing, parsing = True, self._parsing
+        try:
+            for parsed in iter_parsed_files(self.ctx, paths):
+                if parsed is not None:
+                    if (file := file_cls.from_content(parsed.filepath, parsed.content, self.ctx, sync=False, verify_syntax=False, ts_tree=parsed.ts_tree)) is not None:
+                        files.append(file)
+            if self.ctx.config_parser is not None:
+                self.ctx.config_parser.parse_configs()
+        finally:
+            self._parsing = parsing
+        if not parsing:
+            # Values cached while parsing were computed without loading any edges
+            uncache_files({file_id for file_id in self.ctx.filepath_idx.values() if file_id not in self._resolved})
+        return files
+
+    def parse_all(self) -> None:
+        self.parse(list(self.unloaded_files))
+
+    @contextmanager
+    def _computing(self) -> Generator[None, None, None]:
+        computing = self.ctx._computing
+        self.ctx._computing = True
+        try:
+            yield
+        finally:
+            self.ctx._computing = computing
+
+    def link(self, file: SourceFile) -> None:
+        """Resolves the imports, exports and superclasses of `file`"""
+        from codegen.sdk.core.interfaces.inherits import Inherits
+
+        if file.node_id in self._linked:
+            return
+        self._linked.add(file.node_id)
+        with self._computing():
+            nodes = file.get_nodes(sort_by_id=True)
+            for node in nodes:
+                if node.node_type == NodeType.IMPORT:
+                    node._remove_internal_edges(EdgeType.IMPORT_SYMBOL_RESOLUTION)
+                    node.add_symbol_resolution_edge()
+            for node in nodes:
+                if node.node_type == NodeType.EXPORT:
+                    node._remove_internal_edges(EdgeType.EXPORT)
+                    node.compute_export_dependencies()
+            for node in nodes:
+                if isinstance(node, Inherits):
+                    node._remove_internal_edges(EdgeType.SUBCLASS)
+                    node.compute_superclass_dependencies()
+        self.ctx._uncache([file], incremental=True)
+
+    def resolve(self, file: SourceFile) -> None:
+        """Links `file` and computes the dependencies of its nodes"""
+        if file.node_id in self._resolved:
+            return
+        self._resolved.add(file.node_id)
+        self.link(file)
+        with self._computing():
+            for node in [file, *file.get_nodes(sort_by_id=True)]:
+                node.recompute(incremental=True)
+
+    def link_all(self) -> None:
+        with self.paused():
+            self.parse_all()
+            for file in self.ctx.get_nodes(NodeType.FILE):
+                self.link(file)
+
+    def resolve_all(self) -> None:
+        with self.paused():
+            self.parse_all()
+            for file in self.ctx.get_nodes(NodeType.FILE):
+                self.resolve(file)
+
+    def _file_of(self, node_id: NodeId) -> SourceFile | None:
+        node = self.ctx.get_node(node_id)
+        if node.node_type == NodeType.FILE:
+            return node
+        if node.node_type == NodeType.EXTERNAL:
+            return None
+        return self.ctx.get_node(node.file_node_id)
+
+    def load_out_edges(self, node_id: NodeId, edge_type: EdgeType | None = None) -> None:
+        """Makes sure the outgoing edges of `node_id` (of type `edge_type`, if given) are in the graph"""
+        if self._parsing or (file := self._file_of(node_id)) is None:
+            return
+        if self.ctx._computing or edge_type in _LINK_EDGE_TYPES:
+            self.link(file)
+        else:
+            self.resolve(file)
+
+    def load_in_edges(self, node_id: NodeId, edge_type: EdgeType | None = None) -> None:
+        """Makes sure the incoming edges of `node_id` (of type `edge_type`, if given) are in the graph, by loading every
+        file that may use it
+        """
+        link_only = edge_type in _LINK_EDGE_TYPES
+        loaded = self._importers_loaded if link_only else self._usages_loaded
+        if self.busy or node_id in loaded:
+            return
+        if not self._names(node_id):
+            if link_only:
+                self.link_all()
+            else:
+                self.resolve_all()
+            return
+        load, done = (self.link, self._linked) if link_only else (self.resolve, self._resolved)
+        with self.paused():
+            seen_names = set()
+            frontier = [node_id]
+            while frontier:
+                # Resolving files links them too
+                loaded.update(frontier)
+                self._importers_loaded.update(frontier)
+                names = [name for n in frontier for name in self._names(n) if name not in seen_names]
+                seen_names.update(names)
+                for name in dict.fromkeys(names):
+                    for candidate in self._find_candidates(name, done):
+                        load(candidate)
+                # Usages through an alias or a re-export don't contain the name of the node, so follow them too
+                importers = (u for n in frontier for u, _, _ in self.ctx.in_edges(n))
+                frontier = [u for u in dict.fromkeys(importers) if u not in loaded and self.ctx.get_node(u).node_type in (NodeType.IMPORT, NodeType.EXPORT)]
+
+    def _names(self, node_id: NodeId) -> list[str]:
+        """Names a usage of `node_id` may refer to it by"""
+        node = self.ctx.get_node(node_id)
+        names = [node.name] if getattr(node, "name", None) else []
+        file = self._file_of(node_id)
+        if file is not None and (node is file or self.ctx.programming_language != ProgrammingLanguage.PYTHON):
+            # Modules are imported by their file name, and so are default exports in TypeScript
+            names.append(file.name)
+        return names
+
+    def _find_candidates(self, name: str, done: set[NodeId]) -> list[SourceFile]:
+        """Parses and returns the files not in `done` whose content contains `name` as a word"""
+        pattern = re.compile(rb"(?<![\w$])" + re.escape(name.encode("utf-8")) + rb"(?![\w$])")
+        to_parse = []
+        for filepath, path in self.unloaded_files.items():
+            try:
+                content = self.ctx.io.read_bytes(path)
+            except OSError:
+                continue
+            if pattern.search(content):
+                to_parse.append(filepath)
+        self.parse(to_parse)
+        return [file for file in self.ctx.get_nodes(NodeType.FILE) if file.node_id not in done and pattern.search(file.content_bytes)]
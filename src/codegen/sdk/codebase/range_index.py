@@ -1,5 +1,7 @@
 import itertools
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
+from collections.abc import Iterable
 from functools import cached_property
 
 from tree_sitter import Range
@@ -8,6 +10,60 @@ from codegen.sdk.core.interfaces.editable import Editable
 from codegen.sdk.extensions.sort import sort_editables
 
 
+class SortedIntervals:
+    """Nodes sorted by start byte, with a segment tree of the largest end byte below each subtree.
+
+    Answers overlap and containment queries in O((k + 1) log n) for k results, instead of scanning every node.
+    """
+
+    __slots__ = ("_max_end", "_nodes", "_size", "_starts")
+
+    def __init__(self, nodes: Iterable[Editable]) -> None:
+        # Nodes with the same range keep their insertion order
+        self._nodes = sorted(nodes, key=lambda node: (node.start_byte, -node.end_byte))
+        self._starts = [node.start_byte for node in self._nodes]
+        self._size = 1
+        while self._size < len(self._nodes):
+            self._size *= 2
+        self._max_end = [-1] * (2 * self._size)
+        self._max_end[self._size : self._size + len(self._nodes)] = [node.end_byte for node in self._nodes]
+        for i in range(self._size - 1, 0, -1):
+            self._max_end[i] = max(self._max_end[2 * i], self._max_end[2 * i + 1])
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def _ending_at_or_after(self, stop: int, end_byte: int) -> list[Editable]:
+        """The nodes before index `stop` ending at or after `end_byte`, in order."""
+        ret = []
+        stack = [(1, 0, self._size)]
+        while stack:
+            i, lo, hi = stack.pop()
+            if lo >= stop or self._max_end[i] < end_byte:
+                continue
+            if i >= self._size:
+                ret.append(self._nodes[lo])
+                continue
+            mid = (lo + hi) // 2
+            stack.append((2 * i + 1, mid, hi))
+            stack.append((2 * i, lo, mid))
+        return ret
+
+    def containing(self, start_byte: int, end_byte: int) -> list[Editable]:
+        """Nodes containing [start_byte, end_byte] (bounds included), from the outermost to the innermost."""
+        return self._ending_at_or_after(bisect_right(self._starts, start_byte), end_byte)
+
+    def overlapping(self, start_byte: int, end_byte: int) -> list[Editable]:
+        """Nodes sharing at least one byte with [start_byte, end_byte), ordered by start byte."""
+        return self._ending_at_or_after(bisect_left(self._starts, end_byte), start_byte + 1)
+
+    def inside(self, start_byte: int, end_byte: int) -> list[Editable]:
+        """Nodes fully inside [start_byte, end_byte), ordered by start byte."""
+        lo = bisect_left(self._starts, start_byte)
+        hi = bisect_right(self._starts, end_byte)
+        return [node for node in self._nodes[lo:hi] if node.end_byte <= end_byte]
+
+
 class RangeIndex:
     _ranges: defaultdict[Range, list[Editable]]
     _canonical_range: defaultdict[Range, dict[int, Editable]]
@@ -15,9 +71,20 @@ class RangeIndex:
     def __init__(self):
         self._ranges = defaultdict(list)
         self._canonical_range = defaultdict(dict)
+        # Sorted byte ranges of the symbols in the file, computed by the parser when first needed
+        self.symbol_ranges: list[tuple[int, int]] | None = None
 
     def add_to_range(self, editable: Editable) -> None:
-        self._ranges[editable.range].append(editable)
+        nodes = self._ranges[editable.range]
+        # Nodes are only added once, without keeping a marker on every node
+        if not any(node is editable for node in nodes):
+            nodes.append(editable)
+            self._invalidate()
+
+    def _invalidate(self) -> None:
+        self.__dict__.pop("children", None)
+        self.__dict__.pop("nodes", None)
+        self.__dict__.pop("intervals", None)
 
     def mark_as_canonical(self, editable: Editable) -> None:
         self._canonical_range[editable.range][editable.ts_node.kind_id] = editable
@@ -32,8 +99,12 @@ class RangeIndex:
     def clear(self):
         self._ranges.clear()
         self._canonical_range.clear()
-        self.__dict__.pop("children", None)
-        self.__dict__.pop("nodes", None)
+        self._invalidate()
+
+    def clear_ranges(self):
+        """Drops the full range index, keeping the canonical nodes used by the parser"""
+        self._ranges.clear()
+        self._invalidate()
 
     @cached_property
     def nodes(self) -> list[Editable]:
@@ -51,3 +122,21 @@ class RangeIndex:
 
     def get_children(self, parent: Editable) -> list[Editable]:
         return sort_editables(self.children[parent])
+
+    @cached_property
+    def intervals(self) -> SortedIntervals:
+        """Built on the first range query, and rebuilt after nodes are added or the file is reparsed."""
+        return SortedIntervals(self.nodes)
+
+    def get_containing(self, start_byte: int, end_byte: int) -> list[Editable]:
+        return self.intervals.containing(start_byte, end_byte)
+
+    def get_innermost(self, start_byte: int, end_byte: int) -> Editable | None:
+        """The smallest node containing [start_byte, end_byte]. Ties go to the first node added."""
+        return min(self.get_containing(start_byte, end_byte), key=lambda node: node.end_byte - node.start_byte, default=None)
+
+    def get_overlapping(self, start_byte: int, end_byte: int) -> list[Editable]:
+        return self.intervals.overlapping(start_byte, end_byte)
+
+    def get_inside(self, start_byte: int, end_byte: int) -> list[Editable]:
+        return self.intervals.inside(start_byte, end_byte)
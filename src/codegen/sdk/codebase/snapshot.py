@@ -0,0 +1,371 @@
+"""On-disk snapshots of a fully resolved codebase graph, keyed by commit.
+
+A snapshot stores the parsed files, a node table and the edge list (including `Usage` metadata) of a graph.
+Restoring it re-parses the files but skips import resolution and dependency computation: nodes are matched back to the
+snapshot by file, class and byte range, and the edges are re-inserted in bulk.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import pickle
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+from tree_sitter import Point, Range
+
+from codegen.sdk.codebase.diff_lite import ChangeType, DiffLite
+from codegen.sdk.codebase.io.io import IO
+from codegen.sdk.core.dataclasses.usage import Usage, UsageKind, UsageType
+from codegen.sdk.enums import Edge, EdgeType, NodeType
+from codegen.shared.logging.get_logger import get_logger
+from codegen.shared.performance.stopwatch_utils import stopwatch
+
+if TYPE_CHECKING:
+    from git import Commit as GitCommit
+
+    from codegen.git.repo_operator.repo_operator import RepoOperator
+    from codegen.sdk.codebase.codebase_context import CodebaseContext
+    from codegen.sdk.codebase.range_index import SortedIntervals
+    from codegen.sdk.core.interfaces.editable import Editable
+    from codegen.sdk.core.interfaces.importable import Importable
+    from codegen.sdk.core.node_id_factory import NodeId
+
+logger = get_logger(__name__)
+
+SNAPSHOT_VERSION = 2
+# Number of commits to walk back from HEAD when looking for a snapshot to start from
+MAX_SNAPSHOT_DEPTH = 100
+# Config flags which do not change the contents of the graph
+_CONFIG_EXCLUDE = {"debug", "verify_graph", "track_graph", "sync_enabled", "full_range_index", "ignore_process_errors", "graph_snapshot_dir", "compact_usage_edges"}
+
+RangeTuple = tuple[tuple[int, int], tuple[int, int], int, int]
+
+
+class SnapshotError(Exception):
+    pass
+
+
+class _OverlayIO(IO):
+    """Serves the snapshot version of files changed since the snapshot commit, without touching the working tree"""
+
+    def __init__(self, io: IO, overlay: dict[Path, bytes]):
+        self.io = io
+        self.overlay = overlay
+
+    def write_bytes(self, path: Path, content: bytes) -> None:
+        self.io.write_bytes(path, content)
+
+    def read_bytes(self, path: Path) -> bytes:
+        if path in self.overlay:
+            return self.overlay[path]
+        return self.io.read_bytes(path)
+
+    def save_files(self, files: set[Path] | None = None) -> None:
+        self.io.save_files(files)
+
+    def check_changes(self) -> None:
+        self.io.check_changes()
+
+    def delete_file(self, path: Path) -> None:
+        self.io.delete_file(path)
+
+    def untrack_file(self, path: Path) -> None:
+        self.io.untrack_file(path)
+
+    def invalidate(self, path: Path) -> None:
+        self.io.invalidate(path)
+
+    def file_exists(self, path: Path) -> bool:
+        return path in self.overlay or self.io.file_exists(path)
+
+
+class NodeRecord(NamedTuple):
+    cls_name: str
+    filepath: str
+    start_byte: int
+    end_byte: int
+    # Only set for external modules, which are re-created from the import that first referenced them
+    import_id: NodeId | None = None
+
+
+class MatchRecord(NamedTuple):
+    filepath: str
+    range: RangeTuple
+    cls_name: str
+    # Class and byte range of the parent, which tells apart nodes of the same class sharing a range
+    parent: tuple[str, int, int]
+
+
+class UsageRecord(NamedTuple):
+    match: MatchRecord
+    usage_symbol: NodeId
+    imported_by: NodeId | None
+    usage_type: int
+    kind: int
+
+
+class EdgeRecord(NamedTuple):
+    u: NodeId
+    v: NodeId
+    type: EdgeType
+    usage: UsageRecord | None
+
+
+@dataclass
+class GraphSnapshot:
+    commit: str
+    key: str
+    files: list[str]
+    nodes: dict[NodeId, NodeRecord]
+    edges: list[EdgeRecord]
+    version: int = SNAPSHOT_VERSION
+
+    @classmethod
+    @stopwatch
+    def from_context(cls, ctx: CodebaseContext, commit: str) -> GraphSnapshot:
+        nodes: dict[NodeId, NodeRecord] = {}
+        files = []
+        for node_id in ctx._graph.node_indices():
+            node = ctx.get_node(node_id)
+            if node.node_type == NodeType.FILE:
+                files.append(node.file_path)
+            import_id = None
+            if node.node_type == NodeType.EXTERNAL:
+                if node._import is None:
+                    msg = f"{node!r} has no import to re-create it from"
+                    raise SnapshotError(msg)
+                import_id = node._import.node_id
+            nodes[node_id] = NodeRecord(type(node).__name__, node.filepath, node.start_byte, node.end_byte, import_id)
+
+        edges = []
+        for u, v, edge in ctx.edges:
+            usage = None
+            if edge.usage is not None:
+                usage = UsageRecord(
+                    match=_match_record(edge.usage.match),
+                    usage_symbol=_graph_node_id(ctx, edge.usage.usage_symbol),
+                    imported_by=_graph_node_id(ctx, edge.usage.imported_by) if edge.usage.imported_by is not None else None,
+                    usage_type=int(edge.usage.usage_type),
+                    kind=int(edge.usage.kind),
+                )
+            edges.append(EdgeRecord(u, v, edge.type, usage))
+        return cls(commit=commit, key=get_snapshot_key(ctx), files=files, nodes=nodes, edges=edges)
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> GraphSnapshot | None:
+        try:
+            with open(path, "rb") as f:
+                snapshot = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, TypeError) as e:
+            logger.warning(f"Failed to load graph snapshot {path}: {e}")
+            return None
+        if not isinstance(snapshot, cls) or snapshot.version != SNAPSHOT_VERSION:
+            logger.info(f"Ignoring outdated graph snapshot {path}")
+            return None
+        return snapshot
+
+    @stopwatch
+    def restore(self, ctx: CodebaseContext) -> None:
+        """Rebuilds the graph of `ctx` from the snapshot.
+
+        Files are read through `ctx.io`, so their content must match the snapshot commit. Raises SnapshotError if the
+        parsed nodes do not line up with the snapshot.
+        """
+        from codegen.sdk.codebase.codebase_context import SyncType
+        from codegen.sdk.core.external_module import ExternalModule
+
+        config = ctx.config
+        # Index every editable created while parsing so usage matches can be looked up by range
+        ctx.config = config.model_copy(update={"full_range_index": True})
+        try:
+            files_to_sync = defaultdict(list)
+            files_to_sync[SyncType.ADD] = [ctx.to_absolute(filepath) for filepath in self.files]
+            ctx._process_diff_files(files_to_sync, incremental=False, compute_graph=False)
+
+            # =====[ Map snapshot node ids to the freshly parsed nodes ]=====
+            by_key: defaultdict[tuple, list[NodeId]] = defaultdict(list)
+            for node_id in ctx._graph.node_indices():
+                node = ctx.get_node(node_id)
+                by_key[type(node).__name__, node.filepath, node.start_byte, node.end_byte].append(node_id)
+            id_map: dict[NodeId, NodeId] = {}
+            externals = []
+            for node_id in sorted(self.nodes):
+                record = self.nodes[node_id]
+                if record.import_id is not None:
+                    externals.append((node_id, record))
+                    continue
+                candidates = by_key.get((record.cls_name, record.filepath, record.start_byte, record.end_byte))
+                if not candidates:
+                    msg = f"Node {record} from snapshot not found in parsed graph"
+                    raise SnapshotError(msg)
+                id_map[node_id] = candidates.pop(0)
+            if any(by_key.values()):
+                msg = "Parsed graph contains nodes missing from the snapshot"
+                raise SnapshotError(msg)
+            for node_id, record in externals:
+                imp = ctx.get_node(id_map[record.import_id])
+                id_map[node_id] = ExternalModule.from_import(imp).node_id
+
+            # =====[ Re-insert the edges ]=====
+            edges = []
+            finder = _MatchFinder(ctx)
+            for record in self.edges:
+                usage = None
+                if record.usage is not None:
+                    usage = Usage(
+                        match=finder.find(record.usage.match),
+                        usage_symbol=ctx.get_node(id_map[record.usage.usage_symbol]),
+                        imported_by=ctx.get_node(id_map[record.usage.imported_by]) if record.usage.imported_by is not None else None,
+                        usage_type=UsageType(record.usage.usage_type),
+                        kind=UsageKind(record.usage.kind),
+                    )
+                edges.append((id_map[record.u], id_map[record.v], Edge(record.type, usage)))
+            ctx.add_edges(edges)
+        finally:
+            ctx.config = config
+            if not config.full_range_index:
+                for file in ctx.get_nodes(NodeType.FILE):
+                    file._range_index.clear_ranges()
+
+
+def get_snapshot_key(ctx: CodebaseContext) -> str:
+    """Hash of everything besides the commit that determines the shape of the graph"""
+    project = ctx.projects[0]
+    key = repr((SNAPSHOT_VERSION, ctx.programming_language.value, project.base_path, project.subdirectories, ctx.config.model_dump(exclude=_CONFIG_EXCLUDE)))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+def get_snapshot_path(ctx: CodebaseContext, commit: str) -> Path:
+    return Path(ctx.config.graph_snapshot_dir) / ctx.repo_name / f"{commit}-{get_snapshot_key(ctx)}.pkl"
+
+
+def save_graph_snapshot(ctx: CodebaseContext, repo_operator: RepoOperator) -> Path | None:
+    """Saves a snapshot of the graph for the current HEAD commit. Only clean working trees are snapshotted."""
+    commit = repo_operator.head_commit
+    if commit is None or repo_operator.git_cli.is_dirty(untracked_files=True):
+        logger.info("Skipping graph snapshot since the working tree does not match a commit")
+        return None
+    path = get_snapshot_path(ctx, commit.hexsha)
+    try:
+        snapshot = GraphSnapshot.from_context(ctx, commit.hexsha)
+    except SnapshotError as e:
+        logger.warning(f"Failed to snapshot graph: {e}")
+        return None
+    snapshot.save(path)
+    logger.info(f"> Saved graph snapshot for {commit.hexsha} to {path}")
+    return path
+
+
+@stopwatch
+def restore_graph_snapshot(ctx: CodebaseContext, repo_operator: RepoOperator) -> bool:
+    """Restores the graph from the most recent snapshot of HEAD or one of its ancestors.
+
+    If the snapshot was taken at an older commit, the files changed since then (including uncommitted changes) are read
+    at their snapshot version, and the graph is then brought up to date through `apply_diffs`.
+    Returns False if no usable snapshot exists, leaving `ctx` with an empty graph.
+    """
+    if not repo_operator.repo_config.respect_gitignore:
+        return False
+    if (head := repo_operator.head_commit) is None:
+        return False
+    for commit in repo_operator.git_cli.iter_commits(head, max_count=MAX_SNAPSHOT_DEPTH):
+        path = get_snapshot_path(ctx, commit.hexsha)
+        if path.exists() and (snapshot := GraphSnapshot.load(path)) is not None:
+            break
+    else:
+        return False
+
+    logger.info(f"> Restoring graph from snapshot of {commit.hexsha}")
+    diffs, old_contents = _get_diffs_since(ctx, repo_operator, commit)
+    io = ctx.io
+    ctx.io = _OverlayIO(io, old_contents)
+    try:
+        snapshot.restore(ctx)
+    except SnapshotError as e:
+        logger.warning(f"Failed to restore graph snapshot {path}: {e}")
+        ctx._graph.clear()
+        ctx._reset_node_indexes()
+        if ctx.usage_edges is not None:
+            ctx.usage_edges.clear()
+        ctx.filepath_idx.clear()
+        ctx._module_idx.clear()
+        ctx.import_resolution_cache.clear()
+        ctx._ext_module_idx.clear()
+        return False
+    finally:
+        ctx.io = io
+    if diffs:
+        logger.info(f"> Applying {len(diffs)} diffs on top of graph snapshot")
+        ctx.apply_diffs(diffs)
+        ctx.prune_graph()
+    return True
+
+
+def _get_diffs_since(ctx: CodebaseContext, repo_operator: RepoOperator, commit: GitCommit) -> tuple[list[DiffLite], dict[Path, bytes]]:
+    """Diffs between `commit` and the working tree, along with the old content of every changed file"""
+    diffs = []
+    old_contents = {}
+    for git_diff in commit.diff(None):
+        diff = DiffLite.from_git_diff(git_diff)
+        diffs.append(diff)
+        if diff.old_blob is not None and diff.change_type != ChangeType.Added:
+            old_contents[ctx.to_absolute(git_diff.a_path)] = diff.get_old_content()
+    for filepath in repo_operator.git_cli.untracked_files:
+        diffs.append(DiffLite(ChangeType.Added, Path(filepath)))
+    return diffs, old_contents
+
+
+def _match_record(match: Editable) -> MatchRecord:
+    r = match.range
+    return MatchRecord(match.filepath, (tuple(r.start_point), tuple(r.end_point), r.start_byte, r.end_byte), type(match).__name__, _parent_key(match))
+
+
+def _parent_key(node: Editable) -> tuple[str, int, int]:
+    return type(node.parent).__name__, node.parent.start_byte, node.parent.end_byte
+
+
+def _graph_node_id(ctx: CodebaseContext, node: Importable) -> NodeId:
+    node_id = getattr(node, "node_id", None)
+    if node_id is None or not ctx.has_node(node_id) or ctx.get_node(node_id) is not node:
+        msg = f"{node!r} is not a node of the graph"
+        raise SnapshotError(msg)
+    return node_id
+
+
+class _MatchFinder:
+    """Looks up usage matches in the freshly parsed files"""
+
+    def __init__(self, ctx: CodebaseContext) -> None:
+        self._files = {file.filepath: file for file in ctx.get_nodes(NodeType.FILE)}
+        # Entry points for building missing matches. They are not refreshed as matches get built, since those are always
+        # nested in a node that was already indexed.
+        self._intervals: dict[str, SortedIntervals] = {}
+
+    def find(self, record: MatchRecord) -> Editable:
+        start_point, end_point, start_byte, end_byte = record.range
+        file = self._files[record.filepath]
+        candidates = [x for x in file.find_by_byte_range(Range(Point(*start_point), Point(*end_point), start_byte, end_byte)) if type(x).__name__ == record.cls_name]
+        if candidates:
+            return next((candidate for candidate in candidates if _parent_key(candidate) == record.parent), candidates[0])
+        # Some expressions (ie: decorators) are only built when the dependency pass walks into them, so they are built here
+        # by walking down from the innermost parsed node containing the match
+        if record.filepath not in self._intervals:
+            self._intervals[record.filepath] = file._range_index.intervals
+        node = min(self._intervals[record.filepath].containing(start_byte, end_byte), key=lambda x: x.end_byte - x.start_byte, default=file)
+        while node is not None:
+            if node.start_byte == start_byte and node.end_byte == end_byte and type(node).__name__ == record.cls_name:
+                return node
+            children = [*getattr(node, "decorators", ()), *node.children]
+            node = next((child for child in children if child.start_byte <= start_byte and end_byte <= child.end_byte), None)
+        msg = f"Usage {record} from snapshot not found in parsed graph"
+        raise SnapshotError(msg)
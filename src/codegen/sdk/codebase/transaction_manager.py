@@ -1,5 +1,7 @@
 import time
-from collections.abc import Callable
+from bisect import bisect_left, insort
+from collections import Counter
+from collections.abc import Callable, Iterator
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -12,6 +14,7 @@ from codegen.sdk.codebase.transactions import (
     RemoveTransaction,
     Transaction,
     TransactionPriority,
+    apply_transactions,
 )
 from codegen.shared.exceptions.control_flow import MaxPreviewTimeExceeded, MaxTransactionsExceeded
 from codegen.shared.logging.get_logger import get_logger
@@ -27,17 +30,146 @@ class TransactionError(Exception):
     pass
 
 
+def _start_key(transaction: Transaction) -> tuple[int, int]:
+    return transaction.start_byte, transaction.transaction_id
+
+
+def _dedupe_key(transaction: Transaction) -> tuple:
+    # Same fields as Transaction.__eq__. Transaction.__hash__ is not used since it evaluates lazy new content.
+    return type(transaction), transaction.start_byte, transaction.end_byte, transaction.priority, transaction._new_content
+
+
+def _length_class(transaction: Transaction) -> int:
+    return transaction.length.bit_length()
+
+
+class TransactionQueue:
+    """Transactions queued for a single file.
+
+    Behaves like a list (in insertion order, until sorted) but also keeps the transactions sorted by start byte, so
+    conflicting transactions can be found without scanning the whole queue, and a count of equal transactions for
+    dedupe.
+
+    Transactions are split by length class (lengths in [2^(k-1), 2^k) are class k), so a query only has to look as far
+    before a range as the longest transaction of each class could reach, rather than as far as the longest transaction
+    ever queued.
+    """
+
+    _transactions: list[Transaction]
+    # Sorted by (start_byte, transaction_id), per length class
+    _by_start: dict[int, list[Transaction]]
+    _keys: Counter[tuple]
+    # Increasing with the position of each transaction in the queue, by transaction_id. Appends and removals keep the
+    # order, inserts and sorts reset it until it is needed again.
+    _positions: dict[int, int] | None
+    _next_position: int
+
+    def __init__(self) -> None:
+        self._transactions = []
+        self._by_start = {}
+        self._keys = Counter()
+        self._positions = {}
+        self._next_position = 0
+
+    def __len__(self) -> int:
+        return len(self._transactions)
+
+    def __iter__(self) -> Iterator[Transaction]:
+        return iter(self._transactions)
+
+    def __getitem__(self, index):
+        return self._transactions[index]
+
+    def __contains__(self, transaction: Transaction) -> bool:
+        return self._keys[_dedupe_key(transaction)] > 0
+
+    def _track(self, transaction: Transaction) -> None:
+        insort(self._by_start.setdefault(_length_class(transaction), []), transaction, key=_start_key)
+        self._keys[_dedupe_key(transaction)] += 1
+
+    def _untrack(self, transaction: Transaction) -> None:
+        by_start = self._by_start[_length_class(transaction)]
+        by_start.pop(bisect_left(by_start, _start_key(transaction), key=_start_key))
+        if not by_start:
+            del self._by_start[_length_class(transaction)]
+        self._keys[_dedupe_key(transaction)] -= 1
+        if self._positions is not None:
+            del self._positions[transaction.transaction_id]
+
+    def append(self, transaction: Transaction) -> None:
+        self._transactions.append(transaction)
+        self._track(transaction)
+        if self._positions is not None:
+            self._positions[transaction.transaction_id] = self._next_position
+            self._next_position += 1
+
+    def insert(self, index: int, transaction: Transaction) -> None:
+        self._transactions.insert(index, transaction)
+        self._track(transaction)
+        self._positions = None
+
+    def index(self, transaction: Transaction) -> int:
+        return self._transactions.index(transaction)
+
+    def pop(self, index: int = -1) -> Transaction:
+        transaction = self._transactions.pop(index)
+        self._untrack(transaction)
+        return transaction
+
+    def remove(self, transaction: Transaction) -> None:
+        self.pop(self._transactions.index(transaction))
+
+    def sort(self, key: Callable[[Transaction], object]) -> None:
+        self._transactions.sort(key=key)
+        self._positions = None
+
+    def _starting_between(self, start: int, end: int, length_class: int) -> list[Transaction]:
+        """Transactions of the length class with start <= start_byte < end, by start byte"""
+        by_start = self._by_start[length_class]
+        lo = bisect_left(by_start, (start,), key=_start_key)
+        hi = bisect_left(by_start, (end,), key=_start_key)
+        return by_start[lo:hi]
+
+    def _reaching(self, start: int, end: int) -> list[Transaction]:
+        """Transactions starting before end that could reach past start, by start byte"""
+        candidates = []
+        for length_class in self._by_start:
+            # Longest length in the class
+            max_length = (1 << length_class) - 1
+            candidates.extend(self._starting_between(start - max_length, end, length_class))
+        return sorted(candidates, key=_start_key)
+
+    def starting_at(self, start_byte: int) -> list[Transaction]:
+        """Transactions starting at start_byte, by start byte"""
+        return sorted((t for length_class in self._by_start for t in self._starting_between(start_byte, start_byte + 1, length_class)), key=_start_key)
+
+    def overlapping(self, start_byte: int, end_byte: int) -> list[Transaction]:
+        """Transactions overlapping with the given range, by start byte"""
+        return [t for t in self._reaching(start_byte + 1, end_byte) if start_byte < t.end_byte and end_byte > t.start_byte]
+
+    def containing(self, start_byte: int, end_byte: int) -> Transaction | None:
+        """The first queued transaction containing the given range"""
+        candidates = [t for t in self._reaching(end_byte, start_byte + 1) if end_byte <= t.end_byte]
+        if len(candidates) > 1:
+            if self._positions is None:
+                self._positions = {transaction.transaction_id: i for i, transaction in enumerate(self._transactions)}
+                self._next_position = len(self._transactions)
+            return min(candidates, key=lambda t: self._positions[t.transaction_id])
+        return candidates[0] if candidates else None
+
+
 class TransactionManager:
     """Responsible for handling `Transaction` objects - basically an atomic modification of a codebase.
 
     This is used by the Codebase class to queue up transactions and then commit them in bulk.
     """
 
-    # Unsorted list of transactions, grouped by file
-    # TODO: consider using SortedList for better performance
-    queued_transactions: dict[Path, list[Transaction]]
+    # Unsorted queue of transactions, grouped by file
+    queued_transactions: dict[Path, TransactionQueue]
     pending_undos: set[Callable[[], None]]
     _commiting: bool = False
+    # Total number of queued transactions across all files
+    _num_transactions: int = 0
     max_transactions: int | None = None  # None = no limit
     stopwatch_start = None
     stopwatch_max_seconds: int | None = None  # None = no limit
@@ -55,6 +187,7 @@ class TransactionManager:
         if len(self.queued_transactions) > 0:
             logger.warning("Not all transactions have been committed")
             self.queued_transactions.clear()
+            self._num_transactions = 0
         for undo in self.pending_undos:
             undo()
         self.pending_undos.clear()
@@ -74,7 +207,7 @@ class TransactionManager:
 
     def get_num_transactions(self) -> int:
         """Returns total number of transactions created to date"""
-        return sum([len(transactions) for transactions in self.queued_transactions.values()])
+        return self._num_transactions
 
     def set_max_transactions(self, max_transactions: int | None = None) -> None:
         self.max_transactions = max_transactions
@@ -120,7 +253,7 @@ class TransactionManager:
         # Get the list of transactions for the file
         file_path = transaction.file_path
         if file_path not in self.queued_transactions:
-            self.queued_transactions[file_path] = []
+            self.queued_transactions[file_path] = TransactionQueue()
         file_queue = self.queued_transactions[file_path]
 
         # Dedupe transactions
@@ -128,8 +261,12 @@ class TransactionManager:
             logger.debug(f"Transaction already exists in queue: {transaction}")
             return False
         # Solve conflicts
-        if new_transaction := self._resolve_conflicts(transaction, file_queue, solve_conflicts=solve_conflicts):
-            file_queue.append(new_transaction)
+        num_queued = len(file_queue)
+        try:
+            if new_transaction := self._resolve_conflicts(transaction, file_queue, solve_conflicts=solve_conflicts):
+                file_queue.append(new_transaction)
+        finally:
+            self._num_transactions += len(file_queue) - num_queued
 
         self.check_limits()
         return True
@@ -188,17 +325,17 @@ class TransactionManager:
                 for file in files:
                     logger.info(f"Committing {len(self.queued_transactions[file])} transactions for {file}")
             for file_path in files:
-                file_transactions = self.queued_transactions.pop(file_path, [])
-                modified = False
-                for transaction in file_transactions:
-                    # Add diff IF the file is a source file
-                    diff = transaction.get_diff()
-                    if diff.change_type == ChangeType.Modified:
-                        if not modified:
-                            modified = True
-                            diffs.append(diff)
-                    else:
-                        diffs.append(diff)
+                file_transactions = self.queued_transactions.pop(file_path, TransactionQueue())
+                self._num_transactions -= len(file_transactions)
+                # Edits, inserts and removes sort before file operations, and are applied together in a single write
+                num_edits = next((i for i, transaction in enumerate(file_transactions) if transaction.transaction_order >= TransactionPriority.FileAdd), len(file_transactions))
+                if num_edits > 0:
+                    file = file_transactions[0].file
+                    content = file.content_bytes
+                    diffs.append(DiffLite(ChangeType.Modified, file_path, old_content=content))
+                    file.write_bytes(apply_transactions(content, file_transactions[:num_edits]))
+                for transaction in file_transactions[num_edits:]:
+                    diffs.append(transaction.get_diff())
                     transaction.execute()
             return diffs
         finally:
@@ -208,7 +345,7 @@ class TransactionManager:
     # Conflict Resolution
     ####################################################################################################################
 
-    def _resolve_conflicts(self, transaction: Transaction, file_queue: list[Transaction], solve_conflicts: bool = True) -> Transaction | None:
+    def _resolve_conflicts(self, transaction: Transaction, file_queue: TransactionQueue, solve_conflicts: bool = True) -> Transaction | None:
         def break_down(to_break: EditTransaction) -> bool:
             if new_transactions := to_break.break_down():
                 try:
@@ -278,29 +415,20 @@ class TransactionManager:
         if file_path not in self.queued_transactions:
             return matching_transactions
 
-        for t in self.queued_transactions[file_path]:
-            if t.start_byte == start_byte:
-                if t.end_byte == end_byte:
-                    if transaction_order is None or t.transaction_order == transaction_order:
-                        matching_transactions.append(t)
-                elif combined and t.start_byte != t.end_byte:
-                    if other := self.get_transactions_at_range(t.file_path, t.end_byte, end_byte, transaction_order, combined=combined):
-                        return [t, *other]
+        for t in self.queued_transactions[file_path].starting_at(start_byte):
+            if t.end_byte == end_byte:
+                if transaction_order is None or t.transaction_order == transaction_order:
+                    matching_transactions.append(t)
+            elif combined and t.start_byte != t.end_byte:
+                if other := self.get_transactions_at_range(t.file_path, t.end_byte, end_byte, transaction_order, combined=combined):
+                    return [t, *other]
 
         return matching_transactions
 
     def _get_conflicts(self, transaction: Transaction) -> list[Transaction]:
         """Returns all transactions that overlap with the given transaction"""
-        overlapping_transactions = []
-        queued_transactions = list(self.queued_transactions[transaction.file_path])
-        for t in queued_transactions:
-            if transaction.start_byte < t.end_byte and transaction.end_byte > t.start_byte:
-                overlapping_transactions.append(t)
-        return overlapping_transactions
+        return self.queued_transactions[transaction.file_path].overlapping(transaction.start_byte, transaction.end_byte)
 
     def _get_overlapping_conflicts(self, transaction: Transaction) -> Transaction | None:
         """Returns the transaction that completely overlaps with the given transaction"""
-        for t in self.queued_transactions[transaction.file_path]:
-            if transaction.start_byte >= t.start_byte and transaction.end_byte <= t.end_byte:
-                return t
-        return None
+        return self.queued_transactions[transaction.file_path].containing(transaction.start_byte, transaction.end_byte)
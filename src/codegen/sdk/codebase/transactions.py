@@ -1,4 +1,4 @@
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from difflib import unified_diff
 from enum import IntEnum
 from functools import cached_property
@@ -35,6 +35,7 @@ class Transaction:
     priority: int | tuple
     transaction_order: TransactionPriority
     transaction_counter: int = 0
+    exec_func: Callable[[], None] | None = None
 
     def __init__(
         self,
@@ -86,6 +87,11 @@ class Transaction:
         msg = "Transaction.get_diff() must be implemented by subclasses"
         raise NotImplementedError(msg)
 
+    def get_replacement_bytes(self) -> bytes:
+        """Content replacing the bytes between start_byte and end_byte. Only implemented by edits, inserts and removes"""
+        msg = "Transaction.get_replacement_bytes() must be implemented by subclasses"
+        raise NotImplementedError(msg)
+
     def diff_str(self):
         """Human-readable string representation of the change"""
         msg = "Transaction.diff_str() must be implemented by subclasses"
@@ -109,13 +115,14 @@ class Transaction:
 class RemoveTransaction(Transaction):
     transaction_order = TransactionPriority.Remove
 
-    exec_func: Callable[[], None] | None = None
-
     def __init__(self, start_byte: int, end_byte: int, file: "File", priority: int = 0, exec_func: Callable[[], None] | None = None) -> None:
         super().__init__(start_byte, end_byte, file.path, priority=priority)
         self.file = file
         self.exec_func = exec_func
 
+    def get_replacement_bytes(self) -> bytes:
+        return b""
+
     def _generate_new_content_bytes(self) -> bytes:
         content_bytes = self.file.content_bytes
         new_content_bytes = content_bytes[: self.start_byte] + content_bytes[self.end_byte :]
@@ -140,8 +147,6 @@ class RemoveTransaction(Transaction):
 class InsertTransaction(Transaction):
     transaction_order = TransactionPriority.Insert
 
-    exec_func: Callable[[], None] | None = None
-
     def __init__(
         self,
         insert_byte: int,
@@ -156,6 +161,9 @@ class InsertTransaction(Transaction):
         self.file = file
         self.exec_func = exec_func
 
+    def get_replacement_bytes(self) -> bytes:
+        return bytes(self.new_content, encoding="utf-8")
+
     def _generate_new_content_bytes(self) -> bytes:
         new_bytes = bytes(self.new_content, encoding="utf-8")
         content_bytes = self.file.content_bytes
@@ -195,6 +203,9 @@ class EditTransaction(Transaction):
         super().__init__(start_byte, end_byte, file.path, priority=priority, new_content=new_content)
         self.file = file
 
+    def get_replacement_bytes(self) -> bytes:
+        return bytes(self.new_content, "utf-8")
+
     def _generate_new_content_bytes(self) -> bytes:
         new_bytes = bytes(self.new_content, "utf-8")
         content_bytes = self.file.content_bytes
@@ -228,6 +239,29 @@ class EditTransaction(Transaction):
         return None
 
 
+def apply_transactions(content: bytes, transactions: Sequence[Transaction]) -> bytes:
+    """Applies edit, insert and remove transactions to `content` in a single pass.
+
+    `transactions` must be sorted with `Transaction._to_sort_key`. The result (including the order in which new content
+    is generated and exec_funcs are called) is the same as executing the transactions one after another, but the output
+    is assembled once from the untouched spans and the new content instead of copying the file for every transaction.
+    """
+    chunks = []
+    end = len(content)
+    for transaction in transactions:
+        if transaction.end_byte > end and chunks:
+            # Overlaps with a transaction applied before it, so apply it to the content modified so far
+            content = content[:end] + b"".join(reversed(chunks))
+            chunks.clear()
+            end = len(content)
+        chunks.append(content[transaction.end_byte : end])
+        chunks.append(transaction.get_replacement_bytes())
+        end = transaction.start_byte
+        if transaction.exec_func:
+            transaction.exec_func()
+    return content[:end] + b"".join(reversed(chunks))
+
+
 class FileAddTransaction(Transaction):
     transaction_order = TransactionPriority.FileAdd
 
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+from array import array
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from codegen.sdk.core.dataclasses.usage import Usage, UsageKind, UsageType
+from codegen.sdk.enums import Edge, EdgeType
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from codegen.sdk.codebase.codebase_context import CodebaseContext
+    from codegen.sdk.core.interfaces.editable import Editable
+    from codegen.sdk.core.node_id_factory import NodeId
+
+_NONE = -1
+
+
+class UsageEdgeStore:
+    """Columnar storage for SYMBOL_USAGE edges, used instead of the graph when `compact_usage_edges` is enabled.
+
+    Each edge is a slot in a set of parallel arrays (source, destination, usage type, kind, usage symbol, imported by, and
+    the match and its start byte). Matches can't be re-created from their range, so each distinct match is kept once in a
+    table and edges refer to it by index. `Usage` objects are materialized when they are requested.
+
+    The incoming edges of each node are sorted by the start byte of their match (descending), which is the order
+    `Usable.usages` returns them in, when they are first requested after a change.
+    """
+
+    def __init__(self, ctx: CodebaseContext) -> None:
+        self.ctx = ctx
+        self.clear()
+
+    def clear(self) -> None:
+        self._src = array("q")
+        self._dst = array("q")
+        self._usage_type = array("b")
+        self._kind = array("b")
+        self._usage_symbol = array("q")
+        self._imported_by = array("q")
+        self._match = array("q")
+        self._match_start = array("q")
+        self._free: list[int] = []
+        # Distinct matches, with the number of edges referring to each
+        self._matches: list[Editable | None] = []
+        self._match_refs = array("q")
+        self._match_index: dict[int, int] = {}
+        self._free_matches: list[int] = []
+        # Edges of each node, in insertion order
+        self._in: defaultdict[NodeId, dict[int, None]] = defaultdict(dict)
+        self._out: defaultdict[NodeId, dict[int, None]] = defaultdict(dict)
+        self._in_sorted: dict[NodeId, list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._src) - len(self._free)
+
+    def add(self, u: NodeId, v: NodeId, usage: Usage) -> None:
+        match = usage.match
+        match_node = match if match is not None else usage.usage_symbol
+        row = (
+            u,
+            v,
+            int(usage.usage_type),
+            int(usage.kind),
+            usage.usage_symbol.node_id,
+            _NONE if usage.imported_by is None else usage.imported_by.node_id,
+            self._add_match(match),
+            match_node.ts_node.start_byte,
+        )
+        columns = self._columns()
+        if self._free:
+            edge = self._free.pop()
+            for column, value in zip(columns, row):
+                column[edge] = value
+        else:
+            edge = len(self._src)
+            for column, value in zip(columns, row):
+                column.append(value)
+        self._out[u][edge] = None
+        self._in[v][edge] = None
+        self._in_sorted.pop(v, None)
+
+    def _add_match(self, match: Editable | None) -> int:
+        if match is None:
+            return _NONE
+        index = self._match_index.get(id(match))
+        if index is None:
+            if self._free_matches:
+                index = self._free_matches.pop()
+                self._matches[index] = match
+                self._match_refs[index] = 0
+            else:
+                index = len(self._matches)
+                self._matches.append(match)
+                self._match_refs.append(0)
+            self._match_index[id(match)] = index
+        self._match_refs[index] += 1
+        return index
+
+    def _columns(self) -> tuple[array, ...]:
+        return self._src, self._dst, self._usage_type, self._kind, self._usage_symbol, self._imported_by, self._match, self._match_start
+
+    def _free_slot(self, edge: int) -> None:
+        if (index := self._match[edge]) != _NONE:
+            self._match_refs[index] -= 1
+            if self._match_refs[index] == 0:
+                del self._match_index[id(self._matches[index])]
+                self._matches[index] = None
+                self._free_matches.append(index)
+        self._src[edge] = _NONE
+        self._dst[edge] = _NONE
+        self._free.append(edge)
+
+    def remove_edges(self, u: NodeId, v: NodeId | None = None) -> None:
+        """Removes the edges from `u` (to `v`, if given)"""
+        edges = self._out.pop(u, {})
+        if v is not None:
+            if keep := {edge: None for edge in edges if self._dst[edge] != v}:
+                self._out[u] = keep
+            edges = [edge for edge in edges if self._dst[edge] == v]
+        for edge in edges:
+            dst = self._dst[edge]
+            del self._in[dst][edge]
+            self._in_sorted.pop(dst, None)
+            self._free_slot(edge)
+
+    def remove_node(self, n: NodeId) -> None:
+        """Removes all the edges from or to `n`"""
+        self.remove_edges(n)
+        self._in_sorted.pop(n, None)
+        for edge in self._in.pop(n, {}):
+            del self._out[self._src[edge]][edge]
+            self._free_slot(edge)
+
+    def _sorted_in(self, n: NodeId) -> list[int]:
+        """Incoming edges of `n`, by the start byte of their match (descending)"""
+        if (edges := self._in_sorted.get(n)) is None:
+            # Newer edges go first among edges with the same start byte, like the incoming edges of the graph
+            edges = self._in_sorted[n] = sorted(reversed(self._in.get(n, {})), key=lambda edge: -self._match_start[edge])
+        return edges
+
+    def rows(self) -> list[tuple[int, ...]]:
+        """The source, destination, usage type, kind, usage symbol, imported by and match start byte of each edge"""
+        columns = (self._src, self._dst, self._usage_type, self._kind, self._usage_symbol, self._imported_by, self._match_start)
+        return [row for row in zip(*columns) if row[0] != _NONE]
+
+    def has_edge(self, u: NodeId, v: NodeId, usage: Usage) -> bool:
+        return any(self._dst[edge] == v and self._materialize(edge) == usage for edge in self._out.get(u, ()))
+
+    def successors(self, n: NodeId) -> list[NodeId]:
+        return list(dict.fromkeys(self._dst[edge] for edge in self._out.get(n, ())))
+
+    def predecessors(self, n: NodeId) -> list[NodeId]:
+        return list(dict.fromkeys(self._src[edge] for edge in self._sorted_in(n)))
+
+    def dependencies(self, n: NodeId, usage_types: UsageType | None) -> list[NodeId]:
+        """Destinations of the edges from `n` with a usage type in `usage_types`"""
+        return [self._dst[edge] for edge in self._out.get(n, ()) if _has_usage_type(self._usage_type[edge], usage_types)]
+
+    def usages(self, n: NodeId, usage_types: UsageType | None) -> list[Usage]:
+        """Usages of `n` with a usage type in `usage_types`, sorted by the start byte of their match (descending)"""
+        usages = (self._materialize(edge) for edge in self._sorted_in(n) if _has_usage_type(self._usage_type[edge], usage_types))
+        return list(dict.fromkeys(usages))
+
+    def in_edges(self, n: NodeId) -> Iterator[tuple[NodeId, NodeId, Edge]]:
+        for edge in self._sorted_in(n):
+            yield self._src[edge], n, Edge(EdgeType.SYMBOL_USAGE, self._materialize(edge))
+
+    def out_edges(self, n: NodeId) -> Iterator[tuple[NodeId, NodeId, Edge]]:
+        for edge in self._out.get(n, ()):
+            yield n, self._dst[edge], Edge(EdgeType.SYMBOL_USAGE, self._materialize(edge))
+
+    def edges(self) -> Iterator[tuple[NodeId, NodeId, Edge]]:
+        for u in list(self._out):
+            yield from self.out_edges(u)
+
+    def _materialize(self, edge: int) -> Usage:
+        imported_by = self._imported_by[edge]
+        match = self._match[edge]
+        return Usage(
+            match=None if match == _NONE else self._matches[match],
+            usage_symbol=self.ctx.get_node(self._usage_symbol[edge]),
+            imported_by=None if imported_by == _NONE else self.ctx.get_node(imported_by),
+            usage_type=UsageType(self._usage_type[edge]),
+            kind=UsageKind(self._kind[edge]),
+        )
+
+
+def _has_usage_type(usage_type: int, usage_types: UsageType | None) -> bool:
+    return usage_types is None or usage_type & usage_types == usage_type
@@ -15,6 +15,8 @@ from codegen.shared.logging.get_logger import get_logger
 logger = get_logger(__name__)
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from rustworkx import PyDiGraph
 
     from codegen.sdk.core.codebase import CodebaseType
@@ -37,7 +39,7 @@ def post_init_validation(codebase: CodebaseType) -> PostInitValidationStatus:
         return PostInitValidationStatus.NO_NODES
 
     # Verify the graph has the same number of files as there are in the repo
-    if len(codebase.files) != len(list(codebase.op.iter_files(codebase.ctx.projects[0].subdirectories, extensions=codebase.ctx.extensions, ignore_list=GLOBAL_FILE_IGNORE_LIST))):
+    if len(codebase.files) != len(list(codebase.op.iter_files(codebase.ctx.projects[0].subdirectories, extensions=codebase.ctx.extensions, ignore_list=GLOBAL_FILE_IGNORE_LIST, skip_content=True))):
         return PostInitValidationStatus.MISSING_FILES
 
     # Verify import resolution
@@ -70,8 +72,8 @@ def post_sync_validation(codebase: CodebaseType) -> bool:
     if not codebase.ctx.config.codebase.track_graph:
         msg = "Can only be called with track_graph=true"
         raise NotImplementedError(msg)
-    return len(dict.fromkeys(codebase.ctx.old_graph.nodes())) == len(dict.fromkeys(codebase.ctx.nodes)) and len(dict.fromkeys(codebase.ctx.old_graph.weighted_edge_list())) == len(
-        dict.fromkeys(codebase.ctx.edges)
+    return len(dict.fromkeys(codebase.ctx.old_graph.nodes())) == len(dict.fromkeys(codebase.ctx.nodes)) and len(dict.fromkeys(get_edges(codebase.ctx.old_graph, codebase.ctx.old_usage_edges))) == len(
+        dict.fromkeys(codebase.ctx._get_validation_edges())
     )
 
 
@@ -144,8 +146,12 @@ Missing nodes
     return message
 
 
-def get_edges(graph: PyDiGraph):
+def get_edges(graph: PyDiGraph, usage_edges: Iterable[tuple[int, ...]] = ()):
+    """Edges of the graph, plus the usage edges kept out of it (see UsageEdgeStore.rows)"""
     ret = []
     for start, end, edge in graph.weighted_edge_list():
         ret.append((graph.get_node_data(start), graph.get_node_data(end), edge))
+    for start, end, usage_type, kind, usage_symbol, imported_by, match_start in usage_edges:
+        usage = (usage_type, kind, graph.get_node_data(usage_symbol), graph.get_node_data(imported_by) if imported_by >= 0 else None, match_start)
+        ret.append((graph.get_node_data(start), graph.get_node_data(end), usage))
     return ret
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Self
+
+from watchfiles import Change, DefaultFilter, watch
+
+from codegen.sdk.codebase.codebase_context import GLOBAL_FILE_IGNORE_LIST
+from codegen.sdk.codebase.diff_lite import ChangeType, DiffLite
+from codegen.shared.logging.get_logger import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+    from codegen.sdk.codebase.codebase_context import CodebaseContext
+
+logger = get_logger(__name__)
+
+
+class CodebaseWatcher:
+    """Keeps the graph in sync with the file system by applying filesystem events on a background thread.
+
+    watchfiles collects events until none arrive for `debounce` ms, so a burst (ie: a branch switch touching thousands
+    of files) becomes one batch. The events of a batch are merged into one diff per file based on the file's final
+    state. Files the codebase would not parse (ignore lists, other extensions, gitignored files) are dropped, and so are
+    files which are as the codebase itself last wrote them, since committing a change already syncs the graph.
+
+    Each batch is applied while holding `ctx.sync_lock`, which `CodebaseContext.commit_transactions` holds as well.
+    Queries are not locked: a query made from another thread while a batch is applied may see a partial update, and
+    nodes obtained before a batch may no longer be in the graph after it. Use `paused` around queries and edits made
+    from other threads.
+    """
+
+    def __init__(self, ctx: CodebaseContext, debounce: int = 1600, step: int = 50, on_sync: Callable[[list[DiffLite]], None] | None = None) -> None:
+        self.ctx = ctx
+        self.debounce = debounce
+        self.step = step
+        # Called on the watcher thread with the diffs of each batch after they are applied
+        self.on_sync = on_sync
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Starts watching the repository on a daemon thread"""
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="codebase-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stops watching. A batch being applied is finished first"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    @contextmanager
+    def paused(self) -> Iterator[None]:
+        """Holds back batches while the graph is queried or edited. Changes made in the meantime are applied afterwards"""
+        with self.ctx.sync_lock:
+            yield
+
+    def _run(self) -> None:
+        for changes in watch(self.ctx.repo_path, debounce=self.debounce, step=self.step, stop_event=self._stop_event, raise_interrupt=False):
+            try:
+                self.apply_changes(changes)
+            except Exception:
+                logger.exception(f"Failed to sync {len(changes)} filesystem changes")
+
+    def apply_changes(self, changes: Iterable[tuple[Change, str]]) -> list[DiffLite]:
+        """Applies a batch of filesystem events to the graph and returns the diffs that were applied"""
+        with self.ctx.sync_lock:
+            diffs = self.get_diffs(changes)
+            if diffs:
+                logger.info(f"Syncing {len(diffs)} changed files")
+                self.ctx.apply_diffs(diffs)
+        if diffs and self.on_sync is not None:
+            self.on_sync(diffs)
+        return diffs
+
+    def get_diffs(self, changes: Iterable[tuple[Change, str]]) -> list[DiffLite]:
+        """Merges a batch of filesystem events into one diff per file the codebase parses"""
+        events: dict[str, set[Change]] = defaultdict(set)
+        for change, path in changes:
+            relpath = self.ctx.to_relative(path)
+            if relpath.is_absolute():
+                # Outside of the repository
+                continue
+            for filepath in self._expand(change, relpath):
+                events[filepath].add(change)
+        if not events:
+            return []
+        project = self.ctx.projects[0]
+        filepaths = project.repo_operator.filter_filepaths(sorted(events), GLOBAL_FILE_IGNORE_LIST, subdirs=project.subdirectories, extensions=self.ctx.extensions)
+        diffs = []
+        for filepath in filepaths:
+            if self.ctx.io.wrote(self.ctx.to_absolute(filepath)):
+                continue
+            if not os.path.isfile(self.ctx.to_absolute(filepath)):
+                change_type = ChangeType.Removed
+            elif events[filepath] == {Change.modified}:
+                change_type = ChangeType.Modified
+            else:
+                # Files which are already in the graph are reparsed by apply_diffs
+                change_type = ChangeType.Added
+            diffs.append(DiffLite(change_type, Path(filepath)))
+        return diffs
+
+    def _expand(self, change: Change, relpath: Path) -> Iterator[str]:
+        """Yields the files affected by an event, which is reported once for a directory added or removed as a whole"""
+        abspath = self.ctx.to_absolute(relpath)
+        if abspath.is_dir():
+            # Directories are also modified when their entries change, which is reported for the entries themselves
+            if change is Change.added:
+                for root, dirs, files in os.walk(abspath):
+                    dirs[:] = [name for name in dirs if name not in DefaultFilter.ignore_dirs]
+                    for name in files:
+                        yield os.path.relpath(os.path.join(root, name), self.ctx.repo_path)
+        elif abspath in self.ctx.directories:
+            # A removed directory, which takes its files with it
+            for name in self.ctx.get_subtree_file_names(str(relpath)):
+                yield os.path.join(relpath, name)
+        else:
+            yield str(relpath)
@@ -9,16 +9,12 @@ from collections.abc import Generator
 from contextlib import contextmanager
 from functools import cached_property
 from pathlib import Path
-from typing import Generic, Literal, Unpack, overload
+from typing import TYPE_CHECKING, Generic, Literal, Unpack, overload
 
-import plotly.graph_objects as go
 import rich.repr
 from git import Commit as GitCommit
 from git import Diff
 from git.remote import PushInfoList
-from github.PullRequest import PullRequest
-from networkx import Graph
-from openai import OpenAI
 from rich.console import Console
 from typing_extensions import TypeVar, deprecated
 
@@ -27,10 +23,7 @@ from codegen.configs.models.secrets import SecretsConfig
 from codegen.git.repo_operator.repo_operator import RepoOperator
 from codegen.git.schemas.enums import CheckoutResult
 from codegen.git.schemas.repo_config import RepoConfig
-from codegen.git.utils.pr_review import CodegenPR
 from codegen.sdk._proxy import proxy_property
-from codegen.sdk.ai.client import get_openai_client
-from codegen.sdk.codebase.codebase_ai import generate_system_prompt, generate_tools
 from codegen.sdk.codebase.codebase_context import (
     GLOBAL_FILE_IGNORE_LIST,
     CodebaseContext,
@@ -41,8 +34,10 @@ from codegen.sdk.codebase.flagging.code_flag import CodeFlag
 from codegen.sdk.codebase.flagging.enums import FlagKwargs
 from codegen.sdk.codebase.flagging.group import Group
 from codegen.sdk.codebase.io.io import IO
+from codegen.sdk.codebase.io.memory_io import MemoryIO
 from codegen.sdk.codebase.progress.progress import Progress
 from codegen.sdk.codebase.span import Span
+from codegen.sdk.codebase.watcher import CodebaseWatcher
 from codegen.sdk.core.assignment import Assignment
 from codegen.sdk.core.class_definition import Class
 from codegen.sdk.core.codeowner import CodeOwner
@@ -91,6 +86,12 @@ from codegen.shared.logging.get_logger import get_logger
 from codegen.shared.performance.stopwatch_utils import stopwatch
 from codegen.visualizations.visualization_manager import VisualizationManager
 
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+    from github.PullRequest import PullRequest
+    from networkx import Graph
+    from openai import OpenAI
+
 logger = get_logger(__name__)
 MAX_LINES = 10000  # Maximum number of lines of text allowed to be logged
 
@@ -271,9 +272,9 @@ class Codebase(
     ####################################################################################################################
 
     @noapidoc
-    def _symbols(self, symbol_type: SymbolType | None = None) -> list[TSymbol | TClass | TFunction | TGlobalVar]:
-        matches: list[Symbol] = self.ctx.get_nodes(NodeType.SYMBOL)
-        return [x for x in matches if x.is_top_level and (symbol_type is None or x.symbol_type == symbol_type)]
+    def _symbols(self, symbol_type: SymbolType | None = None, name: str | None = None) -> list[TSymbol | TClass | TFunction | TGlobalVar]:
+        matches: list[Symbol] = self.ctx.get_symbols(name=name, symbol_type=symbol_type)
+        return [x for x in matches if x.is_top_level]
 
     # =====[ Node Types ]=====
     @overload
@@ -316,6 +317,7 @@ class Codebase(
             for filepath, _ in self._op.iter_files(
                 extensions=None if extensions == "*" else extensions,
                 ignore_list=GLOBAL_FILE_IGNORE_LIST,
+                skip_content=True,
             ):
                 files.append(self.get_file(filepath, optional=False))
         # Sort files alphabetically
@@ -639,7 +641,7 @@ class Codebase(
         Returns:
             bool: True if a symbol with the given name exists in the codebase, False otherwise.
         """
-        return any([x.name == symbol_name for x in self.symbols])
+        return len(self._symbols(name=symbol_name)) > 0
 
     def get_symbol(self, symbol_name: str, optional: bool = False) -> TSymbol | None:
         """Returns a Symbol by name from the codebase.
@@ -682,7 +684,7 @@ class Codebase(
         Note:
             When a unique symbol is required, use get_symbol() instead. It will raise ValueError if multiple symbols are found.
         """
-        return sort_editables(x for x in self.symbols if x.name == symbol_name)
+        return sort_editables(self._symbols(name=symbol_name))
 
     def get_class(self, class_name: str, optional: bool = False) -> TClass | None:
         """Returns a class that matches the given name.
@@ -697,7 +699,7 @@ class Codebase(
         Raises:
             ValueError: If the class is not found and optional=False, or if multiple classes with the same name exist.
         """
-        matches = [c for c in self.classes if c.name == class_name]
+        matches = sort_editables(self._symbols(symbol_type=SymbolType.Class, name=class_name), dedupe=False)
         if len(matches) == 0:
             if not optional:
                 msg = f"Class {class_name} not found in codebase. Use optional=True to return None instead."
@@ -726,7 +728,7 @@ class Codebase(
         Raises:
             ValueError: If function is not found and optional=False, or if multiple matching functions exist.
         """
-        matches = [f for f in self.functions if f.name == function_name]
+        matches = sort_editables(self._symbols(symbol_type=SymbolType.Function, name=function_name), dedupe=False)
         if len(matches) == 0:
             if not optional:
                 msg = f"Function {function_name} not found in codebase. Use optional=True to return None instead."
@@ -814,6 +816,24 @@ class Codebase(
         """
         self.ctx.commit_transactions(sync_graph=sync_graph and self.ctx.config.sync_enabled)
 
+    @noapidoc
+    def watch(self, debounce: int = 1600) -> CodebaseWatcher:
+        """Keeps the graph in sync with changes made to the files on disk, until the returned watcher is stopped.
+
+        Changes are applied on a background thread once no new changes arrive for `debounce` milliseconds. Changes made
+        through the codebase itself are not applied again. Queries are not locked against updates: wrap queries and edits
+        in `watcher.paused()` to keep the graph from changing underneath them.
+
+        Args:
+            debounce (int): Milliseconds without changes before a batch of changes is applied. Defaults to 1600.
+
+        Returns:
+            CodebaseWatcher: The running watcher. It can also be used as a context manager.
+        """
+        watcher = CodebaseWatcher(self.ctx, debounce=debounce)
+        watcher.start()
+        return watcher
+
     @noapidoc
     def git_push(self, *args, **kwargs) -> PushInfoList:
         """Git push."""
@@ -921,10 +941,8 @@ class Codebase(
 
         logger.info(f"Syncing {self._op.repo_name} to {target_commit.hexsha}")
         diff_index = origin_commit.diff(target_commit)
-        diff_lites = []
-        for diff in diff_index:
-            diff_lites.append(DiffLite.from_git_diff(diff))
-        self.ctx.apply_diffs(diff_lites)
+        # Old contents stay in the object database, reset reads them only for the files it restores
+        self.ctx.apply_diffs(DiffLite.from_git_diff(diff) for diff in diff_index)
         self.ctx.save_commit(target_commit)
 
     @noapidoc
@@ -937,6 +955,9 @@ class Codebase(
     @noapidoc
     def get_diff(self, base: str | None = None, stage_files: bool = False) -> str:
         """Produce a single git diff for all files."""
+        if isinstance(self.ctx.io, MemoryIO):
+            # The changes were never written to the working tree, which is still at the synced commit
+            return self.ctx.io.get_diff(Path(self.repo_path))
         if stage_files:
             self._op.git_cli.git.add(A=True)  # add all changes to the index so untracked files are included in the diff
         if base is None:
@@ -971,7 +992,7 @@ class Codebase(
     # GITHUB
     ####################################################################################################################
 
-    def create_pr(self, title: str, body: str) -> PullRequest:
+    def create_pr(self, title: str, body: str) -> "PullRequest":
         """Creates a pull request from the current branch to the repository's default branch.
 
         This method will:
@@ -1009,7 +1030,7 @@ class Codebase(
     # GRAPH VISUALIZATION
     ####################################################################################################################
 
-    def visualize(self, G: Graph | go.Figure, root: Editable | str | int | None = None) -> None:
+    def visualize(self, G: "Graph | go.Figure", root: Editable | str | int | None = None) -> None:
         """Visualizes a NetworkX graph or Plotly figure.
 
         Creates a visualization of the provided graph using GraphViz. This is useful for visualizing dependency graphs, call graphs,
@@ -1177,12 +1198,12 @@ class Codebase(
     # AI
     ####################################################################################################################
 
-    _ai_helper: OpenAI = None
+    _ai_helper: "OpenAI" = None
     _num_ai_requests: int = 0
 
     @property
     @noapidoc
-    def ai_client(self) -> OpenAI:
+    def ai_client(self) -> "OpenAI":
         """Enables calling AI/LLM APIs - re-export of the initialized `openai` module"""
         # Create a singleton AIHelper instance
         if self._ai_helper is None:
@@ -1190,6 +1211,8 @@ class Codebase(
                 msg = "OpenAI key is not set"
                 raise ValueError(msg)
 
+            from codegen.sdk.ai.client import get_openai_client
+
             self._ai_helper = get_openai_client(key=self.ctx.secrets.openai_api_key)
         return self._ai_helper
 
@@ -1217,6 +1240,8 @@ class Codebase(
         Raises:
             MaxAIRequestsError: If the maximum number of allowed AI requests (default 150) has been exceeded.
         """
+        from codegen.sdk.codebase.codebase_ai import generate_system_prompt, generate_tools
+
         # Check max transactions
         logger.info("Creating call to OpenAI...")
         self._num_ai_requests += 1
@@ -1307,6 +1332,45 @@ class Codebase(
             return file.find_by_byte_range(span.range)
         return []
 
+    def find_innermost_by_span(self, span: Span) -> Editable | None:
+        """Finds the smallest editable object containing the given source code span.
+
+        Args:
+            span (Span): The span object containing the filepath and byte range to search for.
+
+        Returns:
+            Editable | None: The innermost Editable object containing the span, or None if there is none.
+        """
+        if file := self.get_file(span.filepath):
+            return file._range_index.get_innermost(span.range.start_byte, span.range.end_byte)
+        return None
+
+    def find_overlapping_span(self, span: Span) -> list[Editable]:
+        """Finds editable objects sharing at least one byte with the given source code span.
+
+        Args:
+            span (Span): The span object containing the filepath and byte range to search within.
+
+        Returns:
+            list[Editable]: The overlapping Editable objects, ordered by start byte.
+        """
+        if file := self.get_file(span.filepath):
+            return file.find_overlapping_byte_range(span.range.start_byte, span.range.end_byte)
+        return []
+
+    def find_within_span(self, span: Span) -> list[Editable]:
+        """Finds editable objects fully inside the given source code span.
+
+        Args:
+            span (Span): The span object containing the filepath and byte range to search within.
+
+        Returns:
+            list[Editable]: The Editable objects inside the span, ordered by start byte.
+        """
+        if file := self.get_file(span.filepath):
+            return file.find_within_byte_range(span.range.start_byte, span.range.end_byte)
+        return []
+
     def set_session_options(self, **kwargs: Unpack[SessionOptions]) -> None:
         """Sets the session options for the current codebase.
 
@@ -1533,6 +1597,8 @@ class Codebase(
 
     def get_modified_symbols_in_pr(self, pr_id: int) -> tuple[str, dict[str, str], list[str], str]:
         """Get all modified symbols in a pull request"""
+        from codegen.git.utils.pr_review import CodegenPR
+
         pr = self._op.get_pull_request(pr_id)
         cg_pr = CodegenPR(self._op, self, pr)
         patch = cg_pr.get_pr_diff()
@@ -30,6 +30,8 @@ TParameter = TypeVar("TParameter", bound="Parameter")
 class Argument(Expression[Parent], HasName, HasValue, Generic[Parent, TParameter]):
     """Represents an argument passed into a FunctionCall."""
 
+    __slots__ = ("_name_node", "_pos", "_value_node")
+
     _pos: int
 
     def __init__(self, node: TSNode, positional_idx: int, parent: FunctionCall) -> None:
@@ -48,7 +48,9 @@ class FunctionCall(Expression[Parent], HasName, Resolvable, Generic[Parent]):
     ```
     """
 
-    _arg_list: Collection[Argument, Self]
+    __slots__ = ("_arg_list", "_name_node")
+
+    _arg_list: Collection[Argument, Self] | None
 
     def __init__(self, node: TSNode, file_node_id: NodeId, ctx: CodebaseContext, parent: Parent) -> None:
         super().__init__(node, file_node_id, ctx, parent)
@@ -57,12 +59,10 @@ class FunctionCall(Expression[Parent], HasName, Resolvable, Generic[Parent]):
         if self._name_node is not None and self._name_node.ts_node.type in ("unary_expression", "await_expression"):
             self._name_node = self._parse_expression(self._name_node.ts_node.children[-1], default=Name)
         # =====[ Grab the arg list ]=====
-        arg_list_node = node.child_by_field_name("arguments")
-        if arg_list_node is None:
+        if node.child_by_field_name("arguments") is None:
             msg = f"Failed to parse function call. Child 'argument_list' node does not exist. Source: {self.source}"
             raise ValueError(msg)
-        args = [Argument(x, i, self) for i, x in enumerate(arg_list_node.named_children) if x.type != "comment"]
-        self._arg_list = Collection(arg_list_node, self.file_node_id, self.ctx, self, children=args)
+        self._arg_list = None if ctx.parser.can_defer(self) else self._parse_args()
 
     def __repr__(self) -> str:
         """Custom string representation showing the function call chain structure.
@@ -312,9 +312,17 @@ class FunctionCall(Expression[Parent], HasName, Resolvable, Generic[Parent]):
         Returns:
             Collection[Argument, Self]: A collection containing the function's arguments.
         """
-        # TODO - this may be language-specific
+        if self._arg_list is None:
+            # Parsed on first use with `exp_lazy_expressions`
+            self._arg_list = self._parse_args()
         return self._arg_list
 
+    def _parse_args(self) -> Collection[Argument, Self]:
+        # TODO - this may be language-specific
+        arg_list_node = self.ts_node.child_by_field_name("arguments")
+        args = [Argument(x, i, self) for i, x in enumerate(arg_list_node.named_children) if x.type != "comment"]
+        return Collection(arg_list_node, self.file_node_id, self.ctx, self, children=args)
+
     def set_kwarg(self, name: str, value: str, *, create_on_missing: bool = True, override_existing: bool = True) -> None:
         """Set a keyword argument in a function call.
 
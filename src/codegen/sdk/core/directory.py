@@ -1,4 +1,5 @@
 import os
+from bisect import bisect_left
 from collections.abc import Iterator
 from pathlib import Path
 from typing import TYPE_CHECKING, Generic, Literal, Self
@@ -47,8 +48,8 @@ class Directory(
     ctx: "CodebaseContext"
     path: Path  # Absolute Path
     dirpath: str  # Relative Path
-    _files: list[str]  # List of file names
-    _subdirectories: list[str]  # List of subdirectory names
+    _files: list[str]  # Sorted list of file names
+    _subdirectories: list[str]  # Sorted list of subdirectory names
 
     def __init__(self, ctx: "CodebaseContext", path: Path, dirpath: str):
         self.ctx = ctx
@@ -141,18 +142,16 @@ class Directory(
         elif extensions is None:
             extensions = self.ctx.extensions
 
+        # The names of files in subdirectories include their path relative to this directory
+        file_names = self.ctx.get_subtree_file_names(self.dirpath) if recursive else self._files
         files = []
-        for file_name in self._files:
+        for file_name in file_names:
             if extensions == "*":
                 files.append(self.get_file(file_name))
             elif extensions is not None:
                 if any(file_name.endswith(ext) for ext in extensions):
                     files.append(self.get_file(file_name))
 
-        if recursive:
-            for directory in self.subdirectories:
-                files.extend(directory.files(extensions=extensions, recursive=True))
-
         return sort_editables(files, alphabetical=True, dedupe=False)
 
     @proxy_property
@@ -262,8 +261,28 @@ class Directory(
 
     def _add_file(self, file_name: str) -> None:
         """Add a file to the directory."""
-        self._files.append(file_name)
+        _insert_sorted(self._files, file_name)
+
+    def _remove_file(self, file_name: str) -> None:
+        """Remove a file from the directory."""
+        _remove_sorted(self._files, file_name)
 
     def _add_subdirectory(self, subdirectory_name: str) -> None:
         """Add a subdirectory to the directory."""
-        self._subdirectories.append(subdirectory_name)
+        _insert_sorted(self._subdirectories, subdirectory_name)
+
+    def _remove_subdirectory(self, subdirectory_name: str) -> None:
+        """Remove a subdirectory from the directory."""
+        _remove_sorted(self._subdirectories, subdirectory_name)
+
+
+def _insert_sorted(names: list[str], name: str) -> None:
+    idx = bisect_left(names, name)
+    if idx == len(names) or names[idx] != name:
+        names.insert(idx, name)
+
+
+def _remove_sorted(names: list[str], name: str) -> None:
+    idx = bisect_left(names, name)
+    if idx < len(names) and names[idx] == name:
+        del names[idx]
@@ -1,7 +1,6 @@
 import itertools
 from collections import deque
 from collections.abc import Generator
-from functools import cached_property
 from typing import Generic, Self, TypeVar, override
 
 from codegen.sdk.codebase.resolution_stack import ResolutionStack
@@ -16,6 +15,7 @@ from codegen.sdk.core.interfaces.unwrappable import Unwrappable
 from codegen.sdk.core.symbol_groups.expression_group import ExpressionGroup
 from codegen.sdk.extensions.autocommit import commiter, reader
 from codegen.sdk.extensions.sort import sort_editables
+from codegen.sdk.extensions.utils import untracked_cached_property
 from codegen.shared.decorators.docs import apidoc, noapidoc
 
 Parent = TypeVar("Parent", bound="Editable")
@@ -30,6 +30,8 @@ class BinaryExpression(Expression[Parent], Chainable, Generic[Parent]):
         right: The right operand of the binary expression.
     """
 
+    __slots__ = ("left", "right")
+
     left: Expression[Self] | None
     right: Expression[Self] | None
 
@@ -64,7 +66,7 @@ class BinaryExpression(Expression[Parent], Chainable, Generic[Parent]):
                 nodes_to_process.extend([node.left, node.right])
         return sort_editables(operators, dedupe=False)
 
-    @cached_property
+    @untracked_cached_property
     def elements(self) -> list[Expression[Self]]:
         """Returns all elements in a binary expression chain.
 
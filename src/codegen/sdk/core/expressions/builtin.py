@@ -13,6 +13,8 @@ if TYPE_CHECKING:
 
 @noapidoc
 class Builtin(Chainable, HasAttribute):
+    __slots__ = ()
+
     @reader
     @noapidoc
     @override
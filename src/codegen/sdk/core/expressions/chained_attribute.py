@@ -33,6 +33,8 @@ class ChainedAttribute(Expression[Parent], Resolvable, Generic[Object, Attribute
      A.method()
     """
 
+    __slots__ = ("_attribute", "_object")
+
     _object: Object
     _attribute: Attribute
 
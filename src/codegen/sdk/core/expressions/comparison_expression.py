@@ -1,9 +1,9 @@
-from functools import cached_property
 from typing import Self, TypeVar
 
 from codegen.sdk.core.expressions import Expression
 from codegen.sdk.core.expressions.binary_expression import BinaryExpression
 from codegen.sdk.core.symbol_groups.expression_group import ExpressionGroup
+from codegen.sdk.extensions.utils import untracked_cached_property
 from codegen.shared.decorators.docs import apidoc
 
 Parent = TypeVar("Parent")
@@ -16,6 +16,8 @@ class ComparisonExpression(BinaryExpression):
     Includes all set of `<`, `<=`, `>`, `>=`, `==`, `!=` etc.
     """
 
+    __slots__ = ()
+
     def __init__(self, ts_node, file_node_id, ctx, parent: Parent) -> None:
         super().__init__(ts_node, file_node_id, ctx, parent=parent)
         self.left = self.elements[0]
@@ -46,7 +48,7 @@ class ComparisonExpression(BinaryExpression):
                 operator_group.clear()
         return operators
 
-    @cached_property
+    @untracked_cached_property
     def elements(self) -> list[Expression[Self]]:
         """Returns a list of expressions for named child nodes.
 
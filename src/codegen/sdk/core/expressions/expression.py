@@ -19,6 +19,8 @@ class Expression(Editable[Parent], Generic[Parent]):
         node_type: The type of the node, set to NodeType.EXPRESSION.
     """
 
+    __slots__ = ()
+
     node_type: NodeType = NodeType.EXPRESSION
 
     @property
@@ -27,6 +27,8 @@ class MultiExpression(Expression[Parent], Generic[Parent, TExpression]):
         expressions: A list of expressions contained within the MultiExpression.
     """
 
+    __slots__ = ("expressions",)
+
     expressions: list[TExpression]
 
     def __init__(self, ts_node: TSNode, file_node_id: NodeId, ctx: CodebaseContext, parent: Parent, expressions: list[TExpression]) -> None:
@@ -26,6 +26,8 @@ class Name(Expression[Parent], Resolvable, Generic[Parent]):
     composed of a name.
     """
 
+    __slots__ = ()
+
     @reader
     @noapidoc
     @override
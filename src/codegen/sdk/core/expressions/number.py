@@ -17,6 +17,8 @@ class Number(Expression[Parent], Builtin, Generic[Parent]):
     eg. 1, 2.0, 3.14
     """
 
+    __slots__ = ()
+
     @noapidoc
     @commiter
     @override
@@ -19,6 +19,8 @@ if TYPE_CHECKING:
 
 Parent = TypeVar("Parent", bound="Expression")
 
+_CONTENT_TYPES = frozenset({"string_content", "string_fragment", "escape_sequence"})
+
 
 @apidoc
 class String(Expression[Parent], Builtin, Generic[Parent]):
@@ -26,19 +28,34 @@ class String(Expression[Parent], Builtin, Generic[Parent]):
 
     Attributes:
         content: The content of the string
-        content_nodes: A collection of string fragments and escape sequences in TS, or a single string content in Python.
         expressions: Embedded expressions in the string, only applicable for templated or formatted strings.
     """
 
+    __slots__ = ("_content_nodes", "content", "expressions")
+
     content: str
-    content_nodes: Collection[Expression[Editable], Self]  # string content is a collection of string_fragments and escape_sequences in TS and a single string_content in Python
+    _content_nodes: Collection[Expression[Editable], Self] | None
     expressions: list[Expression[Editable]]  # expressions in the string, only applicable for template strings
 
     def __init__(self, ts_node: TSNode, file_node_id: NodeId, ctx: "CodebaseContext", parent: Parent) -> None:
         super().__init__(ts_node, file_node_id, ctx, parent=parent)
-        content_children = list(self.children_by_field_types({"string_content", "string_fragment", "escape_sequence"}))
-        self.content_nodes = Collection(ts_node, self.file_node_id, self.ctx, self, delimiter="", children=content_children)
-        self.content = "".join(x.ts_node.text.decode("utf-8") for x in content_children)
+        self.content = "".join(child.text.decode("utf-8") for child in ts_node.children if child.type in _CONTENT_TYPES)
+        self._content_nodes = None if ctx.config.exp_lazy_expressions else self._parse_content_nodes()
+
+    @property
+    @reader
+    def content_nodes(self) -> Collection[Expression[Editable], Self]:
+        """A collection of string fragments and escape sequences in TS, or a single string content in Python.
+
+        With `exp_lazy_expressions`, the fragments are only parsed the first time this is accessed.
+        """
+        if self._content_nodes is None:
+            self._content_nodes = self._parse_content_nodes()
+        return self._content_nodes
+
+    def _parse_content_nodes(self) -> Collection[Expression[Editable], Self]:
+        content_children = list(self.children_by_field_types(_CONTENT_TYPES))
+        return Collection(self.ts_node, self.file_node_id, self.ctx, self, delimiter="", children=content_children)
 
     @reader
     def __eq__(self, other: object) -> bool:
@@ -23,6 +23,8 @@ class Value(Expression[Parent], Generic[Parent]):
     See also HasValue.
     """
 
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.ctx.parser.log_unparsed(self.ts_node)
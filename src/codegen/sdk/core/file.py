@@ -10,6 +10,7 @@ from pathlib import Path
 from typing import TYPE_CHECKING, Generic, Literal, Self, TypeVar, override
 
 from tree_sitter import Node as TSNode
+from tree_sitter import Tree
 from typing_extensions import deprecated
 
 from codegen.sdk._proxy import proxy_property
@@ -31,7 +32,7 @@ from codegen.sdk.core.symbol import Symbol
 from codegen.sdk.enums import EdgeType, ImportType, NodeType, SymbolType
 from codegen.sdk.extensions.sort import sort_editables
 from codegen.sdk.topological_sort import pseudo_topological_sort
-from codegen.sdk.tree_sitter_parser import get_parser_by_filepath_or_extension, parse_file
+from codegen.sdk.tree_sitter_parser import get_parser_by_filepath_or_extension, get_tree_edit, parse_file, parse_tree
 from codegen.sdk.typescript.function import TSFunction
 from codegen.sdk.utils import is_minified_js
 from codegen.shared.decorators.docs import apidoc, noapidoc
@@ -114,6 +115,8 @@ class File(Editable[None]):
             path.parent.mkdir(parents=True, exist_ok=True)
             ctx.io.write_file(path, content)
             ctx.io.save_files({path})
+            # Non-source files are not synced, so add them to the directory tree here
+            ctx.update_directory_tree([str(ctx.to_relative(path))])
 
         new_file = cls(filepath, ctx, ts_node=None, binary=binary)
         return new_file
@@ -122,7 +125,7 @@ class File(Editable[None]):
     @noapidoc
     @reader
     def content_bytes(self) -> bytes:
-        """Loaded dynamically every time to preserve source of truth.
+        """Read through the IO's content buffer, which is re-read only when the file changes.
 
         TODO: move rest of graph sitter to operate in bytes to prevent multi byte character issues?
         """
@@ -148,7 +151,7 @@ class File(Editable[None]):
             msg = "Cannot read binary file as string. Use content_bytes instead."
             raise ValueError(msg)
 
-        return self.content_bytes.decode(encoding="utf-8")
+        return self.ctx.io.read_text(self.path)
 
     @noapidoc
     def write(self, content: str | bytes, to_disk: bool = False) -> None:
@@ -427,13 +430,16 @@ class SourceFile(
 
     code_block: TCodeBlock
     _nodes: list[Importable]
+    # Tree of the last parse, reused to incrementally re-parse the file when its content changes
+    _ts_tree: Tree | None
 
-    def __init__(self, ts_node: TSNode, filepath: PathLike, ctx: CodebaseContext) -> None:
+    def __init__(self, ts_node: TSNode, filepath: PathLike, ctx: CodebaseContext, ts_tree: Tree | None = None) -> None:
         self.node_id = ctx.add_node(self)
         self._nodes = []
+        self._ts_tree = ts_tree
         super().__init__(filepath, ctx, ts_node=ts_node)
         self._nodes.clear()
-        self.ctx.filepath_idx[self.file_path] = self.node_id
+        self.ctx._add_file_path(self.file_path, self.node_id)
         self._pending_imports = set()
         try:
             self.parse(ctx)
@@ -489,6 +495,7 @@ class SourceFile(
         """
         external_edges_to_resolve = []
 
+        self.ctx._checkpoint_file(self)
         # Collect node ids of all the file's nested children and itself to remove
         node_ids_to_remove = set()
         # ==== [ Classes, Assignments, Function, Interfaces ] ====
@@ -510,25 +517,33 @@ class SourceFile(
             if self.ctx.has_node(node_id):
                 self.ctx.remove_node(node_id)
         if not reparse:
-            self.ctx.filepath_idx.pop(self.file_path, None)
-        self._nodes.clear()
+            self.ctx._remove_file_path(self.file_path)
+        # Replaced rather than cleared, so a graph checkpoint can keep the old list
+        self._nodes = []
         return list(filter(lambda node: self.ctx.has_node(node.node_id) and node is not None, external_edges_to_resolve))
 
     @noapidoc
     @commiter
     def sync_with_file_content(self) -> None:
         """Re-parses parent file and re-sets current TSNode."""
-        self._pending_imports.clear()
-        self.ts_node = parse_file(self.filepath, self.content)
+        self.ctx._checkpoint_file(self)
+        self._pending_imports = set()
+        self._ts_tree = parse_tree(self.filepath, bytes(self.content, "utf-8"), self._ts_tree)
+        self.ts_node = self._ts_tree.root_node
         if self.node_id is None:
             self.ctx.filepath_idx[self.file_path] = self.node_id
             self.file_node_id = self.node_id
         else:
             assert self.ctx.has_node(self.node_id)
         self.name = self.path.stem
-        self._range_index.clear()
+        self._range_index = RangeIndex()
         self.parse(self.ctx)
 
+    @noapidoc
+    def is_content_parsed(self) -> bool:
+        """Whether the current content of the file is the content it was last parsed from."""
+        return self._ts_tree is not None and get_tree_edit(self._ts_tree, bytes(self.content, "utf-8")) is None
+
     @staticmethod
     @noapidoc
     def get_extensions() -> list[str]:
@@ -563,16 +578,21 @@ class SourceFile(
 
     @classmethod
     @noapidoc
-    def from_content(cls, filepath: str | PathLike | Path, content: str, ctx: CodebaseContext, sync: bool = True, verify_syntax: bool = True) -> Self | None:
-        """Creates a new file from content and adds it to the graph."""
+    def from_content(cls, filepath: str | PathLike | Path, content: str, ctx: CodebaseContext, sync: bool = True, verify_syntax: bool = True, ts_tree: Tree | None = None) -> Self | None:
+        """Creates a new file from content and adds it to the graph.
+
+        If `ts_tree` is provided, the content is assumed to be already parsed (and checked for minification).
+        """
         path = ctx.to_absolute(filepath)
 
-        # Sanity check to ensure file is not a minified file
-        if is_minified_js(content):
-            logger.info(f"File {filepath} is a minified file. Skipping...", extra={"filepath": filepath})
-            return None
+        if ts_tree is None:
+            # Sanity check to ensure file is not a minified file
+            if is_minified_js(content):
+                logger.info(f"File {filepath} is a minified file. Skipping...", extra={"filepath": filepath})
+                return None
 
-        ts_node = parse_file(path, content)
+            ts_tree = parse_tree(path, bytes(content, "utf-8"))
+        ts_node = ts_tree.root_node
         if ts_node.has_error and verify_syntax:
             logger.info("Failed to parse file %s", filepath)
             return None
@@ -588,7 +608,7 @@ class SourceFile(
             ctx.add_single_file(path)
             return ctx.get_file(filepath)
         else:
-            return cls(ts_node, Path(filepath), ctx)
+            return cls(ts_node, Path(filepath), ctx, ts_tree=ts_tree)
 
     @classmethod
     @noapidoc
@@ -663,8 +683,7 @@ class SourceFile(
             list[TImport]: List of Import objects that import this file as a module,
                 sorted by file location.
         """
-        imps = [x for x in self.ctx.in_edges(self.node_id) if x[2].type == EdgeType.IMPORT_SYMBOL_RESOLUTION]
-        return sort_editables((self.ctx.get_node(x[0]) for x in imps), by_file=True, dedupe=False)
+        return sort_editables(self.ctx.predecessors(self.node_id, edge_type=EdgeType.IMPORT_SYMBOL_RESOLUTION), by_file=True, dedupe=False)
 
     @property
     @reader(cache=False)
@@ -1184,6 +1203,51 @@ class SourceFile(
         """
         return self._range_index.get_all_for_range(range)
 
+    @reader
+    def find_node_at_byte(self, byte: int) -> Editable | None:
+        """Finds the innermost editable object containing the given byte offset.
+
+        A node contains a byte if it starts at or before it and ends at or after it, so a cursor placed right after a
+        name still finds that name. Only nodes in the full range index (see `full_range_index`) are considered.
+
+        Args:
+            byte (int): The byte offset in the file.
+
+        Returns:
+            Editable | None: The smallest Editable object containing the byte, or None if there is none.
+        """
+        return self._range_index.get_innermost(byte, byte)
+
+    @reader
+    def find_overlapping_byte_range(self, start_byte: int, end_byte: int) -> list[Editable]:
+        """Finds all editable objects sharing at least one byte with [start_byte, end_byte).
+
+        Only nodes in the full range index (see `full_range_index`) are considered.
+
+        Args:
+            start_byte (int): The first byte of the range.
+            end_byte (int): The byte after the end of the range.
+
+        Returns:
+            list[Editable]: The overlapping Editable objects, ordered by start byte.
+        """
+        return self._range_index.get_overlapping(start_byte, end_byte)
+
+    @reader
+    def find_within_byte_range(self, start_byte: int, end_byte: int) -> list[Editable]:
+        """Finds all editable objects fully inside [start_byte, end_byte).
+
+        Only nodes in the full range index (see `full_range_index`) are considered.
+
+        Args:
+            start_byte (int): The first byte of the range.
+            end_byte (int): The byte after the end of the range.
+
+        Returns:
+            list[Editable]: The Editable objects inside the range, ordered by start byte.
+        """
+        return self._range_index.get_inside(start_byte, end_byte)
+
     @property
     @noapidoc
     def descendant_symbols(self) -> list[Importable]:
@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING, Generic, Self, TypeVar
 
 from codegen.sdk.codebase.resolution_stack import ResolutionStack
 from codegen.sdk.core.interfaces.editable import Editable
-from codegen.sdk.extensions.utils import cached_property
+from codegen.sdk.extensions.utils import cached_property, cached_values
 from codegen.shared.decorators.docs import noapidoc
 
 if TYPE_CHECKING:
@@ -17,7 +17,10 @@ Parent = TypeVar("Parent", bound="Editable")
 class Chainable(Editable[Parent], Generic[Parent]):
     """Represents a class that can be used as an object in a function call chain."""
 
-    _resolving: bool = False
+    __slots__ = ()
+
+    # Stored in a slot of Editable, unset until the first resolution
+    _resolving: bool
 
     @abstractmethod
     def _resolved_types(self) -> Generator["ResolutionStack[Self]", None, None]: ...
@@ -26,12 +29,12 @@ class Chainable(Editable[Parent], Generic[Parent]):
     @noapidoc
     def resolved_type_frames(self) -> list[ResolutionStack["Self"]]:
         """Resolve the definition(s) of this object."""
-        if self._resolving:
+        if getattr(self, "_resolving", False):
             return [ResolutionStack(self)]  # Break cycles
         self._resolving = True
         try:
             ret = list(self._resolved_types())
-            self.__dict__.pop("resolved_type_frames", None)
+            cached_values(self).pop("resolved_type_frames", None)
             return ret
         finally:
             self._resolving = False
@@ -56,7 +59,7 @@ class Chainable(Editable[Parent], Generic[Parent]):
         """Resolve the definition(s) of this object."""
         if isinstance(child, Chainable):
             assert child is not self
-            if not child._resolving:
+            if not getattr(child, "_resolving", False):
                 resolved = child.resolved_type_frames
                 if len(resolved) > 0:
                     for resolution in resolved:
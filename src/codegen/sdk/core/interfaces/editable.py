@@ -3,7 +3,6 @@ from __future__ import annotations
 import itertools
 import re
 from abc import abstractmethod
-from functools import cached_property
 from typing import TYPE_CHECKING, Generic, Self, TypeVar, Unpack, final, overload
 
 from rich.markup import escape
@@ -13,7 +12,7 @@ from codegen.sdk.codebase.span import Span
 from codegen.sdk.codebase.transactions import EditTransaction, InsertTransaction, RemoveTransaction, TransactionPriority
 from codegen.sdk.core.autocommit import commiter, reader, remover, repr_func, writer
 from codegen.sdk.core.placeholder.placeholder import Placeholder
-from codegen.sdk.extensions.utils import get_all_identifiers
+from codegen.sdk.extensions.utils import get_all_identifiers, untracked_cached_property
 from codegen.sdk.output.ast import AST
 from codegen.sdk.output.constants import ANGULAR_STYLE, MAX_STRING_LENGTH
 from codegen.sdk.output.jsonable import JSONable
@@ -111,15 +110,21 @@ class Editable(JSONable, Generic[Parent]):
         node_type: The type of node this Editable instance represents.
     """
 
+    # Expressions make up most of the graph, so nodes are slotted. Shared slots (including Chainable's `_resolving`) are
+    # declared here so slotted subclasses can be combined freely. Subclasses without __slots__ get a __dict__ as usual.
+    __slots__ = ("_cached_values", "_file", "_hash", "_resolving", "ctx", "file_node_id", "parent", "ts_node")
+
     ts_node: TSNode
     file_node_id: NodeId
     ctx: CodebaseContext
     parent: Parent
     node_type: NodeType
-    _file: File | None = None
-    _hash: int | None = None
+    _file: File | None
+    _hash: int | None
 
     def __init__(self, ts_node: TSNode, file_node_id: NodeId, ctx: CodebaseContext, parent: Parent) -> None:
+        self._file = None
+        self._hash = None
         self.ts_node = ts_node
         self.file_node_id = file_node_id
         self.ctx = ctx
@@ -649,7 +654,7 @@ class Editable(JSONable, Generic[Parent]):
             None
         """
         if fix_indentation:
-            line = self.file.content.split("\n")[self.ts_node.start_point[0]]
+            line = self.ctx.io.read_buffer(self.file.path).line(self.ts_node.start_point[0])
             indentation = line[: len(line) - len(line.strip())]
             src_lines = new_src.split("\n")
             src_lines = src_lines[:1] + [line if line == "" else indentation + line for line in src_lines[1:]]
@@ -1009,7 +1014,7 @@ class Editable(JSONable, Generic[Parent]):
         else:
             yield from self.file.resolve_name(name, start_byte or self.start_byte, strict=strict)
 
-    @cached_property
+    @untracked_cached_property
     @noapidoc
     def github_url(self) -> str | None:
         if self.file.github_url:
@@ -1027,7 +1032,7 @@ class Editable(JSONable, Generic[Parent]):
     def range(self) -> Range:
         return self.ts_node.range
 
-    @cached_property
+    @untracked_cached_property
     @noapidoc
     @final
     def span(self) -> Span:
@@ -1074,7 +1079,7 @@ class Editable(JSONable, Generic[Parent]):
             dest = dest.parent
         return dest
 
-    @cached_property
+    @property
     @noapidoc
     def _add_to_index(self) -> None:
         self.file._range_index.add_to_range(self)
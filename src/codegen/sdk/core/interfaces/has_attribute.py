@@ -9,6 +9,8 @@ Attribute = TypeVar("Attribute", bound="Editable")
 
 
 class HasAttribute(Generic[Attribute]):
+    __slots__ = ()
+
     @abstractmethod
     def resolve_attribute(self, name: str) -> Attribute | None:
         """Resolve an attribute belonging to this object."""
@@ -1,10 +1,9 @@
-from functools import cached_property
-
 from codegen.sdk.core.autocommit import commiter, reader, writer
 from codegen.sdk.core.dataclasses.usage import UsageKind
 from codegen.sdk.core.expressions.chained_attribute import ChainedAttribute
 from codegen.sdk.core.expressions.defined_name import DefinedName
 from codegen.sdk.core.expressions.name import Name
+from codegen.sdk.extensions.utils import untracked_cached_property
 from codegen.shared.decorators.docs import apidoc, noapidoc
 
 
@@ -12,9 +11,11 @@ from codegen.shared.decorators.docs import apidoc, noapidoc
 class HasName:
     """An interface for any node object that has a name."""
 
+    __slots__ = ()
+
     _name_node: Name | ChainedAttribute | DefinedName | None = None
 
-    @cached_property
+    @untracked_cached_property
     @reader
     def name(self) -> str | None:
         """Retrieves the base name of the object without namespace prefixes.
@@ -26,7 +27,7 @@ class HasName:
             return self._name_node.attribute.source
         return self._name_node._source if self._name_node else None
 
-    @cached_property
+    @untracked_cached_property
     @reader
     def full_name(self) -> str | None:
         """Returns the full name of the object, including the namespace path.
@@ -7,6 +7,8 @@ from codegen.shared.decorators.docs import apidoc
 class HasValue:
     """An interface for any node object that has a value."""
 
+    __slots__ = ()
+
     _value_node: Expression | None
 
     @property
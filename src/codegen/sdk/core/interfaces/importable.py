@@ -85,6 +85,10 @@ class Importable(Expression[Parent], HasName, Generic[Parent]):
         Opposite of `usages`
         """
         # TODO: sort out attribute usages in dependencies
+        if self.ctx.usage_edges is not None:
+            if self.ctx.lazy_graph is not None:
+                self.ctx.lazy_graph.load_out_edges(self.node_id)
+            return sort_editables([self.ctx.get_node(x) for x in self.ctx.usage_edges.dependencies(self.node_id, usage_types)], by_file=True)
         edges = [x for x in self.ctx.out_edges(self.node_id) if x[2].type == EdgeType.SYMBOL_USAGE]
         unique_dependencies = []
         for edge in edges:
@@ -14,6 +14,8 @@ Parent = TypeVar("Parent", bound=Editable)
 class Resolvable(Chainable[Parent], Generic[Parent]):
     """Represents a class resolved to another symbol during the compute dependencies step."""
 
+    __slots__ = ()
+
     @abstractmethod
     @noapidoc
     @writer
@@ -65,6 +65,10 @@ class Usable(Importable[Parent], Generic[Parent]):
             raise ValueError(msg)
 
         assert self.node_id is not None
+        if self.ctx.usage_edges is not None:
+            if self.ctx.lazy_graph is not None:
+                self.ctx.lazy_graph.load_in_edges(self.node_id)
+            return self.ctx.usage_edges.usages(self.node_id, usage_types)
         usages_to_return = []
         in_edges = self.ctx.in_edges(self.node_id)
         for edge in in_edges:
@@ -1,21 +1,26 @@
 from __future__ import annotations
 
+from bisect import bisect_left
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Generic, Protocol, Self, TypeVar
 
 from rich.console import Console
+from tree_sitter import Query
 
 from codegen.sdk.core.expressions.placeholder_type import PlaceholderType
 from codegen.sdk.core.expressions.value import Value
 from codegen.sdk.core.statements.symbol_statement import SymbolStatement
+from codegen.sdk.tree_sitter_parser import get_lang_by_filepath_or_extension
 from codegen.sdk.utils import find_first_function_descendant, find_import_node
 
 if TYPE_CHECKING:
+    from tree_sitter import Language
     from tree_sitter import Node as TSNode
 
     from codegen.sdk.codebase.codebase_context import CodebaseContext
     from codegen.sdk.codebase.node_classes.node_classes import NodeClasses
     from codegen.sdk.core.expressions.type import Type
+    from codegen.sdk.core.file import SourceFile
     from codegen.sdk.core.interfaces.editable import Editable
     from codegen.sdk.core.node_id_factory import NodeId
     from codegen.sdk.core.statements.statement import Statement
@@ -44,6 +49,11 @@ class Parser(Generic[Expression]):
     _uncovered_nodes: set[str] = field(default_factory=set)
     _should_log: bool = False
     _console: Console = field(default_factory=lambda: Console())
+    _symbol_types: list[str] = field(init=False)
+    _symbol_queries: dict[Language, Query] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self._symbol_types = list(self.symbol_map)
 
     def _process_type(self, expr_type: type[Type] | dict[str, type[Type]], node: TSNode) -> tuple[type[Type], TSNode]:
         if isinstance(expr_type, dict):
@@ -76,10 +86,35 @@ class Parser(Generic[Expression]):
             ret = expr_type(node, file_node_id, ctx, parent)
         if default == Value:
             ret.file._range_index.mark_as_canonical(ret)
-            if isinstance(ret, Value):
+            if isinstance(ret, Value) and not self.can_defer(ret):
                 ret.children
         return ret
 
+    def can_defer(self, node: Editable) -> bool:
+        """Whether the subtree of `node` can be parsed the first time it is used (see `exp_lazy_expressions`)"""
+        # Symbols are graph nodes, so they can't be created lazily while dependencies are being computed
+        return node.ctx.config.exp_lazy_expressions and not self._contains_symbol(node.ts_node, node.file)
+
+    def _contains_symbol(self, node: TSNode, file: SourceFile) -> bool:
+        ranges = file._range_index.symbol_ranges
+        if ranges is None:
+            ranges = file._range_index.symbol_ranges = self._get_symbol_ranges(file)
+        # Nodes starting inside `node` are nested in it, except for its ancestors starting at the same byte
+        i = bisect_left(ranges, (node.start_byte,))
+        while i < len(ranges) and ranges[i][0] < node.end_byte:
+            if ranges[i][1] <= node.end_byte:
+                return True
+            i += 1
+        return False
+
+    def _get_symbol_ranges(self, file: SourceFile) -> list[tuple[int, int]]:
+        """Sorted byte ranges of the symbols in `file`, found in a single pass over its tree"""
+        language = get_lang_by_filepath_or_extension(file.filepath)
+        if (query := self._symbol_queries.get(language)) is None:
+            symbol_types = [symbol_type for symbol_type in self._symbol_types if language.id_for_node_kind(symbol_type, True) is not None]
+            query = self._symbol_queries[language] = Query(language, "[" + " ".join(f"({symbol_type})" for symbol_type in symbol_types) + "] @symbol")
+        return sorted((symbol.start_byte, symbol.end_byte) for symbol in query.captures(file.ts_node).get("symbol", ()))
+
     def log_unparsed(self, node: TSNode) -> None:
         if self._should_log and node.is_named and node.type not in self._uncovered_nodes:
             self._uncovered_nodes.add(node.type)
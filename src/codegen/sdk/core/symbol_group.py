@@ -28,6 +28,8 @@ class SymbolGroup(Editable[Parent], Collection[Child], Generic[Child, Parent]):
     that do not follow the traditional tree structure.
     """
 
+    __slots__ = ("_symbols",)
+
     _symbols: list[Child]
 
     def __init__(self, file_node_id: NodeId, ctx: CodebaseContext, parent: Parent, node: TSNode | None = None, children: list[Child] | None = None) -> None:
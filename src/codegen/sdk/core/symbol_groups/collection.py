@@ -25,14 +25,16 @@ class Collection(SymbolGroup[Child, Parent], MutableSequence[Child], Generic[Chi
         _bracket_size: Number of characters wrapping the collection
     """
 
+    __slots__ = ("_bracket_size", "_container_end_byte", "_container_start_byte", "_delimiter", "_elements", "_indent", "_inserts", "_original_children", "_pending_removes", "_reversed")
+
     _elements: int
     _reversed: set[int]
     _inserts: dict[int, int]
-    _pending_removes: int = 0
+    _pending_removes: int
 
     _delimiter: str
-    _indent: int = 0
-    _bracket_size: int = 1
+    _indent: int
+    _bracket_size: int
     _container_start_byte: int
     _container_end_byte: int
 
@@ -41,6 +43,8 @@ class Collection(SymbolGroup[Child, Parent], MutableSequence[Child], Generic[Chi
         self._delimiter = delimiter
         self._reversed = set()
         self._inserts = defaultdict(lambda: 0)
+        self._pending_removes = 0
+        self._indent = 0
         self._container_start_byte = self.ts_node.start_byte
         self._container_end_byte = self.ts_node.end_byte
         self._bracket_size = bracket_size
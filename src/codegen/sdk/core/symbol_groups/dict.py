@@ -33,6 +33,8 @@ class Pair(Editable[Parent], HasValue, Generic[TExpression, Parent]):
         key: The key expression of the pair, expected to be of type TExpression.
     """
 
+    __slots__ = ("_value_node", "key")
+
     key: TExpression
 
     def __init__(self, ts_node: TSNode, file_node_id: NodeId, ctx: "CodebaseContext", parent: Parent) -> None:
@@ -25,9 +25,11 @@ class MultiLineCollection(Collection[Child, Parent], Generic[Child, Parent]):
     You can use standard operations to operate on this list (IE len, del, append, insert, etc)
     """
 
+    __slots__ = ("_inserts_max_size", "_leading_delimiter", "_trailing_delimiter")
+
     _inserts_max_size: dict[int, int]
-    _leading_delimiter: str = "\n"
-    _trailing_delimiter: str = "\n"
+    _leading_delimiter: str
+    _trailing_delimiter: str
 
     def __init__(
         self,
@@ -21,7 +21,16 @@ def find_line_start_and_end_nodes(node: TSNode) -> list[tuple[TSNode, TSNode]]:
 def find_first_descendant(node: TSNode, type_names: list[str], max_depth: int | None = None) -> TSNode | None: ...
 
 cached_property = functools_cached_property
+untracked_cached_property = functools_cached_property
 lru_cache = functools_lru_cache
 
+def cached_values(instance: object) -> dict[str, object]:
+    """The dict the cached properties of an instance are stored in"""
+
 def uncache_all(): ...
+def uncache_files(file_node_ids: Iterable[int]) -> None: ...
+def cache_stats() -> dict[str, int]:
+    """Hits, misses and invalidations of the tracked caches"""
+
+def report() -> None: ...
 def is_descendant_of(node: TSNode, possible_parent: TSNode) -> bool: ...
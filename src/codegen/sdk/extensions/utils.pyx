@@ -1,4 +1,4 @@
-from collections import Counter
+from collections import Counter, defaultdict
 from collections.abc import Generator, Iterable
 from functools import cached_property as functools_cached_property
 from functools import lru_cache as functools_lru_cache
@@ -109,19 +109,54 @@ def find_first_descendant(node: TSNode, type_names: list[str], max_depth: int |
     return find(node)
 
 
-to_uncache = []
+# Cached properties to clear, grouped by the node id of the file owning the instance (None if it isn't part of a file)
+to_uncache = defaultdict(list)
 lru_caches = []
 counter = Counter()
+# Hits, misses and invalidations across all tracked caches. Hits of cached properties are not counted, since instances
+# with a __dict__ serve them without going through the descriptor.
+stats = Counter()
 
 
-class cached_property(functools_cached_property):
+def cached_values(instance):
+    """The dict the cached properties of `instance` are stored in: its __dict__, or the `_cached_values` slot of nodes
+    without a __dict__ (created on first use).
+    """
+    if type(instance).__dictoffset__:
+        return instance.__dict__
+    cache = getattr(instance, "_cached_values", None)
+    if cache is None:
+        cache = instance._cached_values = {}
+    return cache
+
+
+class untracked_cached_property(functools_cached_property):
+    """A cached property which is never invalidated. Unlike functools.cached_property, it supports slotted instances."""
+
     def __get__(self, instance, owner=None):
-        ret = super().__get__(instance)
-        if instance is not None:
-            to_uncache.append((instance, self.attrname))
-            counter[self.attrname] += 1
+        if instance is None:
+            return self
+        cache = cached_values(instance)
+        try:
+            return cache[self.attrname]
+        except KeyError:
+            pass
+        ret = cache[self.attrname] = self.func(instance)
+        self._record(instance)
         return ret
 
+    def _record(self, instance):
+        """Called after a value is computed and cached for `instance`"""
+
+
+class cached_property(untracked_cached_property):
+    """A cached property which is cleared by uncache_all, or by uncache_files for the file owning the instance."""
+
+    def _record(self, instance):
+        to_uncache[getattr(instance, "file_node_id", None)].append((instance, self.attrname))
+        counter[self.attrname] += 1
+        stats["misses"] += 1
+
 
 def lru_cache(func=None, *, maxsize=128, typed=False):
     """A wrapper around functools.lru_cache that tracks the cached function so that its cache
@@ -137,19 +172,53 @@ def lru_cache(func=None, *, maxsize=128, typed=False):
     return cached_func
 
 
-def uncache_all():
-    for instance, name in to_uncache:
+def _uncache(entries):
+    for instance, name in entries:
         try:
-            del instance.__dict__[name]
+            del cached_values(instance)[name]
+            stats["invalidations"] += 1
         except KeyError:
             pass
 
+
+def _clear_lru_caches():
     for cached_func in lru_caches:
+        info = cached_func.cache_info()
+        stats["hits"] += info.hits
+        stats["misses"] += info.misses
+        stats["invalidations"] += info.currsize
         cached_func.cache_clear()
 
 
+def uncache_all():
+    for entries in to_uncache.values():
+        _uncache(entries)
+    to_uncache.clear()
+    _clear_lru_caches()
+
+
+def uncache_files(file_node_ids):
+    """Clears the cached properties of instances owned by the given files, along with the ones not owned by any file
+    and all tracked lru caches (which are not tied to a file).
+    """
+    _uncache(to_uncache.pop(None, ()))
+    for file_node_id in file_node_ids:
+        _uncache(to_uncache.pop(file_node_id, ()))
+    _clear_lru_caches()
+
+
+def cache_stats():
+    ret = Counter(stats)
+    for cached_func in lru_caches:
+        info = cached_func.cache_info()
+        ret["hits"] += info.hits
+        ret["misses"] += info.misses
+    return {key: ret[key] for key in ("hits", "misses", "invalidations")}
+
+
 def report():
     print(tabulate(counter.most_common(10)))
+    print(tabulate(cache_stats().items()))
 
 
 def is_descendant_of(node: TSNode, possible_parent: TSNode) -> bool:
@@ -1,5 +1,4 @@
 from abc import ABC, abstractmethod
-from functools import cached_property
 
 from tree_sitter import Node as TSNode
 
@@ -16,6 +15,8 @@ BLACKLIST = ["json", "G", "viz", "autocommit_cache", "ts_node", "symbol_usages",
 
 @noapidoc
 class JSONable(ABC):
+    __slots__ = ()
+
     ts_node: TSNode
 
     @noapidoc
@@ -82,7 +83,7 @@ class JSONable(ABC):
     @abstractmethod
     @noapidoc
     def span(self) -> Span: ...
-    @cached_property
+    @property
     @abstractmethod
     @noapidoc
     def _add_to_index(self) -> None: ...
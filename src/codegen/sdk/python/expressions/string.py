@@ -17,6 +17,8 @@ Parent = TypeVar("Parent", bound="Expression")
 class PyString(String, Generic[Parent]):
     """An abstract representation of a python string."""
 
+    __slots__ = ()
+
     def __init__(self, ts_node: TSNode, file_node_id: NodeId, ctx: "CodebaseContext", parent: Parent) -> None:
         super().__init__(ts_node, file_node_id, ctx, parent=parent)
         substitutions = [x for x in ts_node.named_children if x.type == "interpolation"]
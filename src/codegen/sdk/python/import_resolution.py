@@ -116,11 +116,11 @@ class PyImport(Import["PyFile"]):
                     return ImportResolution(from_file=file, symbol=None, imports_file=True)
 
             # =====[ Default path ]=====
-            if file := self.ctx.get_file(filepath):
+            if file := self.ctx.get_module_file(filepath):
                 return ImportResolution(from_file=file, symbol=None, imports_file=True)
 
             filepath = filepath.replace(".py", "/__init__.py")
-            if file := self.ctx.get_file(filepath):
+            if file := self.ctx.get_module_file(filepath):
                 # TODO - I think this is another edge case, due to `dao/__init__.py` etc.
                 # You can't do `from a.b.c import foo` => `foo.utils.x` right now since `foo` is just a file...
                 return ImportResolution(from_file=file, symbol=None, imports_file=True)
@@ -136,7 +136,7 @@ class PyImport(Import["PyFile"]):
 
             # =====[ Check if `module.py` file exists in the graph ]=====
             filepath = os.path.join(base_path, filepath)
-            if file := self.ctx.get_file(filepath):
+            if file := self.ctx.get_module_file(filepath):
                 symbol = file.get_node_by_name(symbol_name)
                 if symbol is None:
                     if file.get_node_from_wildcard_chain(symbol_name):
@@ -165,7 +165,7 @@ class PyImport(Import["PyFile"]):
                         return ImportResolution(from_file=from_file, symbol=symbol)
 
             # =====[ Check if `module/__init__.py` file exists in the graph ]=====
-            if from_file := self.ctx.get_file(filepath):
+            if from_file := self.ctx.get_module_file(filepath):
                 symbol = from_file.get_node_by_name(symbol_name)
                 if symbol is None:
                     if from_file.get_node_from_wildcard_chain(symbol_name):
@@ -212,7 +212,7 @@ class PyImport(Import["PyFile"]):
         for resolve_path in resolve_paths:
             filepath_new: str = os.path.join(resolve_path, filepath)
             try:
-                file = self.ctx.get_file(filepath_new)
+                file = self.ctx.get_module_file(filepath_new)
             except AssertionError as e:
                 file = None
             if file:
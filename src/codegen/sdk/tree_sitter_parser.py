@@ -1,12 +1,12 @@
 import os
+import threading
 from os import PathLike
 from pathlib import Path
-from typing import Union
 
 import tree_sitter_javascript as ts_javascript
 import tree_sitter_python as ts_python
 import tree_sitter_typescript as ts_typescript
-from tree_sitter import Language, Parser
+from tree_sitter import Language, Parser, Point, Tree
 from tree_sitter import Node as TSNode
 
 from codegen.sdk.output.utils import stylize_error
@@ -21,52 +21,52 @@ def to_extension(filepath_or_extension: str | PathLike) -> str:
     return Path(filepath_or_extension).suffix
 
 
-class _TreeSitterAbstraction:
-    """Class to facilitate loading/retrieval of the Parser object for a given language.
-    Should not be used directly, instead use `get_tree_sitter_parser` to get the parser for a given extension.
-    """
+# TODO: use ProgrammingLanguages enum here instead
+EXTENSION_TO_LANG = {
+    # ".js": JS_LANGUAGE,
+    # ".jsx": JS_LANGUAGE,
+    # ".ts": TS_LANGUAGE,
+    # Use TSX for ALL JS/TS files!
+    ".js": TSX_LANGUAGE,
+    ".jsx": TSX_LANGUAGE,
+    ".ts": TSX_LANGUAGE,
+    ".tsx": TSX_LANGUAGE,
+    ".py": PY_LANGUAGE,
+}
+
 
-    _instance: Union["_TreeSitterAbstraction", None] = None
-    # TODO: use ProgrammingLanguages enum here instead
-    extension_to_lang = {
-        # ".js": JS_LANGUAGE,
-        # ".jsx": JS_LANGUAGE,
-        # ".ts": TS_LANGUAGE,
-        # Use TSX for ALL JS/TS files!
-        ".js": TSX_LANGUAGE,
-        ".jsx": TSX_LANGUAGE,
-        ".ts": TSX_LANGUAGE,
-        ".tsx": TSX_LANGUAGE,
-        ".py": PY_LANGUAGE,
-    }
-    extension_to_parser: dict[str, Parser] = {}
+class ParserPool:
+    """Hands out tree-sitter parsers per thread and language.
+
+    A Parser keeps its state between parses and must not be used by two threads at once, so every thread that parses
+    gets its own parser for each language. Parsers are created on first use and dropped when their thread exits.
+    """
 
     def __init__(self) -> None:
-        self.initialize_parsers()
+        self._local = threading.local()
 
-    def initialize_parsers(self) -> None:
-        for extension, language in self.extension_to_lang.items():
-            parser = Parser(language)
-            self.extension_to_parser[extension] = parser
+    def get(self, language: Language) -> Parser:
+        """Returns the calling thread's parser for `language`. It must not be handed to other threads."""
+        parsers: dict[Language, Parser] | None = getattr(self._local, "parsers", None)
+        if parsers is None:
+            parsers = self._local.parsers = {}
+        if (parser := parsers.get(language)) is None:
+            parser = parsers[language] = Parser(language)
+        return parser
 
 
-_ts_parser_factory = _TreeSitterAbstraction()
+_parser_pool = ParserPool()
 
 
 def get_parser_by_filepath_or_extension(filepath_or_extension: str | PathLike = ".py") -> Parser:
-    extension = to_extension(filepath_or_extension)
-    # HACK: we do not currently use a plain text parser, so default to python for now
-    if extension not in _ts_parser_factory.extension_to_parser:
-        extension = ".py"
-    return _ts_parser_factory.extension_to_parser[extension]
+    """Returns the calling thread's parser for the language of the given file or extension."""
+    return _parser_pool.get(get_lang_by_filepath_or_extension(filepath_or_extension))
 
 
-def get_lang_by_filepath_or_extension(filepath_or_extension: str = ".py") -> Language:
+def get_lang_by_filepath_or_extension(filepath_or_extension: str | PathLike = ".py") -> Language:
     extension = to_extension(filepath_or_extension)
     # HACK: we do not currently use a plain text parser, so default to python for now
-    if extension not in _ts_parser_factory.extension_to_parser:
-        extension = ".py"
-    return _ts_parser_factory.extension_to_lang[extension]
+    return EXTENSION_TO_LANG.get(extension, PY_LANGUAGE)
 
 
 def parse_file(filepath: PathLike, content: str) -> TSNode:
@@ -75,6 +75,94 @@ def parse_file(filepath: PathLike, content: str) -> TSNode:
     return ts_node
 
 
+def parse_tree(filepath: PathLike, content: bytes, old_tree: Tree | None = None) -> Tree:
+    """Parses `content` into a tree, reusing `old_tree` (the tree of the previous version of the file) if provided.
+
+    Only the region that changed since `old_tree` is re-lexed. The old tree is left untouched, so its nodes stay valid.
+    If the content did not change, `old_tree` itself is returned.
+    """
+    parser = get_parser_by_filepath_or_extension(filepath)
+    if old_tree is None:
+        return parser.parse(content)
+    edit = get_tree_edit(old_tree, content)
+    if edit is None:
+        return old_tree
+    if (tree := _clone_tree(parser, old_tree)) is None:
+        return parser.parse(content)
+    tree.edit(**edit)
+    return parser.parse(content, tree)
+
+
+def _clone_tree(parser: Parser, tree: Tree) -> Tree | None:
+    """Copies `tree` so it can be edited. The copy shares all its subtrees with the original.
+
+    Re-parsing unchanged content against the tree reuses it entirely, and avoids Tree.copy (which is unreliable in the
+    bindings we pin). Returns None if the leading whitespace of the source can't be recovered.
+    """
+    root = tree.root_node
+    row, column = root.start_point
+    if root.start_byte != row + column:
+        return None
+    return parser.parse(b"\n" * row + b" " * column + root.text, tree)
+
+
+def _advance_point(point: Point, content: bytes, start: int, end: int) -> Point:
+    """Moves `point` (the position of byte `start`) forward to byte `end` of `content`. Columns are in bytes."""
+    newlines = content.count(b"\n", start, end)
+    if newlines == 0:
+        return Point(point.row, point.column + end - start)
+    return Point(point.row + newlines, end - content.rindex(b"\n", start, end) - 1)
+
+
+def _common_length(a: memoryview, b: memoryview, reverse: bool = False) -> int:
+    """Length of the common prefix (or suffix) of `a` and `b`, found by bisecting with slice comparisons"""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if (a[len(a) - mid :] == b[len(b) - mid :]) if reverse else (a[:mid] == b[:mid]):
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def get_tree_edit(old_tree: Tree, content: bytes) -> dict[str, int | Point] | None:
+    """Computes the edit turning the source of `old_tree` into `content`, as keyword arguments for `Tree.edit`.
+
+    The edit spans from the first to the last changed byte. Returns None if the content is unchanged.
+    """
+    root = old_tree.root_node
+    old_source = memoryview(root.text)
+    new_source = memoryview(content)
+    # The root node does not include leading whitespace, so that part of the old source is only known by its end position
+    offset = root.start_byte
+    old_end = offset + len(old_source)
+    if len(content) < offset or content[:offset].strip() or _advance_point(Point(0, 0), content, 0, offset) != root.start_point:
+        return dict(
+            start_byte=0,
+            old_end_byte=old_end,
+            new_end_byte=len(content),
+            start_point=Point(0, 0),
+            old_end_point=root.end_point,
+            new_end_point=_advance_point(Point(0, 0), content, 0, len(content)),
+        )
+    prefix = offset + _common_length(old_source, new_source[offset:])
+    if prefix == old_end == len(content):
+        return None
+    suffix = _common_length(old_source[prefix - offset :], new_source[prefix:], reverse=True)
+    start_point = _advance_point(Point(0, 0), content, 0, prefix)
+    old_end_byte = old_end - suffix
+    new_end_byte = len(content) - suffix
+    return dict(
+        start_byte=prefix,
+        old_end_byte=old_end_byte,
+        new_end_byte=new_end_byte,
+        start_point=start_point,
+        old_end_point=_advance_point(start_point, old_source.obj, prefix - offset, old_end_byte - offset),
+        new_end_point=_advance_point(start_point, content, prefix, new_end_byte),
+    )
+
+
 def print_errors(filepath: PathLike, content: str) -> None:
     if not os.path.exists(filepath):
         return
@@ -21,6 +21,8 @@ class TSChainedAttribute(ChainedAttribute[Expression, Name, Parent], Generic[Par
     and property components of the expression, as well as analyzing function calls made on the object.
     """
 
+    __slots__ = ()
+
     def __init__(self, ts_node, file_node_id, ctx, parent: Parent):
         super().__init__(ts_node, file_node_id, ctx, parent=parent, object=ts_node.child_by_field_name("object"), attribute=ts_node.child_by_field_name("property"))
 
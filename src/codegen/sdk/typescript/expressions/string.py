@@ -26,6 +26,8 @@ class TSString(String, Generic[Parent]):
             Empty for regular string literals.
     """
 
+    __slots__ = ()
+
     def __init__(self, ts_node: TSNode, file_node_id: NodeId, ctx: "CodebaseContext", parent: Parent) -> None:
         super().__init__(ts_node, file_node_id, ctx, parent=parent)
         if ts_node.type == "template_string":
@@ -228,49 +228,30 @@ class TSImport(Import["TSFile"], Exportable):
                 import_source = self.file.ts_config.translate_import_path(import_source)
 
             # Check if need to resolve relative import path to absolute path
-            relative_import = False
-            if import_source.startswith("."):
-                relative_import = True
-
-            # Insert base path
-            # This has the happen before the relative path resolution
-            if not import_source.startswith(base_path):
-                import_source = os.path.join(base_path, import_source)
-
-            # If the import is relative, convert it to an absolute path
-            if relative_import:
-                import_source = self._relative_to_absolute_import(import_source)
+            relative_import = import_source.startswith(".")
+
+            # Resolutions only depend on the translated path (and the importing directory for relative imports), so they are shared between imports
+            cache_key = (import_source, base_path, os.path.dirname(self.to_file.file_path) if relative_import else None)
+            if cache_key in self.ctx.import_resolution_cache:
+                node_id = self.ctx.import_resolution_cache[cache_key]
+                file = None if node_id is None else self.ctx.get_node(node_id)
             else:
-                import_source = os.path.normpath(import_source)
-
-            # covers the case where the import is from a directory ex: "import { postExtract } from './post'"
-            import_name = import_source.split("/")[-1]
-            if "." not in import_name:
-                possible_paths = ["index.ts", "index.js", "index.tsx", "index.jsx"]
-                for p_path in possible_paths:
-                    if self.ctx.to_absolute(os.path.join(import_source, p_path)).exists():
-                        import_source = os.path.join(import_source, p_path)
-                        break
-
-            # Loop through all extensions and try to find the file
-            extensions = ["", ".ts", ".d.ts", ".tsx", ".d.tsx", ".js", ".jsx"]
-            # Try both filename with and without extension
-            for import_source_base in (import_source, os.path.splitext(import_source)[0]):
-                for extension in extensions:
-                    import_source_ext = import_source_base + extension
-                    if file := self.ctx.get_file(import_source_ext):
-                        if self.is_module_import():
-                            return ImportResolution(from_file=file, symbol=None, imports_file=True)
-                        else:
-                            # If the import is a named import, resolve to the named export in the file
-                            if self.symbol_name is None:
-                                return ImportResolution(from_file=file, symbol=None, imports_file=True)
-                            export_symbol = file.get_export(export_name=self.symbol_name.source)
-                            if export_symbol is None:
-                                # If the named export is not found, it is importing a module re-export.
-                                # In this case, resolve to the file itself and dynamically resolve the symbol later.
-                                return ImportResolution(from_file=file, symbol=None, imports_file=True)
-                            return ImportResolution(from_file=file, symbol=export_symbol)
+                file = self._find_imported_file(import_source, base_path, relative_import)
+                self.ctx.import_resolution_cache[cache_key] = None if file is None else file.node_id
+
+            if file is not None:
+                if self.is_module_import():
+                    return ImportResolution(from_file=file, symbol=None, imports_file=True)
+                else:
+                    # If the import is a named import, resolve to the named export in the file
+                    if self.symbol_name is None:
+                        return ImportResolution(from_file=file, symbol=None, imports_file=True)
+                    export_symbol = file.get_export(export_name=self.symbol_name.source)
+                    if export_symbol is None:
+                        # If the named export is not found, it is importing a module re-export.
+                        # In this case, resolve to the file itself and dynamically resolve the symbol later.
+                        return ImportResolution(from_file=file, symbol=None, imports_file=True)
+                    return ImportResolution(from_file=file, symbol=export_symbol)
 
             # If the imported file is not found, treat it as an external module
             return None
@@ -278,6 +259,39 @@ class TSImport(Import["TSFile"], Exportable):
             # Codebase is probably trying to import file from outside repo
             return None
 
+    @noapidoc
+    @reader
+    def _find_imported_file(self, import_source: str, base_path: str, relative_import: bool) -> TSFile | None:
+        """Finds the file an import path points to. Only files in the graph are considered, so the file system is never touched."""
+        # Insert base path
+        # This has the happen before the relative path resolution
+        if not import_source.startswith(base_path):
+            import_source = os.path.join(base_path, import_source)
+
+        # If the import is relative, convert it to an absolute path
+        if relative_import:
+            import_source = self._relative_to_absolute_import(import_source)
+        else:
+            import_source = os.path.normpath(import_source)
+
+        # covers the case where the import is from a directory ex: "import { postExtract } from './post'"
+        import_name = import_source.split("/")[-1]
+        if "." not in import_name:
+            possible_paths = ["index.ts", "index.js", "index.tsx", "index.jsx"]
+            for p_path in possible_paths:
+                if self.ctx.find_file(os.path.join(import_source, p_path)):
+                    import_source = os.path.join(import_source, p_path)
+                    break
+
+        # Loop through all extensions and try to find the file
+        extensions = ["", ".ts", ".d.ts", ".tsx", ".d.tsx", ".js", ".jsx"]
+        # Try both filename with and without extension
+        for import_source_base in (import_source, os.path.splitext(import_source)[0]):
+            for extension in extensions:
+                if file := self.ctx.find_file(import_source_base + extension):
+                    return file
+        return None
+
     @noapidoc
     @reader
     def _relative_to_absolute_import(self, relative_import: str) -> str:
@@ -16,6 +16,43 @@ if TYPE_CHECKING:
 
 logger = get_logger(__name__)
 
+# Keys of the trie nodes for an alias matching the path as is (`foo`) or as a directory (`foo/`)
+_EXACT = 0
+_DIRECTORY = 1
+
+
+class _PathAliasTrie:
+    """Prefix trie over the `/` separated parts of path aliases.
+
+    Finds the same alias as `TSConfig._find_matching_path`, in one walk of the import path instead of a set lookup per parent directory.
+    """
+
+    def __init__(self, aliases: dict[str, str]) -> None:
+        self._root: dict = {}
+        for alias, target in aliases.items():
+            key = _EXACT
+            if alias.endswith("/"):
+                key = _DIRECTORY
+                alias_path = alias[:-1]
+            else:
+                alias_path = alias
+            node = self._root
+            for part in alias_path.split("/"):
+                node = node.setdefault(part, {})
+            node[key] = (alias, target)
+
+    def match(self, import_path: str) -> tuple[str, str] | None:
+        """Returns the longest alias that is a prefix (by whole path parts) of `import_path`, along with its target"""
+        match = None
+        node = self._root
+        for i, part in enumerate(import_path.split("/")):
+            if (node := node.get(part)) is None:
+                break
+            # The root of an absolute path is never matched
+            if i > 0 or part:
+                match = node.get(_EXACT) or node.get(_DIRECTORY) or match
+        return match
+
 
 @ts_apidoc
 class TSConfig:
@@ -55,10 +92,14 @@ class TSConfig:
     # Optimization hack. If all the path alises start with `@` or `~`, then we can skip any path that doesn't start with `@` or `~`
     # when computing the import resolution.
     _import_optimization_enabled: bool = False
+    # Tries of import_resolution_overrides, reference_import_aliases and path_import_aliases, in order of precedence
+    _alias_tries: tuple[_PathAliasTrie, ...] | None = None
+    _translated_import_paths: dict[str, str]
 
     def __init__(self, config_file: File, config_parser: "TSConfigParser"):
         self.config_file = config_file
         self.config_parser = config_parser
+        self._translated_import_paths = {}
         # Try to parse the config file as JSON5. Fallback to empty dict if it fails.
         # We use json5 because it supports comments in the config file.
         try:
@@ -226,6 +267,8 @@ class TSConfig:
 
         # Mark that we've precomputed the import aliases
         self._computed_path_import_aliases = True
+        self._alias_tries = None
+        self._translated_import_paths.clear()
 
     def _parse_parent_config_path(self, config_filepath: str | None) -> Path | None:
         """Returns a TSConfig object from a file path."""
@@ -260,49 +303,35 @@ class TSConfig:
         # Break out early if we can
         if self._import_optimization_enabled and not import_path.startswith("@") and not import_path.startswith("~"):
             return import_path
+        if (translated_path := self._translated_import_paths.get(import_path)) is None:
+            translated_path = self._translated_import_paths[import_path] = self._translate_import_path(import_path)
+        return translated_path
 
-        # Step 1: Try to resolve with import_resolution_overrides
-        if self.config_file.ctx.config.import_resolution_overrides:
-            if path_check := TSConfig._find_matching_path(frozenset(self.config_file.ctx.config.import_resolution_overrides.keys()), import_path):
-                to_base = self.config_file.ctx.config.import_resolution_overrides[path_check]
+    def _translate_import_path(self, import_path: str) -> str:
+        # Steps 1-3: Try to resolve with import_resolution_overrides, then reference_import_aliases, then path_import_aliases
+        for trie in self._get_alias_tries():
+            if match := trie.match(import_path):
+                path_check, to_base = match
 
                 # Get the remaining path after the matching prefix
                 remaining_path = import_path[len(path_check) :].lstrip("/")
 
                 # Join the path together
-                import_path = os.path.join(to_base, remaining_path)
-
-                return import_path
-
-        # Step 2: Keep traveling down the parent config paths until we find a match a reference_import_aliases
-        if path_check := TSConfig._find_matching_path(frozenset(self.reference_import_aliases.keys()), import_path):
-            # TODO: This assumes that there is only one to_base path for the given from_base path
-            to_base = self.reference_import_aliases[path_check][0]
-
-            # Get the remaining path after the matching prefix
-            remaining_path = import_path[len(path_check) :].lstrip("/")
-
-            # Join the path together
-            import_path = os.path.join(to_base, remaining_path)
-
-            return import_path
-
-        # Step 3: Keep traveling down the parent config paths until we find a match a path_import_aliases
-        if path_check := TSConfig._find_matching_path(frozenset(self.path_import_aliases.keys()), import_path):
-            # TODO: This assumes that there is only one to_base path for the given from_base path
-            to_base = self.path_import_aliases[path_check][0]
-
-            # Get the remaining path after the matching prefix
-            remaining_path = import_path[len(path_check) :].lstrip("/")
-
-            # Join the path together
-            import_path = os.path.join(to_base, remaining_path)
-
-            return import_path
+                return os.path.join(to_base, remaining_path)
 
         # Step 4: Try to resolve with base path for non-relative imports
         return self.resolve_base_url(import_path)
 
+    def _get_alias_tries(self) -> tuple[_PathAliasTrie, ...]:
+        if self._alias_tries is None:
+            # TODO: This assumes that there is only one to_base path for the given from_base path
+            self._alias_tries = (
+                _PathAliasTrie(self.config_file.ctx.config.import_resolution_overrides),
+                _PathAliasTrie({alias: paths[0] for alias, paths in self.reference_import_aliases.items() if paths}),
+                _PathAliasTrie({alias: paths[0] for alias, paths in self.path_import_aliases.items() if paths}),
+            )
+        return self._alias_tries
+
     def translate_absolute_path(self, absolute_path: str) -> str:
         """Translates an absolute path to an import path using the tsconfig paths.
 
@@ -2,8 +2,6 @@ import subprocess
 import time
 from functools import wraps
 
-import sentry_sdk
-
 from codegen.shared.logging.get_logger import get_logger
 from codegen.shared.performance.time_utils import humanize_duration
 
@@ -27,6 +25,8 @@ def stopwatch_with_sentry(name: str):
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
+            import sentry_sdk
+
             with sentry_sdk.start_transaction(name=name):
                 start_time = time.perf_counter()
                 res = func(*args, **kwargs)
@@ -1,12 +1,13 @@
 import os
-
-import plotly.graph_objects as go
-from networkx import Graph
+from typing import TYPE_CHECKING
 
 from codegen.git.repo_operator.repo_operator import RepoOperator
 from codegen.sdk.core.interfaces.editable import Editable
 from codegen.shared.logging.get_logger import get_logger
-from codegen.visualizations.viz_utils import graph_to_json
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+    from networkx import Graph
 
 logger = get_logger(__name__)
 
@@ -32,7 +33,7 @@ class VisualizationManager:
         if self.op.folder_exists(self.viz_path):
             self.op.emptydir(self.viz_path)
 
-    def write_graphviz_data(self, G: Graph | go.Figure, root: Editable | str | int | None = None) -> None:
+    def write_graphviz_data(self, G: "Graph | go.Figure", root: Editable | str | int | None = None) -> None:
         """Writes the graph data to a file.
 
         Args:
@@ -44,6 +45,12 @@ class VisualizationManager:
         ------
             None
         """
+        # networkx and plotly are slow to import, so only load them once a graph is actually written
+        import plotly.graph_objects as go
+        from networkx import Graph
+
+        from codegen.visualizations.viz_utils import graph_to_json
+
         # Convert the graph to a JSON-serializable format
         if isinstance(G, Graph):
             graph_json = graph_to_json(G, root)
@@ -0,0 +1,45 @@
+import fnmatch
+
+import pytest
+
+from codegen.git.repo_operator.repo_operator import _compile_ignore_list
+from codegen.sdk.codebase.codebase_context import GLOBAL_FILE_IGNORE_LIST
+from codegen.sdk.codebase.factory.get_session import get_codebase_session
+
+FILES = {
+    "src/app.py": "import os\n",
+    "src/café/naïve.py": "x = 'é'\n",
+    "src/space dir/a b.py": "y = 1\n",
+    "src/lib.ts": "export const a = 1;\n",
+    "src/vendor.min.js": "var a=1;\n",
+    "node_modules/pkg/index.js": "module.exports = 1;\n",
+    "web/node_modules/pkg/index.js": "module.exports = 2;\n",
+    "tests/test_app.py": "def test(): pass\n",
+    "README.md": "# readme\n",
+}
+IGNORED = {"src/vendor.min.js", "node_modules/pkg/index.js", "web/node_modules/pkg/index.js"}
+
+
+def test_iter_files(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files=FILES, verify_output=False) as codebase:
+        op = codebase.op
+        assert dict(op.iter_files(ignore_list=GLOBAL_FILE_IGNORE_LIST)) == {path: content for path, content in FILES.items() if path not in IGNORED}
+        assert sorted(path for path, _ in op.iter_files(extensions=[".py"], ignore_list=GLOBAL_FILE_IGNORE_LIST)) == ["src/app.py", "src/café/naïve.py", "src/space dir/a b.py", "tests/test_app.py"]
+        assert sorted(path for path, _ in op.iter_files(subdirs=["src/c", "tests"], ignore_list=GLOBAL_FILE_IGNORE_LIST)) == ["src/café/naïve.py", "tests/test_app.py"]
+        assert sorted(path for path, _ in op.iter_files(subdirs=["src"], extensions=[".js"])) == ["src/vendor.min.js"]
+        assert all(content == "" for _, content in op.iter_files(skip_content=True))
+
+
+def test_iter_files_skips_deleted_files(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files=FILES, verify_output=False) as codebase:
+        (tmpdir / "README.md").remove()
+        assert "README.md" not in dict(codebase.op.iter_files(skip_content=True))
+
+
+@pytest.mark.parametrize(
+    "path",
+    [*FILES, "src/vs/platform/contextview/browser/contextMenuService.ts", "a/semver.js", "b/compiled/c.js", "lodash@4.js", ".git/HEAD", "x/.git/y", ".yarn/releases/yarn.js", "src/node_modules"],
+)
+def test_compiled_ignore_list(path: str) -> None:
+    expected = any(fnmatch.fnmatch(path, pattern) or path.startswith(pattern) for pattern in GLOBAL_FILE_IGNORE_LIST)
+    assert bool(_compile_ignore_list(tuple(GLOBAL_FILE_IGNORE_LIST)).match(path)) == expected
@@ -1,19 +1,21 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from pathlib import Path
 from unittest.mock import MagicMock
 
 import pytest
+from git import Repo as GitCLI
 
 from codegen.git.models.codemod_context import CodemodContext
-from codegen.runner.models.codemod import GroupingConfig
-from codegen.sdk.codebase.config import SessionOptions
+from codegen.git.repo_operator.repo_operator import RepoOperator
+from codegen.runner.models.codemod import BranchConfig, GroupingConfig
+from codegen.runner.sandbox.executor import SandboxExecutor
+from codegen.sdk.codebase.config import ProjectConfig, SessionOptions
 from codegen.sdk.codebase.flagging.code_flag import CodeFlag
 from codegen.sdk.codebase.flagging.groupers.enums import GroupBy
+from codegen.sdk.core.codebase import Codebase
 from codegen.shared.compilation.string_to_code import create_execute_function_from_codeblock
-
-if TYPE_CHECKING:
-    from codegen.runner.sandbox.executor import SandboxExecutor
+from codegen.shared.enums.programming_language import ProgrammingLanguage
 
 
 @pytest.mark.asyncio
@@ -228,3 +230,42 @@ async def test_find_flag_groups_with_max_prs(executor: SandboxExecutor):
         grouping_config=GroupingConfig(group_by=GroupBy.FILE, max_prs=0),
     )
     assert len(groups) == 0
+
+
+@pytest.mark.asyncio
+# Forks the flag group workers, see test_worker_pool.py
+@pytest.mark.filterwarnings("ignore:This process .* is multi-threaded:DeprecationWarning")
+async def test_execute_flag_groups_in_parallel(tmpdir):
+    op = RepoOperator.create_from_files(repo_path=f"{tmpdir}/test-repo", files={"a.py": "def a(): pass\n", "b.py": "def b(): pass\n", "c.py": "def c(): pass\n"}, bot_commit=True)
+    remote = GitCLI.init(f"{tmpdir}/remote.git", bare=True)
+    op.git_cli.create_remote("origin", remote.git_dir)
+    codebase = Codebase(projects=[ProjectConfig(repo_operator=op, programming_language=ProgrammingLanguage.PYTHON)])
+    executor = SandboxExecutor(codebase)
+    code_to_exec = create_execute_function_from_codeblock(
+        codeblock="""
+for function in codebase.functions:
+    if codebase.should_fix(codebase.flag_instance(function)):
+        function.rename(function.name.upper())
+"""
+    )
+    flags = await executor.find_flags(code_to_exec)
+    groups = await executor.find_flag_groups(flags, GroupingConfig(group_by=GroupBy.FILE))
+    branch_config = BranchConfig(branch_name="codegen-test", custom_base_branch=codebase.default_branch)
+
+    run_results, branches = await executor.execute_flag_groups("test", code_to_exec, groups, branch_config, num_workers=2)
+
+    # Results come back in the order of the groups, each with the changes of its group only, including the groups run by
+    # a worker after another group
+    assert [result.error for result in run_results] == [None, None, None]
+    for group, result, branch in zip(groups, run_results, branches):
+        filepath = group.segment
+        function_name = filepath.removesuffix(".py")
+        assert branch.head_ref == f"codegen-test-group-{group.id}"
+        assert f"+def {function_name.upper()}(): pass" in result.observation
+        head = remote.commit(branch.head_ref)
+        assert head.parents[0].hexsha == op.head_commit.hexsha
+        assert list(head.stats.files) == [filepath]
+        assert head.tree[filepath].data_stream.read().decode() == f"def {function_name.upper()}(): pass\n"
+    # The working tree and the graph are untouched
+    assert (Path(op.repo_path) / "a.py").read_text() == "def a(): pass\n"
+    assert codebase.get_function("a") is not None
@@ -0,0 +1,39 @@
+import asyncio
+import gc
+from pathlib import Path
+
+import pytest
+
+from codegen.runner.models.apis import GetDiffRequest
+from codegen.runner.models.codemod import Codemod
+from codegen.runner.sandbox.runner import SandboxRunner
+
+# The pool only forks while its own threads are stopped, but pytest-xdist (and faulthandler_timeout) run threads in the
+# test process, which python warns about on every fork
+pytestmark = pytest.mark.filterwarnings("ignore:This process .* is multi-threaded:DeprecationWarning")
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_runs_codemods_in_memory(runner: SandboxRunner):
+    await runner.warmup()
+    runner.start_workers(2)
+    # Only the workers keep the graph frozen
+    assert gc.get_freeze_count() == 0
+    try:
+        requests = [GetDiffRequest(codemod=Codemod(user_code=f'codebase.get_file("test.py").edit("a = {i}")')) for i in range(2, 6)]
+        responses = await asyncio.gather(*(runner.worker_pool.get_diff(request) for request in requests))
+        for i, response in enumerate(responses, start=2):
+            assert response.result.error is None
+            assert f"+a = {i}" in response.result.observation
+        # The working tree and the graph of the runner are untouched
+        assert (Path(runner.op.repo_path) / "test.py").read_text() == "a = 1"
+        assert runner.codebase.get_file("test.py").content == "a = 1"
+
+        # Workers are forked again from the current graph
+        async with runner.worker_pool.exclusive():
+            pass
+        assert gc.get_freeze_count() == 0
+        response = await runner.worker_pool.get_diff(requests[0])
+        assert "+a = 2" in response.result.observation
+    finally:
+        await runner.worker_pool.close()
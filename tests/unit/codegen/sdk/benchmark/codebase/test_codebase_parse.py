@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import pytest
+
+from codegen.git.repo_operator.repo_operator import RepoOperator
+from codegen.sdk.codebase.config import ProjectConfig
+from codegen.sdk.core.codebase import Codebase
+from codegen.sdk.tree_sitter_parser import parse_file
+from codegen.shared.enums.programming_language import ProgrammingLanguage
+
+NUM_FILES = 200
+
+
+def generate_files(num_files: int) -> dict[str, str]:
+    files = {}
+    for i in range(num_files):
+        imports = f"from module{i - 1} import Class{i - 1}, function{i - 1}\n\n" if i else ""
+        files[f"module{i}.py"] = f"""{imports}
+class Class{i}:
+    def __init__(self, value: int) -> None:
+        self.value = value
+
+    def method(self, other: "Class{i}") -> int:
+        return self.value + other.value
+
+
+def function{i}(values: list[int]) -> dict[str, int]:
+    result = {{"total": sum(values), "count": len(values)}}
+    for value in values:
+        result[str(value)] = Class{i}(value).method(Class{i}(value * 2))
+    return result
+"""
+    return files
+
+
+# Tree-sitter parsing is the only part of the parse stage that does not build Python objects tied to the graph. Its share
+# of the build bounds what moving it to other processes could gain.
+@pytest.mark.benchmark(group="codebase-parse", min_time=1, max_time=5, disable_gc=True)
+def test_tree_sitter_parse(tmp_path: Path, benchmark) -> None:
+    files = [(tmp_path / filepath, content) for filepath, content in generate_files(NUM_FILES).items()]
+    benchmark(lambda: [parse_file(filepath, content) for filepath, content in files])
+
+
+@pytest.mark.benchmark(group="codebase-parse", min_time=1, max_time=5, disable_gc=True)
+def test_codebase_build(tmp_path: Path, benchmark) -> None:
+    op = RepoOperator.create_from_files(repo_path=str(tmp_path), files=generate_files(NUM_FILES))
+    projects = [ProjectConfig(repo_operator=op, programming_language=ProgrammingLanguage.PYTHON)]
+    codebase = benchmark.pedantic(Codebase, kwargs={"projects": projects}, rounds=3)
+    assert len(codebase.files) == NUM_FILES
@@ -0,0 +1,105 @@
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from codegen.configs.models.codebase import CodebaseConfig
+from codegen.sdk.codebase.config import TestFlags
+from codegen.sdk.codebase.factory.get_session import get_codebase_session
+from codegen.sdk.core.codebase import Codebase
+from codegen.sdk.core.interfaces.editable import Editable
+from codegen.sdk.extensions.utils import cached_values
+
+NUM_FILES = 50
+
+
+def generate_files(num_files: int) -> dict[str, str]:
+    files = {}
+    for i in range(num_files):
+        imports = f"from file{i - 1} import Widget{i - 1}, helper{i - 1}\n" if i else ""
+        files[f"file{i}.py"] = f"""{imports}
+CONST_{i} = {i}
+
+def helper{i}(x, y=2):
+    total = x + y * CONST_{i}
+    for k in range(x):
+        total += str(k).count("a")
+    return total
+
+class Widget{i}:
+    def __init__(self, name):
+        self.name = name
+        self.items = [helper{i}(j) for j in range(4)]
+
+    def render(self, depth=0):
+        return {{"name": self.name, "n": len(self.items), "depth": depth}}
+"""
+    return files
+
+
+def get_nodes(codebase: Codebase) -> list[Editable]:
+    # isinstance would go through the overridden __class__ of some nodes
+    return [obj for obj in gc.get_objects() if issubclass(type(obj), Editable) and obj.ctx is codebase.ctx]
+
+
+def measure_nodes(tmp_path: Path) -> dict[str, float]:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        with get_codebase_session(tmpdir=tmp_path, files=generate_files(NUM_FILES), verify_output=False) as codebase:
+            for symbol in codebase.symbols:
+                symbol.usages
+            gc.collect()
+            traced, _ = tracemalloc.get_traced_memory()
+            nodes = get_nodes(codebase)
+            instance_bytes = 0
+            for node in nodes:
+                # Either the instance dict or the cache storage of slotted nodes, which is only created when needed
+                storage = node.__dict__ if hasattr(node, "__dict__") else getattr(node, "_cached_values", None)
+                instance_bytes += sys.getsizeof(node) + (sys.getsizeof(storage) if storage is not None else 0)
+            return {
+                "nodes": len(nodes),
+                "nodes_with_dict": sum(1 for node in nodes if hasattr(node, "__dict__")),
+                "instance_bytes_per_node": instance_bytes / len(nodes),
+                "traced_bytes_per_node": traced / len(nodes),
+            }
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.benchmark(group="sdk-benchmark", min_time=1, max_time=5, disable_gc=True)
+def test_node_memory(tmp_path, benchmark):
+    stats = benchmark.pedantic(measure_nodes, args=(tmp_path,), rounds=1)
+    benchmark.extra_info.update(stats)
+    assert stats["nodes_with_dict"] < stats["nodes"] / 2
+
+
+def test_expression_nodes_are_slotted(tmp_path):
+    with get_codebase_session(tmpdir=tmp_path, files={"a.py": "x = foo(1, [a.b, 'c'])\n"}) as codebase:
+        call = codebase.get_file("a.py").function_calls[0]
+        for node in (call, call.get_name(), call.args, call.args[0], call.args[0].value):
+            assert not hasattr(node, "__dict__"), type(node)
+        # Cached properties of slotted nodes are kept in their own storage
+        assert call.resolved_type_frames is call.resolved_type_frames
+        assert "resolved_type_frames" in cached_values(call)
+
+
+def count_nodes(tmp_path: Path, config: CodebaseConfig) -> int:
+    with get_codebase_session(tmpdir=tmp_path, files=generate_files(NUM_FILES), config=config, verify_output=False) as codebase:
+        return len(get_nodes(codebase))
+
+
+@pytest.mark.benchmark(group="sdk-benchmark", min_time=1, max_time=5, disable_gc=True)
+@pytest.mark.parametrize("lazy", [False, True], ids=["eager", "lazy"])
+@pytest.mark.parametrize("disable_graph", [False, True], ids=["graph", "parse"])
+def test_lazy_expressions(tmp_path, benchmark, lazy: bool, disable_graph: bool):
+    config = TestFlags.model_copy(update=dict(exp_lazy_expressions=lazy, disable_graph=disable_graph))
+    rounds = iter(range(1000))
+
+    def setup():
+        return ((tmp_path / f"repo{next(rounds)}", config), {})
+
+    nodes = benchmark.pedantic(count_nodes, setup=setup, rounds=3)
+    benchmark.extra_info["nodes"] = nodes
@@ -0,0 +1,40 @@
+from pathlib import Path
+
+import pytest
+
+from codegen.sdk.codebase.transaction_manager import TransactionManager
+from codegen.sdk.codebase.transactions import EditTransaction, InsertTransaction, RemoveTransaction
+
+
+class MockFile:
+    def __init__(self, path: Path, size: int) -> None:
+        self.content_bytes = b"x" * size
+        self.path = path
+
+    def write_bytes(self, content_bytes: bytes) -> None:
+        self.content_bytes = content_bytes
+
+
+def queue_and_commit(num_transactions: int, long_transaction: bool) -> None:
+    file = MockFile(Path("generated.py"), num_transactions * 20)
+    transaction_manager = TransactionManager()
+    if long_transaction:
+        # Spans as many bytes as the rest of the transactions, past the end of them
+        transaction_manager.add_transaction(EditTransaction(num_transactions * 10, num_transactions * 20, file, ""))
+    for i in range(num_transactions):
+        start = i * 10
+        transaction_manager.add_transaction(EditTransaction(start, start + 4, file, "y"))
+        transaction_manager.add_transaction(InsertTransaction(start + 5, file, "z"))
+        transaction_manager.add_transaction(RemoveTransaction(start + 6, start + 8, file))
+        # Re-adding an identical transaction is deduped
+        transaction_manager.add_transaction(EditTransaction(start, start + 4, file, "y"))
+    assert transaction_manager.get_num_transactions() == 3 * num_transactions + long_transaction
+    transaction_manager.commit({file.path})
+    assert file.content_bytes == b"yxzxxx" * num_transactions + b"x" * num_transactions * 10 * (not long_transaction)
+
+
+@pytest.mark.benchmark(group="transaction-manager", min_time=1, max_time=5, disable_gc=True)
+@pytest.mark.parametrize("long_transaction", [False, True])
+@pytest.mark.parametrize("num_transactions", [1_000, 10_000])
+def test_transaction_manager_scaling(num_transactions: int, long_transaction: bool, benchmark) -> None:
+    benchmark.pedantic(queue_and_commit, args=(num_transactions, long_transaction))
@@ -0,0 +1,59 @@
+import re
+import resource
+import subprocess
+import sys
+from collections import Counter
+
+import pytest
+
+# Upper bound for the CPU time spent importing each entrypoint in a fresh interpreter, in seconds. Eagerly importing the
+# optional subsystems (OpenAI, visualization, the GitHub client, the serving stack) costs several seconds, while the
+# lazily loaded entrypoints stay well under a second. CPU time is used rather than wall time so that loaded CI runners
+# and parallel test workers do not make the budget flaky.
+IMPORT_TIME_BUDGETS = {
+    "codegen": 0.5,
+    "codegen.cli.cli": 1.5,
+    "codegen.sdk.core.codebase": 1.5,
+}
+
+# Optional subsystems that are only loaded when they are first used
+LAZY_MODULES = ["codegen_api_client", "fastapi", "github", "modal", "networkx", "openai", "plotly", "sentry_sdk", "slack_sdk"]
+
+IMPORT_TIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+\d+ \|\s+(\S+)$")
+
+
+def measure_import(module: str) -> tuple[float, Counter[str]]:
+    """Imports `module` in a fresh interpreter with `-X importtime`.
+
+    Returns the CPU time of the interpreter in seconds and the time spent importing each top level package in
+    microseconds, as reported by `-X importtime`.
+    """
+    before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True)
+    after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu_time = after.ru_utime - before.ru_utime + after.ru_stime - before.ru_stime
+    packages = Counter()
+    for line in result.stderr.splitlines():
+        if match := IMPORT_TIME_LINE.match(line):
+            packages[match.group(2).split(".")[0]] += int(match.group(1))
+    return cpu_time, packages
+
+
+@pytest.mark.parametrize("module", IMPORT_TIME_BUDGETS)
+def test_import_time_budget(module: str) -> None:
+    cpu_time, packages = min((measure_import(module) for _ in range(3)), key=lambda measurement: measurement[0])
+    slowest = ", ".join(f"{name} ({us / 1000:.0f}ms)" for name, us in packages.most_common(5))
+    assert cpu_time < IMPORT_TIME_BUDGETS[module], f"Importing {module} took {cpu_time:.2f}s of CPU time, budget is {IMPORT_TIME_BUDGETS[module]}s. Slowest imports: {slowest}"
+
+
+@pytest.mark.parametrize("module", IMPORT_TIME_BUDGETS)
+def test_optional_dependencies_are_lazy(module: str) -> None:
+    code = f"import sys, {module}; print(' '.join(name for name in {LAZY_MODULES!r} if name in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.split() == []
+
+
+def test_lazy_exports() -> None:
+    code = "import sys, codegen; assert 'codegen.sdk.core.codebase' not in sys.modules; from codegen import Codebase, CodegenApp; print(Codebase.__module__, CodegenApp.__module__)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["codegen.sdk.core.codebase", "codegen.extensions.events.codegen_app"]
@@ -2,9 +2,42 @@
 
 import itertools
 
+import pytest
+
+from codegen.sdk.codebase import codebase_context
 from codegen.sdk.codebase.codebase_context import CodebaseContext
+from codegen.sdk.codebase.config import TestFlags
 from codegen.sdk.codebase.factory.get_session import get_codebase_session
+from codegen.sdk.core.detached_symbols.function_call import FunctionCall
+from codegen.sdk.core.expressions.string import String
 from codegen.sdk.enums import EdgeType
+from codegen.sdk.extensions.utils import cache_stats
+from codegen.shared.enums.programming_language import ProgrammingLanguage
+
+# language=python
+FILES = {
+    "a.py": "from b import bar\n\ndef foo():\n    return bar() + bar()\n",
+    "b.py": "from c import Baz\n\ndef bar():\n    return Baz()\n",
+    "c.py": "class Baz:\n    def run(self):\n        pass\n",
+    "d.py": "from a import foo\nfrom c import Baz as Qux\n\nfoo()\nQux().run()\n",
+}
+
+
+def graph_state(codebase) -> tuple[list, dict, dict]:
+    """The edges of the graph, and the usages and dependencies of every symbol and import.
+
+    Nodes are identified by their location, since node ids depend on the order files are parsed in.
+    """
+
+    def key(node):
+        return type(node).__name__, node.filepath, node.start_byte, node.end_byte
+
+    # Read first, as it completes a lazy graph
+    edges = sorted((key(codebase.ctx.get_node(u)), key(codebase.ctx.get_node(v)), edge.type) for u, v, edge in codebase.ctx.edges)
+    symbols = [*codebase.symbols, *codebase.imports]
+    usages = {key(symbol): sorted((key(usage.match), key(usage.usage_symbol), usage.usage_type, usage.kind) for usage in symbol.usages) for symbol in symbols}
+    dependencies = {key(symbol): sorted(key(dependency) for dependency in symbol.dependencies) for symbol in symbols}
+    return edges, usages, dependencies
 
 
 def test_codebase_with_wrapper(tmpdir) -> None:
@@ -95,3 +128,150 @@ class MySubClass(MyClass):
         assert len(import_resolution_edges) == 4
         assert len(file_contains_node_edges) == 14
         assert len(symbol_usage_edges) == 6
+
+
+def test_codebase_dependency_timings(tmp_path, monkeypatch) -> None:
+    messages = []
+    monkeypatch.setattr(codebase_context.logger, "info", lambda msg, *args, **kwargs: messages.append(msg))
+    with get_codebase_session(tmpdir=tmp_path, files=FILES) as codebase:
+        timings = codebase.ctx.dependency_timings
+        assert set(timings) == set(FILES)
+        filepath, elapsed = max(timings.items(), key=lambda item: item[1])
+        assert any(msg.startswith(f"> Slowest files to compute dependencies for: {filepath} ({elapsed:.3f}s)") for msg in messages)
+
+
+def test_codebase_batched_dependencies(tmp_path, monkeypatch) -> None:
+    def snapshot(codebase):
+        return list(codebase.ctx._graph.weighted_edge_list()), graph_state(codebase)
+
+    with get_codebase_session(tmpdir=tmp_path / "batched", files=FILES) as codebase:
+        batched = snapshot(codebase)
+
+    def recompute_each(self, nodes, task):
+        for node in nodes:
+            node.recompute(incremental=False)
+
+    monkeypatch.setattr(CodebaseContext, "_compute_dependencies_batched", recompute_each)
+    with get_codebase_session(tmpdir=tmp_path / "per_node", files=FILES) as codebase:
+        # The same edges, added in the same order
+        assert snapshot(codebase) == batched
+
+
+def test_codebase_compact_usage_edges(tmp_path) -> None:
+    def edit_and_snapshot(codebase):
+        before = graph_state(codebase)
+        codebase.get_file("b.py").get_function("bar").rename("bar2")
+        codebase.get_file("d.py").edit("from a import foo\n\nfoo()\n")
+        codebase.commit()
+        return before, graph_state(codebase)
+
+    with get_codebase_session(tmpdir=tmp_path / "graph", files=FILES) as codebase:
+        expected = edit_and_snapshot(codebase)
+    config = TestFlags.model_copy(update=dict(compact_usage_edges=True))
+    with get_codebase_session(tmpdir=tmp_path / "compact", files=FILES, config=config) as codebase:
+        assert not any(edge.type == EdgeType.SYMBOL_USAGE for _, _, edge in codebase.ctx._graph.weighted_edge_list())
+        assert edit_and_snapshot(codebase) == expected
+        assert len(codebase.ctx.usage_edges) == len([edge for edge in codebase.ctx.edges if edge[2].type == EdgeType.SYMBOL_USAGE])
+        # Raises if the usage edges do not match the ones the codebase started with
+        codebase.reset()
+        assert len(codebase.ctx.usage_edges.rows()) == len(codebase.ctx.old_usage_edges)
+
+
+def test_codebase_lazy_graph(tmp_path) -> None:
+    # language=python
+    files = {**FILES, "e.py": "def unrelated():\n    pass\n"}
+
+    def snapshot(codebase):
+        baz = codebase.get_file("c.py").get_class("Baz")
+        usages = sorted((usage.match.source, usage.usage_symbol.name, usage.usage_type) for usage in baz.usages)
+        dependencies = [dependency.name for dependency in codebase.get_file("a.py").get_function("foo").dependencies]
+        return usages, dependencies
+
+    with get_codebase_session(tmpdir=tmp_path / "graph", files=files) as codebase:
+        expected = snapshot(codebase), graph_state(codebase)
+    config = TestFlags.model_copy(update=dict(exp_lazy_graph=True))
+    with get_codebase_session(tmpdir=tmp_path / "lazy", files=files, config=config, verify_input=False, verify_output=False) as codebase:
+        ctx = codebase.ctx
+        assert not ctx.filepath_idx
+        codebase.get_file("c.py")
+        assert set(ctx.filepath_idx) == {"c.py"}
+        lazy = snapshot(codebase)
+        # Only the files that may use Baz (and the files they import) were parsed
+        assert "e.py" not in ctx.filepath_idx
+        # Reading all the edges completes the graph
+        assert (lazy, graph_state(codebase)) == expected
+        assert ctx.lazy_graph is None
+        assert len(codebase.files) == len(files)
+
+
+@pytest.mark.parametrize(
+    "language, files",
+    [
+        (
+            ProgrammingLanguage.PYTHON,
+            {
+                "a.py": "from b import bar\n\ndef foo(x='a', *args):\n    return {'k': bar(x) + bar(*args), 'f': bar(f'{x}')}\n",
+                "b.py": 'from c import Baz\n\ndef bar(y):\n    return [Baz(), lambda: Baz().run(y), "s" * 2]\n',
+                "c.py": "class Baz:\n    def run(self):\n        return not (self or 1.5)\n",
+            },
+        ),
+        (
+            ProgrammingLanguage.TYPESCRIPT,
+            {
+                "d.ts": "import { e } from './e';\n\nexport const f = () => ({ a: e(`x${e()}`), b: [1, 'two'] });\n",
+                "e.ts": "export function e(x?: string) {\n    return x ?? class { run() { return e(); } };\n}\n",
+            },
+        ),
+    ],
+    ids=["python", "typescript"],
+)
+def test_codebase_lazy_expressions(tmp_path, language, files) -> None:
+    def string_args(codebase):
+        return [arg.value for file in codebase.files for call in file.function_calls for arg in call.args if isinstance(arg.value, String)]
+
+    def snapshot(codebase):
+        strings = string_args(codebase)
+        parsed = [string._content_nodes is not None for string in strings]
+        return (graph_state(codebase), [string.content_nodes.source for string in strings]), parsed
+
+    with get_codebase_session(tmpdir=tmp_path / "eager", files=files, programming_language=language) as codebase:
+        expected, parsed = snapshot(codebase)
+        assert parsed and all(parsed)
+    config = TestFlags.model_copy(update=dict(exp_lazy_expressions=True))
+    with get_codebase_session(tmpdir=tmp_path / "lazy", files=files, programming_language=language, config=config) as codebase:
+        lazy, parsed = snapshot(codebase)
+        # String fragments are only parsed when they are accessed
+        assert not any(parsed)
+        assert lazy == expected
+
+
+def test_codebase_lazy_call_arguments(tmp_path) -> None:
+    files = {"a.ts": "foo(bar(1), 'x');\nfoo(() => bar(2));\n"}
+    config = TestFlags.model_copy(update=dict(exp_lazy_expressions=True, disable_graph=True, full_range_index=True))
+    with get_codebase_session(tmpdir=tmp_path, files=files, programming_language=ProgrammingLanguage.TYPESCRIPT, config=config) as codebase:
+        calls = {call.source: call for call in codebase.files[0]._range_index.nodes if isinstance(call, FunctionCall)}
+        # Arguments containing a symbol are parsed up front
+        assert {source: call._arg_list is not None for source, call in calls.items()} == {"foo(bar(1), 'x')": False, "foo(() => bar(2))": True, "bar(2)": False}
+        assert [arg.source for arg in calls["foo(bar(1), 'x')"].args] == ["bar(1)", "'x'"]
+
+
+def test_codebase_sync_uncaches_changed_files(tmpdir) -> None:
+    files = {
+        "a.py": "from b import bar\n\ndef foo():\n    return bar()\n",
+        "b.py": "def bar():\n    pass\n",
+        "c.py": "def baz():\n    pass\n",
+    }
+    with get_codebase_session(tmpdir=tmpdir, files=files) as codebase:
+        a, b, c = (codebase.get_file(filepath) for filepath in files)
+        for file in (a, b, c):
+            assert file.valid_import_names
+        stats = cache_stats()
+
+        b.get_function("bar").rename("bar2")
+        codebase.commit()
+
+        # Files depending on the changed file are recomputed, unrelated files keep their caches
+        assert "valid_import_names" in c.__dict__
+        assert "bar2" in b.valid_import_names
+        assert a.imports[0].imported_symbol.name == "bar2"
+        assert cache_stats()["invalidations"] > stats["invalidations"]
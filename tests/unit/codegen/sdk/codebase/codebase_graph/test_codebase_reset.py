@@ -1,5 +1,9 @@
+from pathlib import Path
+
 import pytest
 
+from codegen.sdk.codebase.diff_lite import ChangeType, DiffLite
+from codegen.sdk.codebase.factory.get_session import get_codebase_session
 from codegen.sdk.core.codebase import Codebase
 
 
@@ -344,3 +348,47 @@ def test_codebase_reset_complex_changes(codebase: Codebase, assert_expected):
 
     codebase.reset()
     assert_expected(codebase)
+
+
+def test_codebase_reset_restores_checkpoint(tmpdir, monkeypatch):
+    files = {"a.py": "def f():\n    pass\n", "b.py": "from a import f\n\n\ndef g():\n    f()\n", "c.py": "x = 1\n"}
+    with get_codebase_session(tmpdir=tmpdir, files=files) as codebase:
+        ctx = codebase.ctx
+        file_b = codebase.get_file("b.py")
+        g = file_b.get_function("g")
+        nodes, edges = len(ctx.nodes), len(ctx.edges)
+        # Nothing is reverted by reparsing
+        monkeypatch.setattr(ctx, "_revert_diffs", lambda diffs: pytest.fail("diffs were reverted"))
+
+        g.rename("h")
+        codebase.get_file("c.py").remove()
+        codebase.create_file("d.py", "from b import h\n")
+        codebase.commit()
+        assert codebase.get_file("b.py").get_function("g") is None
+        codebase.reset()
+
+        assert codebase.get_file("b.py") is file_b
+        assert file_b.get_function("g") is g
+        assert g.dependencies[0].name == "f"
+        assert [usage.match.filepath for usage in codebase.get_function("f").usages] == ["b.py", "b.py"]
+        assert codebase.get_file("c.py").get_global_var("x") is not None
+        assert codebase.get_file("d.py", optional=True) is None
+        assert (len(ctx.nodes), len(ctx.edges)) == (nodes, edges)
+
+        # The checkpoint is taken again, for the next reset
+        g.rename("h")
+        codebase.commit()
+        codebase.reset()
+        assert file_b.get_function("g") is g
+
+
+def test_codebase_reset_checkpoint_keeps_external_syncs(tmpdir):
+    with get_codebase_session(tmpdir=tmpdir, files={"a.py": "x = 1\n", "b.py": "y = 2\n"}) as codebase:
+        # Synced without a transaction, so it is kept like any change made outside of the codebase
+        codebase.get_file("a.py").path.write_text("x = 3\n")
+        codebase.ctx.apply_diffs([DiffLite(ChangeType.Modified, Path("a.py"))])
+        codebase.get_file("b.py").edit("y = 4\n")
+        codebase.commit()
+        codebase.reset()
+        assert codebase.get_file("a.py").get_global_var("x").value.source == "3"
+        assert codebase.get_file("b.py").get_global_var("y").value.source == "2"
@@ -0,0 +1,80 @@
+import queue
+import shutil
+from pathlib import Path
+
+from watchfiles import Change
+
+from codegen.sdk.codebase.diff_lite import ChangeType, DiffLite
+from codegen.sdk.codebase.factory.get_session import get_codebase_session
+from codegen.sdk.codebase.watcher import CodebaseWatcher
+
+
+def test_watcher_diffs(tmpdir) -> None:
+    files = {"a.py": "x = 1\n", "b.py": "y = 2\n", "pkg/c.py": "z = 3\n", "pkg/d.py": "", ".gitignore": "ignored/\n"}
+    with get_codebase_session(tmpdir=tmpdir, files=files) as codebase:
+        root = Path(codebase.repo_path)
+        watcher = CodebaseWatcher(codebase.ctx)
+        (root / "a.py").write_text("x = 10\n")
+        (root / "b.py").unlink()
+        (root / "new.py").write_text("def f(): pass\n")
+        (root / "notes.txt").write_text("notes")
+        (root / "ignored").mkdir()
+        (root / "ignored" / "e.py").write_text("")
+        shutil.rmtree(root / "pkg")
+        changes = {
+            (Change.modified, str(root / "a.py")),
+            (Change.deleted, str(root / "b.py")),
+            # A file created then written is added once
+            (Change.added, str(root / "new.py")),
+            (Change.modified, str(root / "new.py")),
+            (Change.added, str(root / "notes.txt")),
+            (Change.added, str(root / "ignored" / "e.py")),
+            (Change.modified, str(root)),
+            # A directory removed as a whole removes its files
+            (Change.deleted, str(root / "pkg")),
+        }
+        assert sorted(watcher.get_diffs(changes)) == sorted(
+            [
+                DiffLite(ChangeType.Modified, Path("a.py")),
+                DiffLite(ChangeType.Removed, Path("b.py")),
+                DiffLite(ChangeType.Added, Path("new.py")),
+                DiffLite(ChangeType.Removed, Path("pkg/c.py")),
+                DiffLite(ChangeType.Removed, Path("pkg/d.py")),
+            ]
+        )
+        watcher.apply_changes(changes)
+        assert codebase.get_file("a.py").get_global_var("x").value.source == "10"
+        assert codebase.get_file("new.py").get_function("f") is not None
+        assert sorted(file.filepath for file in codebase.files) == ["a.py", "new.py"]
+        assert codebase.get_directory("pkg", optional=True) is None
+
+
+def test_watcher_thread(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files={"a.py": "def f(): pass\n"}) as codebase:
+        root = Path(codebase.repo_path)
+        synced = queue.Queue()
+        with CodebaseWatcher(codebase.ctx, debounce=50, on_sync=synced.put) as watcher:
+            assert watcher.is_running
+            (root / "b.py").write_text("from a import f\n\nf()\n")
+            diffs = synced.get(timeout=30)
+            assert DiffLite(ChangeType.Added, Path("b.py")) in diffs
+            with watcher.paused():
+                assert {usage.match.filepath for usage in codebase.get_function("f").usages} == {"b.py"}
+        assert not watcher.is_running
+
+
+def test_watcher_skips_own_writes(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files={"a.py": "def f(): pass\n", "b.py": "def g(): pass\n"}) as codebase:
+        root = Path(codebase.repo_path)
+        watcher = CodebaseWatcher(codebase.ctx)
+        codebase.get_function("f").rename("h")
+        codebase.get_file("b.py").remove()
+        codebase.commit()
+        changes = {(Change.modified, str(root / "a.py")), (Change.deleted, str(root / "b.py"))}
+        assert watcher.get_diffs(changes) == []
+
+        # Later changes made outside of the codebase are applied
+        (root / "a.py").write_text("def f2(): pass\n")
+        (root / "b.py").write_text("def g(): pass\n")
+        changes = {(Change.modified, str(root / "a.py")), (Change.added, str(root / "b.py"))}
+        assert sorted(watcher.get_diffs(changes)) == [DiffLite(ChangeType.Modified, Path("a.py")), DiffLite(ChangeType.Added, Path("b.py"))]
@@ -0,0 +1,186 @@
+from pathlib import Path
+
+import pytest
+
+import codegen.sdk.codebase.codebase_context
+from codegen.git.repo_operator.repo_operator import RepoOperator
+from codegen.git.schemas.repo_config import RepoConfig
+from codegen.sdk.codebase.config import ProjectConfig, TestFlags
+from codegen.sdk.codebase.snapshot import get_snapshot_path
+from codegen.sdk.core.codebase import Codebase
+from codegen.shared.enums.programming_language import ProgrammingLanguage
+
+PY_FILES = {
+    "a.py": """\
+from b import bar, Baz
+import os
+
+def foo(x: Baz = Baz()) -> Baz:
+    y = bar(x, os.path.join('a'))
+    return [bar(i) for i in y]
+
+class Q(Baz):
+    z: Baz = bar()
+
+    def m(self):
+        return self.z.run()
+""",
+    "b.py": """\
+class Baz:
+    def run(self):
+        pass
+
+def bar(*a):
+    return Baz()
+""",
+    "c.py": """\
+from a import foo, Q
+
+foo()
+Q().m()
+""",
+}
+PY_DECORATED_FILES = {
+    "a.py": """\
+import functools
+from b import deco, Baz
+from b import register as reg
+
+@deco
+def foo():
+    @functools.wraps(foo)
+    def inner(x):
+        return Baz(x)
+    return inner
+
+@reg("q")
+class Q(Baz):
+    @property
+    @deco
+    def p(self):
+        return foo()
+
+    @staticmethod
+    def s():
+        def nested():
+            return Q.s()
+        return nested
+""",
+    "b.py": """\
+def deco(f):
+    return f
+
+def register(name):
+    return deco
+
+class Baz:
+    def __init__(self, x=None):
+        self.x = x
+""",
+    "c.py": """\
+from a import foo, Q
+from b import deco
+
+@deco
+def bar():
+    return foo()(Q().p)
+""",
+}
+TS_FILES = {
+    "a.ts": """\
+import { bar, Baz } from './b';
+import * as os from 'os';
+export function foo(x: Baz = new Baz()): Baz {
+  const y = bar(x, os.join('a'));
+  return y;
+}
+export class Q extends Baz {
+  z: Baz = bar();
+  m() { return this.z.run(); }
+}
+type T = Baz | Q;
+export { foo as f2 };
+""",
+    "b.ts": """\
+export class Baz {
+  run() {}
+}
+export function bar(...a: any[]): Baz {
+  return new Baz();
+}
+""",
+}
+
+
+def get_codebase(repo_path: Path, programming_language: ProgrammingLanguage, snapshot_dir: Path) -> Codebase:
+    op = RepoOperator(repo_config=RepoConfig.from_repo_path(str(repo_path)))
+    config = TestFlags.model_copy(update=dict(graph_snapshot_dir=str(snapshot_dir)))
+    return Codebase(projects=[ProjectConfig(repo_operator=op, programming_language=programming_language)], config=config)
+
+
+def graph_state(codebase: Codebase) -> tuple[set, set]:
+    def key(node):
+        return type(node).__name__, node.filepath, node.start_byte, node.end_byte
+
+    nodes = {key(node) for node in codebase.ctx.nodes}
+    edges = set()
+    for u, v, edge in codebase.ctx.edges:
+        usage = None
+        if edge.usage is not None:
+            imported_by = edge.usage.imported_by and key(edge.usage.imported_by)
+            usage = (key(edge.usage.match), key(edge.usage.match.parent_statement), key(edge.usage.usage_symbol), imported_by, edge.usage.usage_type, edge.usage.kind)
+        edges.add((key(codebase.ctx.get_node(u)), key(codebase.ctx.get_node(v)), edge.type, usage))
+    return nodes, edges
+
+
+@pytest.fixture
+def restores(monkeypatch) -> list[bool]:
+    """Results of the snapshot restores, which fall back to building the graph on failure"""
+    results = []
+
+    def restore_graph_snapshot(*args):
+        results.append(restore(*args))
+        return results[-1]
+
+    restore = codegen.sdk.codebase.codebase_context.restore_graph_snapshot
+    monkeypatch.setattr(codegen.sdk.codebase.codebase_context, "restore_graph_snapshot", restore_graph_snapshot)
+    return results
+
+
+@pytest.mark.parametrize(
+    "programming_language, files",
+    [(ProgrammingLanguage.PYTHON, PY_FILES), (ProgrammingLanguage.PYTHON, PY_DECORATED_FILES), (ProgrammingLanguage.TYPESCRIPT, TS_FILES)],
+    ids=["python", "python-decorated", "typescript"],
+)
+def test_graph_snapshot_restore(tmp_path, programming_language, files, restores) -> None:
+    RepoOperator.create_from_files(repo_path=str(tmp_path / "repo"), files=files)
+    codebase = get_codebase(tmp_path / "repo", programming_language, tmp_path / "snapshots")
+    expected = graph_state(codebase)
+    assert get_snapshot_path(codebase.ctx, codebase.ctx.synced_commit.hexsha).exists()
+
+    restored = get_codebase(tmp_path / "repo", programming_language, tmp_path / "snapshots")
+    assert restores == [False, True]
+    assert graph_state(restored) == expected
+    for symbol in codebase.symbols:
+        restored_symbol = restored.get_symbol(symbol.name)
+        assert [usage.match.source for usage in restored_symbol.usages] == [usage.match.source for usage in symbol.usages]
+        assert [dep.name for dep in restored_symbol.dependencies] == [dep.name for dep in symbol.dependencies]
+
+
+def test_graph_snapshot_apply_diffs(tmp_path, restores) -> None:
+    repo_path = tmp_path / "repo"
+    op = RepoOperator.create_from_files(repo_path=str(repo_path), files=PY_FILES)
+    get_codebase(repo_path, ProgrammingLanguage.PYTHON, tmp_path / "snapshots")
+
+    # Move HEAD past the snapshot and leave uncommitted changes on top
+    (repo_path / "b.py").write_text("class Baz:\n    def run(self):\n        pass\n\ndef bar2(*a):\n    return Baz()\n")
+    (repo_path / "d.py").write_text("from b import bar2\n\nbar2()\n")
+    op.stage_and_commit_all_changes("change b")
+    (repo_path / "a.py").write_text("from b import bar2 as bar, Baz\n\ndef foo() -> Baz:\n    return bar()\n")
+    (repo_path / "c.py").unlink()
+    (repo_path / "e.py").write_text("from a import foo\n\nfoo()\n")
+
+    restored = get_codebase(repo_path, ProgrammingLanguage.PYTHON, tmp_path / "snapshots")
+    assert restores == [False, True]
+    fresh = get_codebase(repo_path, ProgrammingLanguage.PYTHON, tmp_path / "other_snapshots")
+    assert graph_state(restored) == graph_state(fresh)
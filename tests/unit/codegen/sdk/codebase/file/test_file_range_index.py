@@ -0,0 +1,74 @@
+import random
+
+from codegen.sdk.codebase.factory.get_session import get_codebase_session
+from codegen.sdk.codebase.range_index import SortedIntervals
+
+SOURCE = """
+import os
+
+def foo(a, b=1):
+    x = a + b * 2
+    if x > 3:
+        return os.path.join("a", str(x))
+    return [a, b, {"k": x}]
+
+class Bar:
+    def baz(self, y):
+        return foo(y, b=self.z)
+"""
+
+
+class Node:
+    def __init__(self, start_byte: int, end_byte: int) -> None:
+        self.start_byte = start_byte
+        self.end_byte = end_byte
+
+
+def test_sorted_intervals_match_brute_force() -> None:
+    rng = random.Random(0)
+    nodes = []
+    for _ in range(300):
+        start = rng.randrange(0, 500)
+        nodes.append(Node(start, start + rng.randrange(0, 60)))
+    intervals = SortedIntervals(nodes)
+    for _ in range(300):
+        start = rng.randrange(0, 560)
+        end = start + rng.randrange(0, 30)
+        assert set(map(id, intervals.containing(start, end))) == {id(n) for n in nodes if n.start_byte <= start and n.end_byte >= end}
+        assert set(map(id, intervals.overlapping(start, end))) == {id(n) for n in nodes if n.start_byte < end and n.end_byte > start}
+        assert set(map(id, intervals.inside(start, end))) == {id(n) for n in nodes if n.start_byte >= start and n.end_byte <= end}
+
+
+def test_file_byte_range_queries(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files={"test.py": SOURCE}) as codebase:
+        file = codebase.get_file("test.py")
+        nodes = list(file._range_index.nodes)
+        for byte in range(len(SOURCE) + 1):
+            containing = [n for n in nodes if n.start_byte <= byte <= n.end_byte]
+            expected = min(containing, key=lambda n: n.end_byte - n.start_byte) if containing else None
+            assert file.find_node_at_byte(byte) is expected
+        start, end = SOURCE.index("x = a"), SOURCE.index("class Bar")
+        assert {id(n) for n in file.find_overlapping_byte_range(start, end)} == {id(n) for n in nodes if n.start_byte < end and n.end_byte > start}
+        inside = file.find_within_byte_range(start, end)
+        assert {id(n) for n in inside} == {id(n) for n in nodes if n.start_byte >= start and n.end_byte <= end}
+        assert [n.start_byte for n in inside] == sorted(n.start_byte for n in inside)
+
+
+def test_file_range_index_updates_after_edit(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files={"test.py": SOURCE}) as codebase:
+        file = codebase.get_file("test.py")
+        assert file.find_node_at_byte(SOURCE.index("baz") + 1).source == "baz"
+        file.get_class("Bar").get_method("baz").rename("qux")
+        codebase.commit()
+        file = codebase.get_file("test.py")
+        assert file.find_node_at_byte(file.content.index("qux") + 1).source == "qux"
+
+
+def test_codebase_span_queries(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files={"test.py": SOURCE}) as codebase:
+        file = codebase.get_file("test.py")
+        call = file.get_function("foo").function_calls[0]
+        span = call.span
+        assert codebase.find_innermost_by_span(span).source == call.source
+        assert any(n.source == call.source for n in codebase.find_within_span(span))
+        assert all(n.start_byte < call.end_byte and n.end_byte > call.start_byte for n in codebase.find_overlapping_span(span))
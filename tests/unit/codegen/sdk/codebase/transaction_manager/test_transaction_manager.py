@@ -1,3 +1,4 @@
+import random
 from os import PathLike
 from pathlib import Path
 
@@ -5,8 +6,9 @@ from codegen.sdk.codebase.factory.get_session import get_codebase_session
 from codegen.sdk.codebase.transaction_manager import (
     TransactionError,
     TransactionManager,
+    TransactionQueue,
 )
-from codegen.sdk.codebase.transactions import EditTransaction, InsertTransaction, RemoveTransaction
+from codegen.sdk.codebase.transactions import EditTransaction, InsertTransaction, RemoveTransaction, Transaction, apply_transactions
 
 
 class MockFile:
@@ -665,3 +667,76 @@ def content():
         assert queue[2].new_content == "Ok"
         assert isinstance(queue[3], RemoveTransaction)
         assert isinstance(queue[4], InsertTransaction)
+
+
+class WritableMockFile(MockFile):
+    def write_bytes(self, content_bytes: bytes) -> None:
+        self.content_bytes = content_bytes
+
+
+def test_apply_transactions_matches_sequential_execution(tmpdir) -> None:
+    random.seed(0)
+    for _ in range(200):
+        file = WritableMockFile(Path("filename"))
+        transactions = []
+        for _ in range(random.randint(1, 10)):
+            start = random.randint(0, 100)
+            end = min(100, start + random.randint(0, 10))
+            match random.randint(0, 2):
+                case 0:
+                    transactions.append(RemoveTransaction(start, end, file))
+                case 1:
+                    transactions.append(EditTransaction(start, end, file, "y" * random.randint(0, 5)))
+                case 2:
+                    transactions.append(InsertTransaction(start, file, "z" * random.randint(1, 5)))
+        transactions.sort(key=Transaction._to_sort_key)
+
+        result = apply_transactions(file.content_bytes, transactions)
+        for transaction in transactions:
+            transaction.execute()
+        assert result == file.content_bytes
+
+
+def test_commit_single_write(tmpdir) -> None:
+    file = WritableMockFile(Path("filename"))
+    writes = []
+    file.write_bytes = writes.append
+    transaction_manager = TransactionManager()
+    for i in range(0, 100, 10):
+        transaction_manager.add_transaction(EditTransaction(i, i + 5, file, "y"))
+        transaction_manager.add_transaction(InsertTransaction(i + 7, file, "z"))
+
+    diffs = transaction_manager.commit({file.path})
+    assert len(diffs) == 1
+    assert diffs[0].old_content == b"x" * 100
+    assert writes == [b"yxxzxxx" * 10]
+
+
+def test_transaction_queue_matches_list(tmpdir) -> None:
+    random.seed(0)
+    file = MockFile("filename")
+    queue = TransactionQueue()
+    transactions = []
+    for _ in range(500):
+        start = random.randint(0, 100)
+        # Mostly short transactions, with an occasional long one
+        end = min(100, start + random.choice([0, 1, 2, 5, 10, 80]))
+        transaction = RemoveTransaction(start, end, file) if start != end else InsertTransaction(start, file, "z")
+        match random.randint(0, 3):
+            case 0 if transactions:
+                index = random.randrange(len(transactions))
+                assert queue.pop(index) is transactions.pop(index)
+            case 1:
+                index = random.randint(0, len(transactions))
+                queue.insert(index, transaction)
+                transactions.insert(index, transaction)
+            case _:
+                queue.append(transaction)
+                transactions.append(transaction)
+        assert list(queue) == transactions
+
+        start = random.randint(0, 100)
+        end = min(100, start + random.randint(0, 20))
+        assert set(queue.overlapping(start, end)) == {t for t in transactions if start < t.end_byte and end > t.start_byte}
+        assert queue.containing(start, end) is next((t for t in transactions if t.start_byte <= start and end <= t.end_byte), None)
+        assert set(queue.starting_at(start)) == {t for t in transactions if t.start_byte == start}
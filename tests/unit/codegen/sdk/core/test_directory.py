@@ -1,5 +1,7 @@
 from pathlib import Path
 
+import pytest
+
 from codegen.sdk.codebase.factory.get_session import get_codebase_session
 from codegen.shared.enums.programming_language import ProgrammingLanguage
 
@@ -208,3 +210,58 @@ def test_unicode_in_filename(tmpdir) -> None:
         file = codebase.get_file("test/我很喜欢冰激淋/test-file 12'3_🍦.py")
         assert file is not None
         assert file.content == "print('Hello, world!')"
+
+
+def get_tree(codebase) -> dict[str, tuple[list[str], list[str]]]:
+    return {directory.dirpath: (list(directory._files), list(directory._subdirectories)) for directory in codebase.ctx.directories.values()}
+
+
+def test_directory_tree_incremental(tmpdir, monkeypatch) -> None:
+    files = {"a/one.py": "", "a/b/two.py": "", "a/b/c/three.py": "", "docs/readme.md": "", "top.py": ""}
+    with get_codebase_session(tmpdir=tmpdir, files=files) as codebase:
+        ctx = codebase.ctx
+        rebuild = ctx.build_directory_tree
+        # Syncs must only update the affected directories
+        monkeypatch.setattr(ctx, "build_directory_tree", lambda: pytest.fail("directory tree was rebuilt"))
+
+        def check() -> None:
+            tree, index = get_tree(codebase), list(ctx._directory_file_index)
+            rebuild()
+            assert tree == get_tree(codebase)
+            assert index == ctx._directory_file_index
+
+        codebase.create_file("a/b/new.py", "x = 1\n")
+        codebase.create_file("e/f/notes.txt", "notes")
+        codebase.commit()
+        assert "new.py" in codebase.get_directory("a/b").file_names
+        assert codebase.get_directory("e/f").file_names == ["notes.txt"]
+        check()
+
+        codebase.get_file("a/b/c/three.py").remove()
+        codebase.commit()
+        assert codebase.get_directory("a/b/c", optional=True) is None
+        assert "c" not in codebase.get_directory("a/b").item_names
+        check()
+
+        codebase.get_file("top.py").update_filepath("g/h/top.py")
+        codebase.commit()
+        assert "top.py" not in codebase.get_directory("").file_names
+        assert codebase.get_directory("g/h").file_names == ["top.py"]
+        check()
+
+
+def test_files_recursive(tmpdir) -> None:
+    files = {"x.py": "", "a/x.py": "", "a/b/x.py": "", "a-b/x.py": "", "a/y.ts": "", "a/b/a.py": "", "B/x.py": "", "a/readme.md": ""}
+
+    def files_recursive(directory, extensions):
+        # The recursive walk that the sorted index replaces
+        result = list(directory.files(extensions=extensions))
+        for subdirectory in directory.subdirectories:
+            result.extend(files_recursive(subdirectory, extensions))
+        return sorted(result, key=lambda file: file.name)
+
+    with get_codebase_session(tmpdir=tmpdir, files=files) as codebase:
+        for directory in codebase.directories:
+            for extensions in (None, "*", [".py"], [".md"]):
+                assert directory.files(extensions=extensions, recursive=True) == files_recursive(directory, extensions)
+        assert [file.filepath for file in codebase.get_directory("a").files(extensions="*", recursive=True)] == ["a/b/a.py", "a/readme.md", "a/x.py", "a/b/x.py", "a/y.ts"]
@@ -1,5 +1,9 @@
+import os
+import time
+
 import pytest
 
+from codegen.sdk.codebase.io.content_buffer import ContentBuffer
 from codegen.sdk.codebase.io.file_io import BadWriteError, FileIO
 
 
@@ -28,6 +32,89 @@ def test_read_bytes_nonexistent_file(file_io, tmp_path):
     assert file_io.read_bytes(test_file) == test_content
 
 
+def write_old_file(path, content: bytes, age: int = 10) -> None:
+    """Writes a file with an mtime `age` seconds in the past, so it is outside the racy window"""
+    path.write_bytes(content)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+
+
+def test_read_buffer_cached(file_io, tmp_path):
+    test_file = tmp_path / "test.txt"
+    write_old_file(test_file, b"test content")
+
+    buffer = file_io.read_buffer(test_file)
+    assert buffer.content == b"test content"
+    assert file_io.read_buffer(test_file) is buffer
+    assert file_io.read_text(test_file) is file_io.read_text(test_file)
+
+
+def test_read_buffer_external_modification(file_io, tmp_path):
+    test_file = tmp_path / "test.txt"
+    write_old_file(test_file, b"test content")
+    assert file_io.read_bytes(test_file) == b"test content"
+
+    # Same size, different mtime
+    write_old_file(test_file, b"new! content", age=5)
+    assert file_io.read_bytes(test_file) == b"new! content"
+
+    # Same mtime, different size
+    write_old_file(test_file, b"newer content", age=5)
+    assert file_io.read_bytes(test_file) == b"newer content"
+
+
+def test_read_buffer_recently_modified_cached(file_io, tmp_path):
+    test_file = tmp_path / "test.txt"
+    test_file.write_bytes(b"test content")
+
+    buffer = file_io.read_buffer(test_file)
+    assert file_io.read_buffer(test_file) is buffer
+
+
+def test_read_buffer_racily_clean(file_io, tmp_path):
+    test_file = tmp_path / "test.txt"
+    # Modified at or after the time it is read, so a later write in the same mtime tick would not change its stat
+    write_old_file(test_file, b"test content", age=-10)
+    assert file_io.read_bytes(test_file) == b"test content"
+
+    stat = os.stat(test_file)
+    test_file.write_bytes(b"new! content")
+    os.utime(test_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert file_io.read_bytes(test_file) == b"new! content"
+
+
+def test_read_buffer_invalidate(file_io, tmp_path):
+    test_file = tmp_path / "test.txt"
+    write_old_file(test_file, b"test content")
+    file_io.read_bytes(test_file)
+
+    stat = os.stat(test_file)
+    test_file.write_bytes(b"new! content")
+    os.utime(test_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    file_io.invalidate(test_file)
+    assert file_io.read_bytes(test_file) == b"new! content"
+
+
+def test_read_buffer_pending_write(file_io, tmp_path):
+    test_file = tmp_path / "test.txt"
+    write_old_file(test_file, b"test content")
+    file_io.read_bytes(test_file)
+
+    file_io.write_bytes(test_file, b"new content")
+    file_io.invalidate(test_file)
+    assert file_io.read_bytes(test_file) == b"new content"
+    file_io.untrack_file(test_file)
+    assert file_io.read_bytes(test_file) == b"test content"
+
+
+@pytest.mark.parametrize("content", [b"", b"a", b"a\n", b"a\nb", b"a\r\n\nc\xc3\xa9\n"])
+def test_content_buffer_lines(content):
+    buffer = ContentBuffer(content)
+    lines = content.decode("utf-8").split("\n")
+    assert len(buffer.line_offsets) == len(lines)
+    assert [buffer.line(row) for row in range(len(lines))] == lines
+
+
 def test_save_file(file_io, tmp_path):
     test_file = tmp_path / "test.txt"
     content = b"test content"
@@ -39,6 +126,39 @@ def test_save_file(file_io, tmp_path):
     assert test_file.read_bytes() == content
 
 
+def test_read_saved_file(file_io, tmp_path):
+    test_file = tmp_path / "test.txt"
+    file_io.write_bytes(test_file, b"test content")
+    buffer = file_io.buffers[test_file]
+    file_io.save_files({test_file})
+    # Syncing the save invalidates the file
+    file_io.invalidate(test_file)
+
+    assert file_io.read_buffer(test_file) is buffer
+    assert file_io.wrote(test_file)
+
+
+def test_read_saved_file_external_edit(file_io, tmp_path):
+    test_file = tmp_path / "test.txt"
+    file_io.write_bytes(test_file, b"test content")
+    file_io.save_files({test_file})
+    assert file_io.read_bytes(test_file) == b"test content"
+
+    test_file.write_bytes(b"newer content")
+    assert file_io.read_bytes(test_file) == b"newer content"
+    assert not file_io.wrote(test_file)
+
+
+def test_read_saved_file_external_modification(file_io, tmp_path):
+    test_file = tmp_path / "test.txt"
+    file_io.write_bytes(test_file, b"test content")
+    file_io.save_files({test_file})
+
+    test_file.write_bytes(b"newer content")
+    file_io.invalidate(test_file)
+    assert file_io.read_bytes(test_file) == b"newer content"
+
+
 def test_check_changes_with_pending_changes(file_io, tmp_path, caplog):
     test_file = tmp_path / "test.txt"
     file_io.write_bytes(test_file, b"test content")
@@ -0,0 +1,61 @@
+import pytest
+from unidiff import PatchSet
+
+from codegen.sdk.codebase.io.file_io import FileIO
+from codegen.sdk.codebase.io.memory_io import MemoryIO
+
+
+@pytest.fixture
+def memory_io():
+    return MemoryIO(FileIO())
+
+
+def test_changes_stay_in_memory(memory_io, tmp_path):
+    existing = tmp_path / "existing.txt"
+    existing.write_bytes(b"old\n")
+    removed = tmp_path / "removed.txt"
+    removed.write_bytes(b"removed\n")
+    new = tmp_path / "new.txt"
+
+    memory_io.write_bytes(existing, b"changed\n")
+    memory_io.write_bytes(new, b"new\n")
+    memory_io.save_files()
+    memory_io.delete_file(removed)
+
+    assert memory_io.read_bytes(existing) == b"changed\n"
+    assert memory_io.read_bytes(new) == b"new\n"
+    assert not memory_io.file_exists(removed)
+    with pytest.raises(FileNotFoundError):
+        memory_io.read_bytes(removed)
+    # Nothing was written to disk
+    assert existing.read_bytes() == b"old\n"
+    assert removed.exists()
+    assert not new.exists()
+
+    patch = PatchSet(memory_io.get_diff(tmp_path))
+    assert {file.path: (file.is_added_file, file.is_removed_file, file.added, file.removed) for file in patch} == {
+        "existing.txt": (False, False, 1, 1),
+        "new.txt": (True, False, 1, 0),
+        "removed.txt": (False, True, 0, 1),
+    }
+    assert memory_io.get_changed_files(tmp_path) == {"existing.txt": b"changed\n", "new.txt": b"new\n", "removed.txt": None}
+
+    memory_io.discard()
+    assert memory_io.read_bytes(existing) == b"old\n"
+    assert memory_io.file_exists(removed)
+    assert not memory_io.file_exists(new)
+    assert memory_io.get_diff(tmp_path) == ""
+
+
+def test_unsaved_changes_are_dropped(memory_io, tmp_path):
+    test_file = tmp_path / "test.txt"
+    test_file.write_bytes(b"content")
+
+    memory_io.write_bytes(test_file, b"unsaved")
+    memory_io.check_changes()
+    assert memory_io.read_bytes(test_file) == b"content"
+    # Unchanged content is not part of the diff
+    memory_io.write_bytes(test_file, b"content")
+    memory_io.save_files({test_file})
+    assert memory_io.get_diff(tmp_path) == ""
+    assert memory_io.get_changed_files(tmp_path) == {}
@@ -0,0 +1,53 @@
+import pytest
+
+from codegen.sdk.tree_sitter_parser import get_parser_by_filepath_or_extension, get_tree_edit, parse_tree
+
+PY_CONTENT = b"""\n\n# comment
+def foo(a, b):
+    return a + b
+
+
+class Bar:
+    x: int = 1
+"""
+TS_CONTENT = b"""  // comment
+export function foo(a: number): number {
+  return a;
+}
+const b = `caf\xc3\xa9 ${foo(1)}`;
+"""
+
+
+def tree_to_tuple(node):
+    return node.type, node.start_byte, node.end_byte, tuple(node.start_point), tuple(node.end_point), tuple(tree_to_tuple(child) for child in node.children)
+
+
+@pytest.mark.parametrize(
+    "filepath, old, new",
+    [
+        ("file.py", PY_CONTENT, PY_CONTENT.replace(b"a + b", b"a - b * 2")),
+        ("file.py", PY_CONTENT, PY_CONTENT.replace(b"def foo", b"def\nfoo")),
+        ("file.py", PY_CONTENT, PY_CONTENT.replace(b"    x: int = 1\n", b"")),
+        ("file.py", PY_CONTENT, PY_CONTENT + b"\ndef baz():\n    pass\n"),
+        ("file.py", PY_CONTENT, PY_CONTENT[2:]),
+        ("file.py", PY_CONTENT, b"  " + PY_CONTENT[2:]),
+        ("file.py", PY_CONTENT, b""),
+        ("file.py", b"", PY_CONTENT),
+        ("file.tsx", TS_CONTENT, TS_CONTENT.replace(b"caf\xc3\xa9", b"cafe")),
+        ("file.tsx", TS_CONTENT, TS_CONTENT.replace(b"return a;", b"return a + foo(a - 1);\n")),
+        ("file.tsx", TS_CONTENT, b"\n" + TS_CONTENT),
+    ],
+)
+def test_parse_tree_incremental(filepath, old, new) -> None:
+    old_tree = parse_tree(filepath, old)
+    old_nodes = tree_to_tuple(old_tree.root_node)
+    tree = parse_tree(filepath, new, old_tree)
+    expected = get_parser_by_filepath_or_extension(filepath).parse(new)
+    assert tree_to_tuple(tree.root_node) == tree_to_tuple(expected.root_node)
+    assert tree_to_tuple(old_tree.root_node) == old_nodes
+    assert get_tree_edit(tree, new) is None
+
+
+def test_parse_tree_unchanged() -> None:
+    old_tree = parse_tree("file.py", PY_CONTENT)
+    assert parse_tree("file.py", PY_CONTENT, old_tree) is old_tree
@@ -0,0 +1,38 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from codegen.sdk.tree_sitter_parser import get_parser_by_filepath_or_extension
+
+FILES = {
+    "a.py": b"def foo(a, b):\n    return [a + b for _ in range(3)]\n",
+    "b.ts": b"export function foo(a: number): number {\n  return a * 2;\n}\n",
+    "c.tsx": b"const App = () => <div className='x'>{foo(1)}</div>;\n",
+    "d.js": b"module.exports = { foo: (a) => a + 1 };\n",
+    "e.txt": b"x = 1\n",
+}
+
+
+def tree_to_tuple(node):
+    return node.type, node.start_byte, node.end_byte, tuple(tree_to_tuple(child) for child in node.children)
+
+
+def test_parsers_are_per_thread() -> None:
+    assert get_parser_by_filepath_or_extension("a.py") is get_parser_by_filepath_or_extension(".py")
+    assert get_parser_by_filepath_or_extension("a.ts") is get_parser_by_filepath_or_extension("b.tsx")
+    assert get_parser_by_filepath_or_extension("a.py") is not get_parser_by_filepath_or_extension("a.ts")
+    other = []
+    thread = threading.Thread(target=lambda: other.append(get_parser_by_filepath_or_extension("a.py")))
+    thread.start()
+    thread.join()
+    assert other[0] is not get_parser_by_filepath_or_extension("a.py")
+
+
+def test_concurrent_parses() -> None:
+    expected = {filepath: tree_to_tuple(get_parser_by_filepath_or_extension(filepath).parse(content).root_node) for filepath, content in FILES.items()}
+
+    def parse(i: int) -> bool:
+        filepath = list(FILES)[i % len(FILES)]
+        return tree_to_tuple(get_parser_by_filepath_or_extension(filepath).parse(FILES[filepath]).root_node) == expected[filepath]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert all(executor.map(parse, range(200)))
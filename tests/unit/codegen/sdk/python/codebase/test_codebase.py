@@ -16,3 +16,41 @@ class MyClass1:
         assert [f.name for f in codebase.functions] == ["top_level_func"]
         assert len(list(codebase.symbols)) == 2
         assert set([s.name for s in codebase.symbols]) == {"top_level_func", "MyClass1"}
+
+
+def test_codebase_symbol_lookups_after_sync(tmpdir) -> None:
+    # language=python
+    content = """
+def foo():
+    return 1
+
+class Bar:
+    def foo(self):
+        pass
+
+baz = foo()
+"""
+    with get_codebase_session(tmpdir=tmpdir, files={"file1.py": content}) as codebase:
+        file = codebase.get_file("file1.py")
+        assert codebase.has_symbol("foo")
+        assert codebase.get_function("foo") == file.get_function("foo")
+        assert codebase.get_class("Bar") == file.get_class("Bar")
+        assert codebase.get_symbol("baz") == file.get_global_var("baz")
+        assert codebase.get_class("foo", optional=True) is None
+        assert len(codebase.ctx.get_symbols(name="foo")) == 2
+
+        codebase.get_function("foo").rename("qux")
+        file.get_class("Bar").remove()
+        codebase.create_file("file2.py", "class Bar:\n    pass\n")
+        codebase.commit()
+
+        assert not codebase.has_symbol("foo")
+        assert codebase.get_function("foo", optional=True) is None
+        assert codebase.get_function("qux").file.filepath == "file1.py"
+        assert codebase.get_class("Bar").file.filepath == "file2.py"
+        assert [s.name for s in codebase.get_symbols("baz")] == ["baz"]
+        assert [c.name for c in codebase.classes] == ["Bar"]
+        assert [f.name for f in codebase.functions] == ["qux"]
+        assert {s.name for s in codebase.symbols} == {"qux", "baz", "Bar"}
+        assert len(codebase.imports) == 0
+        assert len(codebase.files) == 2
@@ -1,7 +1,9 @@
 import os
+from pathlib import Path
 
 import pytest
 
+from codegen.sdk.codebase.diff_lite import DiffLite
 from codegen.sdk.codebase.factory.get_session import get_codebase_session
 from codegen.shared.enums.programming_language import ProgrammingLanguage
 
@@ -46,3 +48,25 @@ def test_codebase_clean_repo_deletes_branches(tmpdir, commit: bool, sync: bool)
         assert len(codebase._op.git_cli.branches) == num_branches + 2
         codebase.clean_repo()
         assert len(codebase._op.git_cli.branches) == 1
+
+
+def test_diff_lite_reads_old_content_lazily(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files={"a.py": "a = 1", "b.py": "b = 1"}, programming_language=ProgrammingLanguage.PYTHON) as codebase:
+        c1 = codebase.op.head_commit
+        codebase.get_file("a.py").edit("a = 2")
+        codebase.get_file("b.py").remove()
+    codebase.git_commit("change")
+    c2 = codebase.op.head_commit
+
+    diffs = {diff.path: diff for diff in map(DiffLite.from_git_diff, c1.diff(c2))}
+    assert all(diff.old_content is None for diff in diffs.values())
+    assert diffs[Path("a.py")].get_old_content() == b"a = 1"
+    assert diffs[Path("b.py")].get_old_content() == b"b = 1"
+
+    # The graph follows the diffs streamed from git
+    codebase.checkout(commit=c1)
+    assert codebase.get_symbol("a").value.source == "1"
+    assert codebase.get_symbol("b", optional=True) is not None
+    codebase.checkout(commit=c2)
+    assert codebase.get_symbol("a").value.source == "2"
+    assert codebase.get_symbol("b", optional=True) is None
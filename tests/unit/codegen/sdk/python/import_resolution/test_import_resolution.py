@@ -2,6 +2,7 @@ from typing import TYPE_CHECKING
 
 from codegen.sdk.codebase.config import TestFlags
 from codegen.sdk.codebase.factory.get_session import get_codebase_session
+from codegen.sdk.enums import NodeType
 
 if TYPE_CHECKING:
     from codegen.sdk.core.file import SourceFile
@@ -914,3 +915,27 @@ def test_import_resolution_paths_init(tmpdir: str) -> None:
         assert len(p_m.usages) == 3
         assert p_m.symbol_usages == [dosmth, import_pm]
         assert len(file1.symbols) != 1
+
+
+def test_import_resolution_tracks_added_and_removed_modules(tmpdir: str) -> None:
+    # language=python
+    with get_codebase_session(
+        tmpdir,
+        files={
+            "consumer.py": """
+from a.b import c
+from a import b
+""",
+            "a/b/__init__.py": "c = 1",
+        },
+    ) as codebase:
+        consumer_file: SourceFile = codebase.get_file("consumer.py")
+        assert consumer_file.get_import("c").resolved_symbol == codebase.get_file("a/b/__init__.py").get_global_var("c")
+        assert consumer_file.get_import("b").resolved_symbol == codebase.get_file("a/b/__init__.py")
+
+        codebase.create_file("a/b/c.py", "def d():\n    pass\n")
+        codebase.get_file("a/b/__init__.py").remove()
+        codebase.commit()
+        consumer_file = codebase.get_file("consumer.py")
+        assert consumer_file.get_import("c").resolved_symbol == codebase.get_file("a/b/c.py")
+        assert consumer_file.get_import("b").resolved_symbol.node_type == NodeType.EXTERNAL
@@ -130,3 +130,34 @@ def test_file_get_config(tmpdir) -> None:
             "app": ["shared/app"],
             "shared/app": ["shared/app"],
         }
+
+
+def test_path_alias_trie_matches_find_matching_path() -> None:
+    from codegen.sdk.typescript.ts_config import TSConfig, _PathAliasTrie
+
+    aliases = ["@", "@app", "@app/", "@app/shared", "~/lib/", "@scope/pkg/dist", "src", "/abs"]
+    trie = _PathAliasTrie({alias: f"target/{alias}" for alias in aliases})
+    for import_path in [
+        "@",
+        "@/x",
+        "@app",
+        "@app/x/y",
+        "@app/shared/z",
+        "@apps/x",
+        "~/lib",
+        "~/lib/a/b",
+        "~",
+        "@scope/pkg/dist/a",
+        "@scope/pkg/a",
+        "src/a.ts",
+        "srcs/a",
+        "/abs/x",
+        "/",
+        "",
+        "./src",
+        "a/b/",
+    ]:
+        expected = TSConfig._find_matching_path(frozenset(aliases), import_path)
+        match = trie.match(import_path)
+        assert (match and match[0]) == expected, import_path
+        assert match is None or match[1] == f"target/{expected}"
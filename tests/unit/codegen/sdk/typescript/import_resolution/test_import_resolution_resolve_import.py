@@ -1,3 +1,4 @@
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 import pytest
@@ -863,3 +864,30 @@ export namespace CONSTS {
 
         assert file.imports[0].resolved_symbol == consts
         assert file.get_symbol("use_a").resolved_value == consts.get_symbol("a").resolved_value
+
+
+def test_resolve_import_without_file_system(tmpdir, monkeypatch) -> None:
+    # language=typescript
+    content = """
+import { foo } from "./lib"
+import { bar } from "./lib/bar"
+"""
+    with get_codebase_session(tmpdir=tmpdir, files={"file.ts": content, "lib/bar.tsx": "export const bar = 1"}, programming_language=ProgrammingLanguage.TYPESCRIPT) as codebase:
+        file = codebase.get_file("file.ts")
+        assert file.get_import("foo").resolve_import() is None
+
+        codebase.create_file("lib/index.ts", "export function foo() {}")
+        codebase.commit()
+        file = codebase.get_file("file.ts")
+
+        calls = []
+        codebase.ctx.import_resolution_cache.clear()
+        with monkeypatch.context() as m:
+            m.setattr(Path, "exists", lambda path: calls.append(path))
+            m.setattr(Path, "resolve", lambda path, strict=False: calls.append(path))
+            foo = file.get_import("foo").resolve_import()
+            bar = file.get_import("bar").resolve_import()
+        assert calls == []
+        assert foo.from_file == codebase.get_file("lib/index.ts")
+        assert bar.from_file == codebase.get_file("lib/bar.tsx")
+        assert bar.symbol.name == "bar"